@@ -19,8 +19,11 @@ ensure that all error messages are user-friendly out of the box, and tweak the p
 """
 # Core
 
-from .schema.errors import SchemaError, Invalid, MultipleInvalid
+from .schema.errors import SchemaError, Invalid, MultipleInvalid, ValidationTimeout
 from .schema.util import register_type_name
+from .schema.limits import Limits
+from .schema.record import Record
+from .schema.context import ContextRef, get_context
 
 from .schema import Schema
 
@@ -32,3 +35,17 @@ from .helpers import *
 
 # Validators
 from .validators import *
+
+
+# `from good import *` exports the API only: not the submodules, like `good.json`
+from . import helpers as _helpers
+from .validators import predicates as _predicates, types as _types, values as _values, boolean as _boolean, \
+    numbers as _numbers, strings as _strings, dates as _dates, files as _files
+
+__all__ = (
+    'SchemaError', 'Invalid', 'MultipleInvalid', 'ValidationTimeout',
+    'register_type_name', 'Limits', 'Record', 'ContextRef', 'get_context',
+    'Schema', 'markers',
+) + markers.__all__ + _helpers.__all__ + \
+    _predicates.__all__ + _types.__all__ + _values.__all__ + _boolean.__all__ + \
+    _numbers.__all__ + _strings.__all__ + _dates.__all__ + _files.__all__
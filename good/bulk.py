@@ -0,0 +1,268 @@
+""" Validation of large files in parallel processes: JSON Lines & CSV.
+
+A single reader validates a big dump at the speed of one core: decoding and validation are CPU-bound.
+`good.bulk` splits the file into byte ranges aligned on line boundaries, and validates every range
+in a worker process:
+
+```python
+import good.bulk
+
+report = good.bulk.validate_file('users.jsonl', 'myapp.schemas:USER', processes=8)
+report
+#-> BulkReport(lines=10000000, valid=9999998, invalid=2, errors=[...])
+report.errors[0]
+#-> Invalid: Wrong type @ [1234567]['age']: expected Integer number, got String
+```
+
+The file is memory-mapped by every worker, so the data is never sent through pipes:
+only the ranges go to the workers, and only the errors come back.
+
+Since compiled schemas can't be sent to another process (see `good.registry`),
+the schema is given as an importable reference: `'module:attribute'`, and every worker compiles it once.
+The attribute is either a compiled [`Schema`](#schema), or a schema definition.
+
+Errors are [released](#invalidrelease), and keep only the names of the validators.
+Their path starts with the line number (1-based) in the file.
+
+Formats:
+
+* `'jsonl'`: JSON Lines. Every non-empty line is a JSON document.
+* `'csv'`: CSV with a header. Every row is validated as a dict of strings: `{column name: value}`.
+    Quoted values must not contain newlines: the file is split on newlines.
+"""
+
+import os
+import csv
+import json
+import mmap
+from gettext import gettext as _
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from . import Schema, Invalid
+from .registry import resolve_ref
+from .schema.util import get_literal_name
+
+
+BulkReport = namedtuple('BulkReport', ('lines', 'valid', 'invalid', 'errors'))
+BulkReport.__doc__ = """ The result of `validate_file()`
+
+:param lines: The number of lines in the file
+:param valid: The number of valid records
+:param invalid: The number of invalid records
+:param errors: The errors, at most `max_errors` of them: `Invalid`, with the line number first in the path
+"""
+
+#: Compiled schemas of a worker process: { (ref, kwargs): Schema }
+_schemas = {}
+
+
+def split_ranges(mm, start, parts):
+    """ Split a file into byte ranges that start & end on line boundaries
+
+    :param mm: The file contents
+    :type mm: mmap.mmap|bytes
+    :param start: The offset of the first range
+    :type start: int
+    :param parts: The desired number of ranges. There might be fewer of them: a range has at least one line.
+    :type parts: int
+    :return: [(start, end)]
+    :rtype: list[tuple[int, int]]
+    """
+    size = len(mm)
+    step = max((size - start) // parts, 1)
+
+    ranges = []
+    while start < size:
+        # A range ends right after a newline
+        end = mm.find(b'\n', min(start + step, size) - 1)
+        end = size if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _iter_lines(mm, start, end):
+    """ Iterate over the lines of a range, without the line breaks
+
+    :rtype: Iterator[bytes]
+    """
+    while start < end:
+        nl = mm.find(b'\n', start, end)
+        if nl == -1:
+            nl = end
+        yield mm[start:nl].rstrip(b'\r')
+        start = nl + 1
+
+
+def _get_schema(ref, kwargs):
+    """ Get a compiled schema by its reference: compiled once per process """
+    key = (ref, tuple(sorted(kwargs.items())))
+    try:
+        return _schemas[key]
+    except KeyError:
+        schema = resolve_ref(ref)
+        if not isinstance(schema, Schema):
+            schema = Schema(schema, **kwargs)
+        _schemas[key] = schema
+        return schema
+
+
+def _read_jsonl(lines, encoding, fieldnames):
+    """ Decode JSON Lines
+
+    :return: Iterator of (line index, value | Invalid): blank lines are skipped
+    """
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            yield index, json.loads(line.decode(encoding))
+        except ValueError as e:
+            yield index, Invalid(_(u'Malformed JSON'), _(u'JSON'), getattr(e, 'msg', str(e)))
+
+
+def _read_csv(lines, encoding, fieldnames):
+    """ Decode CSV rows into dicts
+
+    :return: Iterator of (line index, value | Invalid): blank lines are skipped
+    """
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        row = next(csv.reader((line.decode(encoding),)))
+        if len(row) != len(fieldnames):
+            yield index, Invalid(_(u'Wrong number of fields'), get_literal_name(len(fieldnames)), get_literal_name(len(row)))
+        else:
+            yield index, dict(zip(fieldnames, row))
+
+
+#: Record readers, by format
+_READERS = {
+    'jsonl': _read_jsonl,
+    'csv': _read_csv,
+}
+
+
+def _validate_range(task):
+    """ Validate the records of a byte range. Runs in a worker process.
+
+    :param task: (path, start, end, schema ref, schema kwargs, format, fieldnames, encoding, max_errors)
+    :return: (lines, valid, invalid, [(line index in the range, Invalid)])
+    """
+    path, start, end, ref, kwargs, format, fieldnames, encoding, max_errors = task
+    schema = _get_schema(ref, kwargs)
+    read = _READERS[format]
+
+    # Every line of the range, including blank ones, is counted
+    n_lines = 0
+
+    def lines(mm):
+        nonlocal n_lines
+        for line in _iter_lines(mm, start, end):
+            n_lines += 1
+            yield line
+
+    valid = invalid = 0
+    errors = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for index, value in read(lines(mm), encoding, fieldnames):
+            if not isinstance(value, Invalid):
+                try:
+                    schema(value)
+                    valid += 1
+                    continue
+                except Invalid as e:
+                    value = e
+
+            invalid += 1
+            if len(errors) < max_errors:
+                # Errors go back to the parent process: validators are replaced with their names, which can be pickled
+                errors.append((index, value.release(keep_validator=False)))
+    return n_lines, valid, invalid, errors
+
+
+def validate_file(path, schema_ref, format=None, processes=None, ranges_per_process=4, max_errors=1000,
+                  encoding='utf-8', **kwargs):
+    """ Validate every record of a JSON Lines or CSV file, in parallel processes.
+
+    ```python
+    import good.bulk
+
+    report = good.bulk.validate_file('orders.csv', 'myapp.schemas:ORDER_ROW')
+    if report.invalid:
+        for e in report.errors:
+            print(e)
+    ```
+
+    The file is split into `processes * ranges_per_process` ranges: smaller ranges balance the load
+    when some of them take longer than the others.
+
+    :param path: Path to the file
+    :type path: str
+    :param schema_ref: The schema for every record: an importable reference, `'module:attribute'`
+    :type schema_ref: str
+    :param format: 'jsonl' or 'csv'. By default, it's guessed from the file extension: '.csv' is CSV, anything else is JSON Lines.
+    :type format: str|None
+    :param processes: The number of worker processes. Defaults to the number of CPUs.
+        With `1`, the file is validated in the current process.
+    :type processes: int|None
+    :param ranges_per_process: The number of ranges for every process
+    :type ranges_per_process: int
+    :param max_errors: The maximum number of errors to collect. Invalid records are counted anyway.
+    :type max_errors: int
+    :param encoding: The encoding of the file
+    :type encoding: str
+    :param kwargs: Arguments for the `Schema`, if the reference is a schema definition: `extra_keys`, etc
+    :return: The report
+    :rtype: BulkReport
+    """
+    if format is None:
+        format = 'csv' if os.path.splitext(path)[1].lower() == '.csv' else 'jsonl'
+    assert format in _READERS, 'Unsupported format: {!r}'.format(format)
+    processes = processes or os.cpu_count() or 1
+
+    # Empty files can't be mapped
+    if os.path.getsize(path) == 0:
+        return BulkReport(0, 0, 0, [])
+
+    # Plan the ranges
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start, header_lines, fieldnames = 0, 0, None
+        if format == 'csv':
+            # The header goes first
+            header = next(_iter_lines(mm, 0, len(mm)))
+            fieldnames = next(csv.reader((header.decode(encoding),)), [])
+            start = mm.find(b'\n') + 1 or len(mm)
+            header_lines = 1
+        ranges = split_ranges(mm, start, processes * ranges_per_process)
+
+    tasks = [(path, range_start, range_end, schema_ref, kwargs, format, fieldnames, encoding, max_errors)
+             for range_start, range_end in ranges]
+
+    # Validate
+    if processes == 1:
+        return _collect(map(_validate_range, tasks), header_lines, max_errors)
+    with ProcessPoolExecutor(processes) as pool:
+        return _collect(pool.map(_validate_range, tasks), header_lines, max_errors)
+
+
+def _collect(results, lines, max_errors):
+    """ Merge the results of ranges, in order: line numbers become global
+
+    :param lines: The number of lines before the first range
+    :rtype: BulkReport
+    """
+    valid = invalid = 0
+    errors = []
+    for range_lines, range_valid, range_invalid, range_errors in results:
+        for index, e in range_errors:
+            if len(errors) < max_errors:
+                errors.append(e.enrich(path=[lines + index + 1]))
+        lines += range_lines
+        valid += range_valid
+        invalid += range_invalid
+    return BulkReport(lines, valid, invalid, errors)
+
+
+__all__ = ('validate_file', 'split_ranges', 'BulkReport')
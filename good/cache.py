@@ -0,0 +1,271 @@
+""" A cache of validation results.
+
+When the same inputs are validated over and over again -- identical config blobs, retried messages,
+reference data re-sent by clients -- the results can be remembered. `CachedSchema` wraps a [`Schema`](#schema),
+and keys the results by the structure of the input: the sanitized value, or the error.
+
+```python
+from good.cache import CachedSchema
+
+schema = CachedSchema({'name': str, 'tags': [str]}, max_entries=10000)
+
+schema({'name': 'Alex', 'tags': ['a']})  # validated
+schema({'name': 'Alex', 'tags': ['a']})  # taken from the cache
+schema.cache_info()
+#-> CacheInfo(hits=1, misses=1, uncacheable=0, evictions=0, entries=1, cost=6)
+```
+
+Every call returns a fresh copy of the cached value, so the caller can modify it freely.
+Errors are copied as well.
+
+Inputs are compared by their structure, and the type of every value, so `1`, `1.0` and `True` are different inputs.
+Values that are equal but look different are different inputs as well: `0.0` and `-0.0`, `Decimal('1.0')` and `Decimal('1.00')`,
+the same moment in different timezones.
+Only inputs made of dicts, lists, tuples, and immutable scalars (strings, numbers, dates, etc) are cached;
+other inputs are validated as usual.
+
+JSON documents validated with [`good.json.loads()`](#loads) are keyed by the raw document,
+so duplicates are not even decoded.
+
+Note that the cache assumes that validation is a pure function of the input: don't cache schemas whose results
+depend on anything else, like the current time, or the contents of a database.
+Calls with a [validation context](#validation-context) bypass the cache.
+"""
+
+from collections import OrderedDict, namedtuple
+from copy import copy, deepcopy
+from datetime import date, time, datetime, timedelta
+from decimal import Decimal
+from threading import Lock
+from uuid import UUID
+
+from . import Schema, Invalid, MultipleInvalid, ValidationTimeout
+from .schema.context import _validation_context
+
+
+#: Immutable scalar types: never copied
+_SCALARS = frozenset((str, bytes, int, float, bool, type(None), complex, Decimal, date, time, datetime, timedelta, UUID))
+
+#: Scalars that compare equal while the results may differ: `0.0 == -0.0`, `Decimal('1.0') == Decimal('1.00')`,
+#: and aware datetimes are equal in any timezone. These are keyed by their exact representation:
+#: { type: key function }. Other scalars are used in cache keys as is.
+_EXACT_KEYS = {
+    float: float.hex,
+    complex: repr,
+    Decimal: Decimal.as_tuple,
+    datetime: lambda v: (v, v.utcoffset(), v.tzinfo, v.fold),
+    time: lambda v: (v, v.utcoffset(), v.tzinfo, v.fold),
+}
+
+
+class _Uncacheable(Exception):
+    """ The input can't be used as a cache key """
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'uncacheable', 'evictions', 'entries', 'cost'))
+
+
+class CachedSchema:
+    """ A [`Schema`](#schema) that caches its results.
+
+    Entries are evicted in least recently used order, when there's more than `max_entries` of them,
+    or when their total cost exceeds `max_cost`. The cost of an entry is the number of values in the input:
+    scalars & containers; a raw JSON document costs one per 8 characters.
+
+    It's safe to use from multiple threads.
+
+    :param schema: Schema definition, or a compiled `Schema`
+    :type schema: Schema|*
+    :param max_entries: The maximum number of cached results
+    :type max_entries: int
+    :param max_cost: The maximum total cost of cached results. `None` for no limit.
+    :type max_cost: int|None
+    :param kwargs: Arguments for the `Schema`, if not compiled: `default_keys`, `extra_keys`, etc
+    """
+
+    def __init__(self, schema, max_entries=1024, max_cost=None, **kwargs):
+        if isinstance(schema, Schema):
+            assert not kwargs, 'Schema() arguments are not supported for compiled schemas'
+        else:
+            schema = Schema(schema, **kwargs)
+        assert schema.compiled.on_error is None, 'Schemas with an error sink should not be cached: errors would not be reported'
+
+        #: The wrapped schema
+        self.schema = schema
+        self.name = schema.name
+        self.max_entries = max_entries
+        self.max_cost = max_cost
+
+        self._lock = Lock()
+        self._entries = OrderedDict()  # key -> (cost, is-error, value | error)
+        self._cost = 0
+        self._hits = self._misses = self._uncacheable = self._evictions = 0
+
+    def __repr__(self):
+        return '{cls}({0!r})'.format(self.schema, cls=type(self).__name__)
+
+    def __str__(self):
+        return str(self.schema)
+
+    def __call__(self, value, context=None, timeout=None):
+        """ Validate a value, or get the result from the cache.
+
+        Results that depend on a [validation context](#validation-context) are not cached:
+        with a `context`, or within an outer call that has one, the value is validated as usual.
+
+        :param value: Input value to validate
+        :param context: Validation context, as for `Schema.__call__()`
+        :param timeout: The time budget for this call, in seconds, as for `Schema.__call__()`
+        :type timeout: float|None
+        :return: Sanitized value
+        :raises good.Invalid: Validation error
+        :raises good.MultipleInvalid: Validation errors
+        :raises good.ValidationTimeout: The time budget is exceeded
+        """
+        try:
+            if context is not None or _validation_context.get() is not None:
+                raise _Uncacheable()
+            tokens = []
+            _freeze(value, tokens)
+        except _Uncacheable:
+            with self._lock:
+                self._uncacheable += 1
+            return self.schema(value, context, timeout)
+
+        # The cost is the number of values: each of them produces 2 tokens
+        return self.validate_key(tuple(tokens), len(tokens) // 2, self.schema, value, timeout=timeout)
+
+    def validate_key(self, key, cost, validate, *args, **kwargs):
+        """ Get the result from the cache, or validate the value and remember the result.
+
+        This is the low-level interface for entry points that know better how to key their inputs:
+        e.g. [`good.json.loads()`](#loads) uses the raw document.
+
+        :param key: Cache key: any hashable value
+        :param cost: The cost of the entry
+        :type cost: int
+        :param validate: The function that validates the input, and returns the sanitized value
+        :type validate: callable
+        :param args: Arguments for `validate`
+        :param kwargs: Keyword arguments for `validate`
+        :return: Sanitized value
+        :raises good.Invalid: Validation errors
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        # Cached
+        if entry is not None:
+            cost, is_error, result = entry
+            if is_error:
+                raise _copy_error(result)
+            return _copy_value(result)
+
+        # Validate. The caller can modify the result, or enrich the error: cache copies
+        try:
+            value = validate(*args, **kwargs)
+        except ValidationTimeout:
+            # Depends on the load, not on the input: the next call may succeed
+            raise
+        except Invalid as e:
+            self._remember(key, (cost, True, _copy_error(e)))
+            raise
+        self._remember(key, (cost, False, _copy_value(value)))
+        return value
+
+    def _remember(self, key, entry):
+        """ Add an entry, and evict the oldest ones if necessary """
+        with self._lock:
+            if key in self._entries:
+                # A concurrent thread has just validated the same input
+                return
+            self._entries[key] = entry
+            self._cost += entry[0]
+
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_cost is not None and self._cost > self.max_cost)):
+                old_key, (cost, is_error, result) = self._entries.popitem(last=False)
+                self._cost -= cost
+                self._evictions += 1
+
+    def cache_info(self):
+        """ Get the cache statistics
+
+        :return: (hits, misses, uncacheable, evictions, entries, cost)
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._uncacheable, self._evictions, len(self._entries), self._cost)
+
+    def clear(self):
+        """ Forget all cached results and reset the statistics """
+        with self._lock:
+            self._entries.clear()
+            self._cost = 0
+            self._hits = self._misses = self._uncacheable = self._evictions = 0
+
+
+def _freeze(value, tokens):
+    """ Convert the value into a flat list of tokens: (type, value) for scalars, (type, length) for containers.
+
+    :type tokens: list
+    :raises _Uncacheable: The value contains objects which can't be a part of the key
+    """
+    t = type(value)
+    if t in _EXACT_KEYS:
+        tokens.append(t)
+        tokens.append(_EXACT_KEYS[t](value))
+    elif t in _SCALARS:
+        tokens.append(t)
+        tokens.append(value)
+    elif t is dict:
+        tokens.append(t)
+        tokens.append(len(value))
+        for k, v in value.items():
+            _freeze(k, tokens)
+            _freeze(v, tokens)
+    elif t is list or t is tuple:
+        tokens.append(t)
+        tokens.append(len(value))
+        for v in value:
+            _freeze(v, tokens)
+    else:
+        raise _Uncacheable()
+
+
+def _copy_value(value):
+    """ Copy a sanitized value: containers are copied, immutable scalars are shared """
+    t = type(value)
+    if t in _SCALARS:
+        return value
+    elif t is dict:
+        return {k: _copy_value(v) for k, v in value.items()}
+    elif t is list:
+        return [_copy_value(v) for v in value]
+    elif t is tuple:
+        return tuple(_copy_value(v) for v in value)
+    else:
+        return deepcopy(value)
+
+
+def _copy_error(e):
+    """ Copy an error, so that `enrich()` on the copy does not change the original
+
+    :type e: Invalid
+    :rtype: Invalid
+    """
+    if isinstance(e, MultipleInvalid):
+        return type(e)([_copy_error(err) for err in e.errors])
+
+    e = copy(e)
+    e.path = list(e.path)
+    e.info = dict(e.info)
+    return e
+
+
+__all__ = ('CachedSchema',)
@@ -3,9 +3,14 @@
 from collections import abc
 from gettext import gettext as _
 from functools import update_wrapper
-
-from .schema.util import const, get_literal_name, get_callable_name
-from . import Schema, SchemaError, Invalid
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from .schema.util import const, get_literal_name, get_callable_name, get_type_name
+from .schema import markers, signals
+from .schema.compiler import Identity
+from .schema.context import _validation_context
+from . import Schema, SchemaError, Invalid, MultipleInvalid
 from .validators.base import ValidatorBase
 from .validators.boolean import Check
 
@@ -102,8 +107,12 @@ class Object(ValidatorBase):
     ```
 
     Internally, it validates the object's `__dict__`: hence, class attributes are excluded from validation.
-    Validation is performed with the help of a wrapper class which proxies object attributes as mapping keys,
-    and then Schema validates it as a mapping.
+    For classes with `__slots__` (including named tuples, and slotted dataclasses & attrs classes),
+    the attribute names are taken from the class.
+
+    When all keys of the mapping are string literals, and no special markers are used,
+    attributes are accessed directly. Otherwise, validation is performed with the help of a wrapper class
+    which proxies object attributes as mapping keys, and then Schema validates it as a mapping.
 
     This inherits the default required/extra keys behavior of the Schema.
     To override, use [`Optional()`](#optional) and [`Extra`](#extra) markers.
@@ -114,6 +123,12 @@ class Object(ValidatorBase):
     :type cls: None|type|tuple[type]
     """
 
+    #: Markers that can be executed without the input mapping: allowed for direct attribute access
+    _attribute_markers = (markers.Required, markers.Optional, markers.Extra, markers.Reject, markers.Allow)
+
+    #: Attribute names for classes with fixed attributes: { type: tuple | None }
+    _fields_cache = {}
+
     def __init__(self, schema, cls=None):
         # Prepare
         self.name = self._format_cls_name(cls)
@@ -122,6 +137,115 @@ class Object(ValidatorBase):
         # Compile schema
         self.compiled = Schema(schema)
 
+        # Direct attribute access: [(key-schema, value-schema, attribute-name|None)], or `None` if not supported
+        self.attribute_keys = self._get_attribute_keys(self.compiled.compiled)
+
+    @classmethod
+    def _get_attribute_keys(cls, compiled):
+        """ Check whether a compiled mapping can validate attributes directly
+
+        :type compiled: CompiledSchema
+        :return: [(key-schema, value-schema, attribute-name|None)], where attribute-name is `None` for catch-all markers
+        :rtype: list|None
+        """
+        if compiled.compiled_keys is None:
+            return None  # not a mapping
+
+        keys = []
+        for key_schema, value_schema, is_literal, is_identity in compiled.compiled_keys:
+            marker = key_schema.compiled
+            if type(marker) not in cls._attribute_markers:
+                return None
+            if isinstance(marker, markers.Extra) and isinstance(value_schema.compiled, markers.Marker) \
+                    and type(value_schema.compiled) not in cls._attribute_markers:
+                return None
+            if is_literal and isinstance(marker.key, str):
+                keys.append((key_schema, value_schema, marker.key))
+            elif marker.key is Identity:
+                keys.append((key_schema, value_schema, None))
+            else:
+                return None
+        return keys
+
+    @classmethod
+    def _get_fields(cls, type_):
+        """ Get attribute names for a class with fixed attributes
+
+        :return: Attribute names, or `None` if the instance `__dict__` should be used
+        :rtype: tuple|None
+        """
+        try:
+            return cls._fields_cache[type_]
+        except KeyError:
+            pass
+
+        fields = None
+        # Named tuple?
+        if issubclass(type_, tuple) and hasattr(type_, '_fields'):
+            fields = tuple(type_._fields)
+        # Just Slots
+        elif hasattr(type_, '__slots__'):
+            fields = (type_.__slots__,) if isinstance(type_.__slots__, str) else tuple(type_.__slots__)
+
+        cls._fields_cache[type_] = fields
+        return fields
+
+    def _validate_attributes(self, obj):
+        """ Validate object attributes directly, the way `CompiledSchema` validates a mapping """
+        fields = self._get_fields(type(obj))
+        names = set(vars(obj) if fields is None else fields)
+
+        errors = []
+        for key_schema, value_schema, name in self.attribute_keys:
+            # Match attributes
+            matches = []
+            if name is not None:
+                if name in names:
+                    names.remove(name)
+                    v = getattr(obj, name, const.UNDEFINED)
+                    if v is not const.UNDEFINED:  # unset slot
+                        matches.append((name, name, v))
+            else:
+                matches.extend((k, k, getattr(obj, k)) for k in names if hasattr(obj, k))
+                names = ()
+
+            # Execute the marker
+            try:
+                matches = key_schema.compiled.execute(obj, matches)
+            except Invalid as e:
+                errors.append(e.enrich(
+                    expected=key_schema.name,
+                    provided=None,
+                    path=[],
+                    validator=key_schema.compiled
+                ))
+                continue
+
+            # Validate values
+            for k, sanitized_k, v in matches:
+                try:
+                    value = value_schema(v)
+                except signals.RemoveValue:
+                    delattr(obj, k)
+                except Invalid as e:
+                    errors.append(e.enrich(
+                        expected=value_schema.name,
+                        provided=get_literal_name(v),
+                        path=[k],
+                        validator=value_schema
+                    ))
+                else:
+                    try:
+                        setattr(obj, k, value)
+                    except AttributeError:
+                        # Type does not support assignments (e.g. immutable containers): okay if the value did not change
+                        if value != v:
+                            raise
+
+        if errors:
+            raise MultipleInvalid.if_multiple(errors)
+        return obj
+
     @staticmethod
     def _format_cls_name(c):
         return _(u'Object({cls})').format(cls=c.__name__ if c else u'*')
@@ -134,6 +258,10 @@ class Object(ValidatorBase):
         if not isinstance(v, self.cls):
             raise Invalid(_(u'Wrong value type'), provided=self._format_value_type(v))
 
+        # Validate attributes directly
+        if self.attribute_keys is not None:
+            return self._validate_attributes(v)
+
         # Validate using ObjectProxy and unwrap
         return self.compiled(ObjectProxy(v)).obj
 
@@ -218,7 +346,7 @@ class Test(ValidatorBase):
     def __call__(self, v):
         try:
             self.fun(v)
-        except Invalid:
+        except (Invalid, signals.DeadlineExceeded):
             raise
         except Exception:
             raise Invalid(_(u'Invalid value'))
@@ -226,6 +354,139 @@ class Test(ValidatorBase):
             return v
 
 
+class Blocking(ValidatorBase):
+    """ Mark the schema as I/O-bound: containers validate such values concurrently, in a thread pool.
+
+    Validators that block on I/O (e.g. [`IsFile`](#isfile), or a callable that queries a database)
+    spend most of the time waiting. When a list item or a mapping value is validated with `Blocking()`,
+    the container dispatches all such values to the thread pool at once, and then gathers the results:
+
+    ```python
+    from good import Schema, Blocking, IsFile
+
+    schema = Schema([Blocking(IsFile())])
+    schema(['/etc/hosts', '/etc/passwd'])  #-> ['/etc/hosts', '/etc/passwd']
+    ```
+
+    The result is exactly the same as with sequential validation: the order of values, error paths,
+    and [`MultipleInvalid`](#multipleinvalid) aggregation.
+
+    Concurrent validation is performed by:
+
+    * Iterables with a single member schema: `[Blocking(...)]`
+    * Mappings: all values that are mapped to `Blocking()` schemas
+
+    In other cases, e.g. `Any(Blocking(...))`, the schema is validated as usual.
+    So are `Blocking()` values nested in a value that is already validated by a worker of the same pool:
+    the worker would otherwise wait for a task that never gets a worker.
+
+    Note that the wrapped schema is called from different threads, so it should be thread-safe.
+
+    :param schema: The I/O-bound schema
+    :param pool: The thread pool to use. By default, a pool shared by all `Blocking()` validators is used.
+    :type pool: concurrent.futures.Executor|None
+    """
+
+    #: The default thread pool, created on first use
+    _default_pool = None
+    _default_pool_lock = Lock()
+
+    def __init__(self, schema, pool=None):
+        self.compiled = Schema(schema).compiled
+        self.name = self.compiled.name
+        #: The thread pool: containers recognize I/O-bound callables by this attribute
+        self.executor = pool or self.get_default_pool()
+
+    @classmethod
+    def get_default_pool(cls):
+        """ Get the thread pool shared by all `Blocking()` validators
+
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        with cls._default_pool_lock:
+            if cls._default_pool is None:
+                try:
+                    cls._default_pool = ThreadPoolExecutor(thread_name_prefix='good-blocking')
+                except TypeError:  # Python 3.5
+                    cls._default_pool = ThreadPoolExecutor()
+            return cls._default_pool
+
+    def __call__(self, v):
+        return self.compiled(v)
+
+
+class Stream(ValidatorBase):
+    """ Validate an iterator lazily: item by item, as the result is consumed.
+
+    Iterable schemas, like `[int]`, need a list or a tuple, and produce a new one: the whole input is in memory.
+    `Stream` accepts any iterable -- a generator, a database cursor, a file -- and returns a generator
+    that validates and yields the items one at a time, so that the memory use does not depend on the input size:
+
+    ```python
+    from good import Schema, Stream
+
+    schema = Schema(Stream({'id': int, 'name': str}))
+
+    for row in schema(cursor):
+        save(row)
+    #-> Invalid: Wrong type @ [1234, 'id']: expected Integer number, got String
+    ```
+
+    Errors have the index of the item in the path. What happens to invalid items depends on `errors`:
+
+    * `'raise'`: raise the error, and stop at the first invalid item
+    * `'skip'`: drop invalid items, and go on
+    * `'yield'`: yield the `Invalid` error in place of the item, and go on
+
+    Note that the items are validated after the `Schema` has returned: when `Stream` is embedded into a container,
+    the error paths do not include the path of the container. The [validation context](#validation-context)
+    of the call is used by the items, but the [deadline](#deadline) is not: the consumer sets the pace.
+
+    :param schema: Schema for every item
+    :param errors: What to do with invalid items: 'raise', 'skip', or 'yield'
+    :type errors: str
+    """
+
+    def __init__(self, schema, errors='raise'):
+        assert errors in ('raise', 'skip', 'yield'), '`errors` must be one of: raise, skip, yield'
+        self.compiled = Schema(schema).compiled
+        self.errors = errors
+        self.name = _(u'Stream({})').format(self.compiled.name)
+
+    def __call__(self, v):
+        # Type check: any iterable, but not a string or a mapping, which are iterable by accident
+        if not isinstance(v, abc.Iterable) or isinstance(v, (str, bytes, abc.Mapping)):
+            raise Invalid(_(u'Wrong value type'), _(u'Iterable'), get_type_name(type(v)))
+        return self._validate(iter(v), _validation_context.get())
+
+    def _validate(self, items, context):
+        """ Validate the items one by one
+
+        :param items: Input iterator
+        :param context: Validation context of the call
+        """
+        schema, errors = self.compiled, self.errors
+        for index, value in enumerate(items):
+            # Generators don't keep the context of the call: restore it for every item
+            token = _validation_context.set(context) if context is not None else None
+            try:
+                value = schema(value)
+            except Invalid as e:
+                # The error lives longer than the item: it should not keep the frames
+                e.enrich(path=[index]).release()
+                if errors == 'raise':
+                    del value, items
+                    raise e
+                elif errors == 'yield':
+                    value = e
+                else:
+                    continue
+            finally:
+                if token is not None:
+                    _validation_context.reset(token)
+            yield value
+
+
 def message(message, name=None):
     """ Convenience decorator that applies [`Msg()`](#msg) to a callable.
 
@@ -320,4 +581,4 @@ def truth(message, expected=None):
     return decorator
 
 
-__all__ = ('Object', 'Msg', 'Test', 'message', 'name', 'truth')
+__all__ = ('Object', 'Msg', 'Test', 'Blocking', 'Stream', 'message', 'name', 'truth')
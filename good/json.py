@@ -0,0 +1,654 @@
+""" Schema-driven JSON decoding.
+
+When validating request bodies, the usual approach is to decode the JSON document into dicts & lists,
+and then feed it to the [`Schema`](#schema):
+
+```python
+import json
+from good import Schema
+
+schema = Schema({'name': str}, extra_keys=Remove)
+schema(json.loads(body))
+```
+
+`good.json.loads()` does the same in a single call, and skips decoding of [`Remove`](#remove)d subtrees:
+the compiled schema guides the decoder, and the values of keys that the schema is going to remove
+are skipped over without ever being materialized. This is all it saves: everything else is decoded in full,
+including the values of [`Reject`](#reject)ed keys, and of extra keys unless they're removed (`extra_keys=Remove`),
+and then validated, just like with `json.loads()`.
+
+```python
+import good.json
+
+good.json.loads('{"name": "Alex", "junk": [1, 2, 3]}', schema)  #-> {'name': 'Alex'}
+```
+
+Skipped values are still checked to be valid JSON: a malformed document is a `JSONDecodeError`, as usual.
+
+`good.json.loads()` is slower than `schema(json.loads(body))` in general: it trades speed for memory.
+Parts of the schema that remove nothing are decoded by the standard C scanner, but mappings with keys to remove
+are decoded in Python, about 3 times slower. It's only worth it when big removed subtrees would otherwise
+take a lot of memory: see `misc/performance/json_loads.py`.
+
+Huge documents that are a single array are validated item by item with `good.json.iter_array()`:
+the file is read in chunks, and only one item is decoded at a time.
+"""
+
+import re
+import json
+import codecs
+from json.decoder import scanstring, JSONDecodeError
+from json.scanner import make_scanner
+
+from . import Schema
+from .cache import CachedSchema
+from .helpers import Stream
+from .schema import markers
+from .schema.context import _validation_context
+
+try:
+    from json import detect_encoding as _detect_encoding
+except ImportError:  # Python 3.5
+    def _detect_encoding(b):
+        """ Detect the encoding of a JSON document: UTF-8, UTF-16 or UTF-32, the way `json.detect_encoding()` does """
+        if b.startswith((codecs.BOM_UTF32_BE, codecs.BOM_UTF32_LE)):
+            return 'utf-32'
+        if b.startswith((codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE)):
+            return 'utf-16'
+        if b.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        # A JSON document starts with two ASCII characters: the zero bytes tell the encoding
+        if len(b) >= 4:
+            if not b[0]:
+                return 'utf-16-be' if b[1] else 'utf-32-be'
+            if not b[1]:
+                return 'utf-16-le' if b[2] or b[3] else 'utf-32-le'
+        elif len(b) == 2:
+            if not b[0]:
+                return 'utf-16-be'
+            if not b[1]:
+                return 'utf-16-le'
+        return 'utf-8'
+
+
+#: Whitespace between JSON tokens
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+#: A JSON token, with the whitespace before it: (string)|(constant)|(number)|(punctuation).
+#: Used to skip over a value without decoding it. In strict mode, strings can't contain control characters.
+_TOKEN_PATTERN = r'''[ \t\n\r]*(?:
+    ("[^"\\{cc}]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{{4}})[^"\\{cc}]*)*")
+    |(true|false|null|NaN|Infinity|-Infinity)
+    |(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)
+    |([\[\]{{}},:])
+)'''
+_TOKEN_STRICT = re.compile(_TOKEN_PATTERN.format(cc=r'\x00-\x1f'), re.VERBOSE)
+_TOKEN = re.compile(_TOKEN_PATTERN.format(cc=''), re.VERBOSE)
+_T_STRING, _T_CONSTANT, _T_NUMBER, _T_PUNCTUATION = 1, 2, 3, 4
+
+#: A flat container: an array or an object of scalars, with the whitespace before it. Skipped in a single match.
+_FLAT_PATTERN = r'''[ \t\n\r]*(?:
+    \[ {ws} (?: {scalar} (?: {ws} , {ws} {scalar} )* {ws} )? \]
+    |\{{ {ws} (?: {string} {ws} : {ws} {scalar} (?: {ws} , {ws} {string} {ws} : {ws} {scalar} )* {ws} )? \}}
+)'''
+_FLAT_PARTS = dict(
+    ws=r'[ \t\n\r]*',
+    string=r'"[^"\\{cc}]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{{4}})[^"\\{cc}]*)*"',
+    scalar=r'(?: "[^"\\{cc}]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{{4}})[^"\\{cc}]*)*"'
+           r' | true|false|null|NaN|Infinity|-Infinity | -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)? )',
+)
+_FLAT_STRICT = re.compile(_FLAT_PATTERN.format(**{k: v.format(cc=r'\x00-\x1f') for k, v in _FLAT_PARTS.items()}), re.VERBOSE)
+_FLAT = re.compile(_FLAT_PATTERN.format(**{k: v.format(cc='') for k, v in _FLAT_PARTS.items()}), re.VERBOSE)
+
+#: What the value skipper expects next
+_S_VALUE, _S_VALUE_OR_END, _S_KEY, _S_KEY_OR_END, _S_COLON, _S_COMMA_OR_END = range(6)
+
+#: An object key with no escapes, and the colon after it
+_SIMPLE_KEY = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*')
+
+#: The delimiter after an object value, and the whitespace around it
+_OBJECT_DELIMITER = re.compile(r'[ \t\n\r]*([,}])[ \t\n\r]*')
+
+#: Decoding errors of the value skipper, by state
+_SKIP_ERRORS = {
+    _S_VALUE: 'Expecting value',
+    _S_VALUE_OR_END: 'Expecting value',
+    _S_KEY: 'Expecting property name enclosed in double quotes',
+    _S_KEY_OR_END: 'Expecting property name enclosed in double quotes',
+    _S_COLON: "Expecting ':' delimiter",
+    _S_COMMA_OR_END: "Expecting ',' delimiter",
+}
+
+#: Route: skip the value and drop the key
+_DROP = object()
+
+#: Cache keys of raw documents
+_RAW = object()
+
+
+class _MappingRouter:
+    """ Routes input keys of a JSON object to the value schemas of a compiled mapping.
+
+    Mirrors the key matching done by `CompiledSchema._compile_mapping()`:
+    keys are matched by key schemas in the order of their priority.
+
+    :type schema: CompiledSchema
+    """
+
+    #: The maximum number of remembered routes (protects against documents with lots of unique keys)
+    cache_size = 1024
+
+    def __init__(self, schema):
+        self.literals = {}  # literal -> index in `routes`
+        self.matchers = []  # [(index, key-schema, is-identity)], sorted
+        self.routes = []  # index -> route
+        self.cache = {}
+
+        for i, (key_schema, value_schema, is_literal, is_identity) in enumerate(schema.compiled_keys):
+            self.routes.append(self._get_route(key_schema.compiled, value_schema))
+            if is_literal:
+                self.literals.setdefault(key_schema.compiled.key, i)
+            else:
+                self.matchers.append((i, key_schema, is_identity))
+
+    @staticmethod
+    def _get_route(marker, value_schema):
+        """ Decide what to do with the values of keys matched by a marker
+
+        :type marker: markers.Marker
+        :type value_schema: CompiledSchema
+        :return: _DROP | CompiledSchema | None
+        """
+        # Extra: decided by its value
+        if isinstance(marker, markers.Extra) and isinstance(value_schema.compiled, markers.Marker):
+            marker = value_schema.compiled
+            value_schema = None
+
+        # Markers that never look at the value.
+        # Rejected values are decoded anyway: they're reported in the error
+        if isinstance(marker, markers.Remove):
+            return _DROP
+
+        # Values that are removed by the value schema
+        if value_schema is not None and isinstance(value_schema.compiled, markers.Remove):
+            return _DROP
+
+        # Decode the value with its schema
+        return value_schema
+
+    def __call__(self, key):
+        """ Get the route for a key
+
+        :rtype: _DROP | CompiledSchema | None
+        """
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        # Literals are matched directly, other key schemas are only tried if they have a higher priority
+        literal_index = self.literals.get(key)
+        route = None if literal_index is None else self.routes[literal_index]
+        for i, key_schema, is_identity in self.matchers:
+            if literal_index is not None and i > literal_index:
+                break
+            if is_identity or key_schema(key)[0]:
+                route = self.routes[i]
+                break
+
+        if len(self.cache) < self.cache_size:
+            self.cache[key] = route
+        return route
+
+
+class _SchemaDecoder:
+    """ JSON decoder that follows the structure of a compiled schema.
+
+    Only the values whose schema drops some keys are decoded in Python: everything else is decoded
+    by the standard (C-accelerated) scanner.
+
+    :param kwargs: Arguments for `json.JSONDecoder`
+    """
+
+    def __init__(self, **kwargs):
+        assert 'object_hook' not in kwargs and 'object_pairs_hook' not in kwargs, 'Object hooks are not supported'
+        decoder = json.JSONDecoder(**kwargs)
+        self.strict = decoder.strict
+        self.scan_once = make_scanner(decoder)
+        self.routers = {}
+        self.guided = {}
+
+    def decode(self, s, schema):
+        """ Decode a JSON document
+
+        :type s: str
+        :type schema: CompiledSchema
+        :raises json.JSONDecodeError: Malformed document
+        """
+        value, end = self.decode_value(s, _WHITESPACE.match(s, 0).end(), schema)
+        end = _WHITESPACE.match(s, end).end()
+        if end != len(s):
+            raise JSONDecodeError('Extra data', s, end)
+        return value
+
+    def decode_value(self, s, idx, schema):
+        """ Decode a single value starting at `idx`
+
+        :return: (value, end)
+        """
+        if schema is not None and self.is_guided(schema):
+            nextchar = s[idx:idx + 1]
+            if nextchar == '{' and schema.compiled_keys is not None:
+                return self.decode_object(s, idx + 1, self.get_router(schema))
+            if nextchar == '[' and schema.compiled_members is not None and len(schema.compiled_members) == 1:
+                return self.decode_array(s, idx + 1, schema.compiled_members[0])
+
+        try:
+            return self.scan_once(s, idx)
+        except StopIteration as e:
+            raise JSONDecodeError('Expecting value', s, e.value) from None
+
+    def is_guided(self, schema):
+        """ Whether the schema has keys to drop, at any depth: otherwise, it's decoded by the C scanner
+
+        :type schema: CompiledSchema
+        :rtype: bool
+        """
+        try:
+            return self.guided[id(schema)]
+        except KeyError:
+            pass
+
+        self.guided[id(schema)] = False  # (in case the schema refers to itself)
+        if schema.compiled_keys is not None:
+            guided = any(route is _DROP or (route is not None and self.is_guided(route))
+                         for route in self.get_router(schema).routes)
+        elif schema.compiled_members is not None and len(schema.compiled_members) == 1:
+            guided = self.is_guided(schema.compiled_members[0])
+        else:
+            guided = False
+        self.guided[id(schema)] = guided
+        return guided
+
+    def get_router(self, schema):
+        """ Get a router for the mapping schema
+
+        :type schema: CompiledSchema
+        :rtype: _MappingRouter
+        """
+        try:
+            return self.routers[id(schema)]
+        except KeyError:
+            router = self.routers[id(schema)] = _MappingRouter(schema)
+            return router
+
+    def decode_object(self, s, idx, router):
+        """ Decode an object, starting right after the opening brace """
+        d = {}
+
+        idx = _WHITESPACE.match(s, idx).end()
+        if s[idx:idx + 1] == '}':
+            return d, idx + 1
+
+        simple_key = _SIMPLE_KEY.match
+        delimiter = _OBJECT_DELIMITER.match
+        while True:
+            # Key: most keys have no escapes, and are matched with the colon at once
+            m = simple_key(s, idx)
+            if m is not None:
+                key, idx = m.group(1), m.end()
+            else:
+                if s[idx:idx + 1] != '"':
+                    raise JSONDecodeError('Expecting property name enclosed in double quotes', s, idx)
+                key, idx = scanstring(s, idx + 1, self.strict)
+
+                idx = _WHITESPACE.match(s, idx).end()
+                if s[idx:idx + 1] != ':':
+                    raise JSONDecodeError("Expecting ':' delimiter", s, idx)
+                idx = _WHITESPACE.match(s, idx + 1).end()
+
+            # Value
+            route = router(key)
+            if route is _DROP:
+                idx = self.skip_value(s, idx)
+            elif route is None or not self.is_guided(route):
+                try:
+                    d[key], idx = self.scan_once(s, idx)
+                except StopIteration as e:
+                    raise JSONDecodeError('Expecting value', s, e.value) from None
+            else:
+                d[key], idx = self.decode_value(s, idx, route)
+
+            # Delimiter
+            m = delimiter(s, idx)
+            if m is None:
+                raise JSONDecodeError("Expecting ',' delimiter", s, _WHITESPACE.match(s, idx).end())
+            idx = m.end()
+            if m.group(1) == '}':
+                return d, m.start(1) + 1
+
+    def decode_array(self, s, idx, member_schema):
+        """ Decode an array, starting right after the opening bracket """
+        values = []
+
+        idx = _WHITESPACE.match(s, idx).end()
+        if s[idx:idx + 1] == ']':
+            return values, idx + 1
+
+        while True:
+            value, idx = self.decode_value(s, idx, member_schema)
+            values.append(value)
+
+            idx = _WHITESPACE.match(s, idx).end()
+            nextchar = s[idx:idx + 1]
+            idx += 1
+            if nextchar == ']':
+                return values, idx
+            if nextchar != ',':
+                raise JSONDecodeError("Expecting ',' delimiter", s, idx - 1)
+            idx = _WHITESPACE.match(s, idx).end()
+
+    def skip_value(self, s, idx):
+        """ Skip over a value without decoding it: only check that it's valid JSON
+
+        :return: The index right after the value
+        :raises json.JSONDecodeError: Malformed value
+        """
+        token = _TOKEN_STRICT.match if self.strict else _TOKEN.match
+        flat = _FLAT_STRICT.match if self.strict else _FLAT.match
+        closers = []  # closing brackets of the open containers
+        state = _S_VALUE
+
+        while True:
+            # Containers of scalars are skipped at once
+            if state == _S_VALUE or state == _S_VALUE_OR_END:
+                m = flat(s, idx)
+                if m is not None:
+                    idx = m.end()
+                    if not closers:
+                        return idx
+                    state = _S_COMMA_OR_END
+                    continue
+
+            m = token(s, idx)
+            if m is None:
+                idx = _WHITESPACE.match(s, idx).end()
+                if state in (_S_VALUE, _S_VALUE_OR_END) and s[idx:idx + 1] == '"':
+                    scanstring(s, idx + 1, self.strict)  # raises a precise error: unterminated string, bad escape, etc
+                raise JSONDecodeError(_SKIP_ERRORS[state], s, idx)
+            kind = m.lastindex
+            c = m.group(kind)
+            idx = m.end()
+
+            if state == _S_VALUE or state == _S_VALUE_OR_END:
+                if kind == _T_PUNCTUATION:
+                    if c == '[':
+                        closers.append(']')
+                        state = _S_VALUE_OR_END
+                        continue
+                    elif c == '{':
+                        closers.append('}')
+                        state = _S_KEY_OR_END
+                        continue
+                    elif not (c == ']' and state == _S_VALUE_OR_END):
+                        raise JSONDecodeError(_SKIP_ERRORS[state], s, m.start(kind))
+                    closers.pop()
+            elif state == _S_KEY or state == _S_KEY_OR_END:
+                if kind == _T_STRING:
+                    state = _S_COLON
+                    continue
+                if not (c == '}' and state == _S_KEY_OR_END):
+                    raise JSONDecodeError(_SKIP_ERRORS[state], s, m.start(kind))
+                closers.pop()
+            elif state == _S_COLON:
+                if c != ':':
+                    raise JSONDecodeError(_SKIP_ERRORS[state], s, m.start(kind))
+                state = _S_VALUE
+                continue
+            else:  # _S_COMMA_OR_END
+                if c == ',':
+                    state = _S_KEY if closers[-1] == '}' else _S_VALUE
+                    continue
+                if c != closers[-1]:
+                    raise JSONDecodeError(_SKIP_ERRORS[state], s, m.start(kind))
+                closers.pop()
+
+            # A complete value
+            if not closers:
+                return idx
+            state = _S_COMMA_OR_END
+
+
+#: An item that fails to decode this close to the end of the buffer might be incomplete: '-Infinity' is the longest token
+_INCOMPLETE_MARGIN = 10
+
+
+class _ArrayReader:
+    """ Reads the items of a JSON array from a file, one by one.
+
+    The file is read in chunks; the text of the items that were decoded already is discarded.
+    Every item is decoded as soon as it's complete.
+
+    Items are decoded by the standard scanner, not by `_SchemaDecoder`: skipping the values of dropped keys
+    saves little memory when only one item is decoded at a time, and the C scanner is much faster.
+
+    :param fp: File object: text or binary
+    :param chunk_size: The number of characters (bytes) to read at once
+    :type chunk_size: int
+    :type decoder: _SchemaDecoder
+    """
+
+    def __init__(self, fp, chunk_size, decoder):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = decoder
+
+        self.buf = ''  # The text that was read, but not discarded
+        self.pos = 0  # Current position in `buf`
+        self.eof = False
+        self.text_decoder = None  # Incremental decoder for binary files
+
+        # The discarded text: the number of characters, newlines, and characters after the last newline.
+        # Used to report error positions in the document.
+        self.offset = self.lines = self.col = 0
+
+    def read(self, grow=False):
+        """ Discard the text before `pos`, and read some more
+
+        :param grow: Read at least as much as there is in the buffer already.
+            Used to retry an incomplete item: this way, a big item is retried a few times only.
+        :return: `False` on EOF
+        """
+        if self.eof:
+            return False
+
+        # Discard
+        buf, pos = self.buf, self.pos
+        if pos:
+            newlines = buf.count('\n', 0, pos)
+            if newlines:
+                self.lines += newlines
+                self.col = pos - buf.rfind('\n', 0, pos) - 1
+            else:
+                self.col += pos
+            self.offset += pos
+
+        # Read
+        chunk = self.fp.read(max(self.chunk_size, len(buf) - pos) if grow else self.chunk_size)
+        if isinstance(chunk, bytes):
+            if self.text_decoder is None:
+                self.text_decoder = codecs.getincrementaldecoder(_detect_encoding(chunk))('surrogatepass')
+            text = self.text_decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        self.eof = not chunk
+
+        self.buf = buf[pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """ Skip whitespace, and get the next character
+
+        :return: The character, or an empty string on EOF
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.read():
+                return self.buf[self.pos:self.pos + 1]
+
+    def decode(self):
+        """ Decode the item at `pos`, reading more until it's complete """
+        while True:
+            try:
+                value, end = self.decoder.decode_value(self.buf, self.pos, None)
+            except JSONDecodeError as e:
+                # Incomplete: the error is at the end of the buffer, or a string goes on past it.
+                # Otherwise, it's malformed: no need to read the rest of the file
+                if (e.pos >= len(self.buf) - _INCOMPLETE_MARGIN or e.msg.startswith('Unterminated string')) \
+                        and self.read(grow=True):
+                    continue
+                raise self.relocate(e) from None
+
+            # A scalar at the end of the buffer might go on in the next chunk: "1" of "123", "1." of "1.5"
+            nextchar = _WHITESPACE.match(self.buf, end).end()
+            if not self.eof and nextchar >= len(self.buf) - 2 and self.buf[nextchar:nextchar + 1] not in (',', ']') \
+                    and self.read(grow=True):
+                continue
+
+            self.pos = end
+            return value
+
+    def error(self, msg):
+        """ Make a decoding error at the current position """
+        return self.relocate(JSONDecodeError(msg, self.buf, self.pos))
+
+    def relocate(self, e):
+        """ Fix the position of a decoding error: it's relative to the buffer, not to the document
+
+        :type e: JSONDecodeError
+        :rtype: JSONDecodeError
+        """
+        if e.lineno == 1:
+            e.colno += self.col
+        e.lineno += self.lines
+        e.pos += self.offset
+        e.doc = None
+        e.args = ('{}: line {} column {} (char {})'.format(e.msg, e.lineno, e.colno, e.pos),)
+        return e
+
+    def __iter__(self):
+        if self.peek() != '[':
+            raise self.error("Expecting '['")
+        self.pos += 1
+
+        if self.peek() == ']':
+            self.pos += 1
+        else:
+            while True:
+                yield self.decode()
+
+                # Delimiter
+                nextchar = self.peek()
+                if nextchar == ']':
+                    self.pos += 1
+                    break
+                if nextchar != ',':
+                    raise self.error("Expecting ',' delimiter")
+                self.pos += 1
+                self.peek()
+
+        if self.peek() != '':
+            raise self.error('Extra data')
+
+
+def iter_array(fp, item_schema, errors='raise', chunk_size=65536, **kwargs):
+    """ Decode a JSON array from a file, and validate its items one by one.
+
+    `loads()` needs the whole document in memory, and then some more for the decoded values.
+    When the document is a huge array -- a multi-gigabyte export -- the file can be read incrementally:
+    every item is decoded and validated as soon as it's complete, and discarded once it's consumed.
+    The memory use is bounded by the largest item, not by the file.
+
+    ```python
+    import good.json
+    from good import Schema
+
+    with open('export.json', 'rb') as f:
+        for item in good.json.iter_array(f, {'id': int, 'name': str}):
+            save(item)
+    #-> Invalid: Wrong type @ [1234, 'name']: expected String, got Integer number
+    ```
+
+    Items are validated with a [`Stream`](#stream): errors have the index of the item in the path,
+    and invalid items are handled according to `errors`.
+
+    :param fp: File object, opened in text or binary mode. The encoding of a binary file is detected.
+    :param item_schema: The schema for every item: a `Schema`, or a schema definition
+    :type item_schema: Schema|*
+    :param errors: What to do with invalid items: 'raise', 'skip', or 'yield'. See [`Stream`](#stream).
+    :type errors: str
+    :param chunk_size: The number of characters (or bytes) to read at once
+    :type chunk_size: int
+    :param kwargs: Decoder arguments, as for `json.loads()`. Object hooks are not supported.
+    :return: Generator of sanitized items
+    :rtype: Iterator
+    :raises json.JSONDecodeError: Malformed document, raised when the malformed part is reached
+    :raises good.Invalid: Validation error of an item
+    """
+    return Stream(item_schema, errors=errors)(_ArrayReader(fp, chunk_size, _SchemaDecoder(**kwargs)))
+
+
+def loads(s, schema, **kwargs):
+    """ Decode a JSON document and validate it with the schema, skipping decoding of `Remove`d subtrees.
+
+    It uses less memory than `schema(json.loads(s))` when the removed subtrees are big,
+    but it's slower in general: see the module description.
+
+    ```python
+    import good.json
+    from good import Schema, Remove
+
+    schema = Schema({'name': str}, extra_keys=Remove)
+
+    good.json.loads('{"name": "Alex", "junk": {"a": 1}}', schema)  #-> {'name': 'Alex'}
+    good.json.loads('{"name": 1}', schema)
+    #-> Invalid: Wrong type @ ['name']: expected String, got Integer number
+    ```
+
+    :param s: The JSON document
+    :type s: str|bytes|bytearray
+    :param schema: The schema to validate the document with: a `Schema`, or a schema definition.
+
+        With a [`CachedSchema`](#cachedschema), the results are cached by the raw document.
+
+    :type schema: Schema|CachedSchema|*
+    :param kwargs: Decoder arguments, as for `json.loads()`. Object hooks are not supported.
+    :return: Sanitized value
+    :raises json.JSONDecodeError: Malformed document
+    :raises good.Invalid: Validation error
+    :raises good.MultipleInvalid: Validation errors
+    """
+    # Cached: keyed by the raw document. Decoder arguments change the result, so they're a part of the key.
+    # Within a call with a validation context, the result may depend on it: not cached
+    if isinstance(schema, CachedSchema):
+        if _validation_context.get() is not None:
+            return loads(s, schema.schema, **kwargs)
+        raw = bytes(s) if isinstance(s, bytearray) else s
+        key = (_RAW, raw, tuple(sorted(kwargs.items(), key=lambda item: item[0])))
+        try:
+            hash(key)
+        except TypeError:
+            return loads(s, schema.schema, **kwargs)
+        return schema.validate_key(key, len(raw) // 8 + 1, loads, s, schema.schema, **kwargs)
+
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode(_detect_encoding(s), 'surrogatepass')
+    if not isinstance(schema, Schema):
+        schema = Schema(schema)
+
+    value = _SchemaDecoder(**kwargs).decode(s, schema.compiled)
+    return schema(value)
+
+
+__all__ = ('loads', 'iter_array')
@@ -0,0 +1,282 @@
+""" Validation metrics: counters and latency histograms per schema, error counts per path.
+
+Metrics are collected by a sink, which is installed globally:
+
+```python
+import good.metrics
+from good import Schema
+
+sink = good.metrics.install(good.metrics.PrometheusSink())
+
+schema = Schema({'name': str, 'tags': [{'id': int}]})
+schema({'name': 'Alex', 'tags': [{'id': 'a'}]})  # (raises Invalid)
+
+print(sink.render())
+#-> # TYPE good_validations_total counter
+#-> good_validations_total{schema="Dictionary[name,tags,*]",result="invalid"} 1
+#-> ...
+#-> good_validation_errors_total{schema="Dictionary[name,tags,*]",path="['tags'][*]['id']",message="Wrong type",validator="Integer number"} 1
+```
+
+Every call of a [`Schema`](#schema) reports its latency, and the errors, if any. Schemas that are called
+by other schemas, e.g. the members of [`Any`](#any), are not measured separately: only the outermost call is.
+
+Error paths are normalized: list indices are replaced with `*`, so that each field has a single counter.
+Mapping keys are kept as is, and they might come from the input, e.g. with `{str: int}` or `Extra`:
+the number of error counters is capped, and the errors beyond it are counted together, as `(other)`.
+
+When no sink is installed, there's no overhead at all: `install()` replaces `Schema.__call__()` with an instrumented
+version, and `uninstall()` puts the original one back.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+from time import perf_counter
+
+from . import Schema, Invalid
+from .schema.context import ContextVar
+from .schema.util import get_primitive_name
+
+
+#: Default histogram buckets: seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: The path, message & validator of errors that did not get their own counter
+OTHER_ERRORS = u'(other)'
+
+#: Whether a measured call is in progress: nested schema calls are not measured
+_measuring = ContextVar('good.metrics.measuring', default=False)
+
+#: The installed sink, and the original `Schema.__call__`
+_installed = None
+
+
+class MetricsSink:
+    """ Base class for metrics sinks.
+
+    A sink receives every measured validation call. It's called from the validating thread,
+    so it should be fast, and thread-safe.
+    """
+
+    def observe(self, schema, seconds, error):
+        """ Record a validation call
+
+        :param schema: The schema that was called
+        :type schema: Schema
+        :param seconds: The duration of the call
+        :type seconds: float
+        :param error: The validation error, or `None` if the value is valid
+        :type error: Invalid|None
+        """
+        raise NotImplementedError
+
+
+class SchemaStats:
+    """ Validation statistics of a single schema
+
+    :param buckets: Histogram buckets: upper bounds, in seconds
+    :type buckets: tuple[float]
+    """
+
+    def __init__(self, buckets):
+        #: The number of calls
+        self.calls = 0
+        #: The number of failed calls
+        self.failures = 0
+        #: The total duration of calls, in seconds
+        self.seconds = 0.0
+        #: The number of calls in every bucket (not cumulative); the last one is for calls above the last bound
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+
+class InMemorySink(MetricsSink):
+    """ A sink that keeps the metrics in memory.
+
+    ```python
+    sink = good.metrics.install(good.metrics.InMemorySink())
+    ...
+    sink.schemas['Dictionary[name,tags,*]'].failures  #-> 1
+    sink.errors.most_common(10)
+    #-> [(('Dictionary[name,tags,*]', "['tags'][*]['id']", 'Wrong type', 'Integer number'), 1)]
+    ```
+
+    Error paths and messages may contain user input, so the number of error counters is capped by `max_errors`.
+    Once it's reached, new kinds of errors are counted per schema as `(schema name, OTHER_ERRORS, OTHER_ERRORS, OTHER_ERRORS)`.
+
+    :param buckets: Histogram buckets: upper bounds, in seconds
+    :type buckets: tuple[float]
+    :param max_errors: The maximum number of error counters
+    :type max_errors: int
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_errors=1000):
+        self.buckets = tuple(buckets)
+        self.max_errors = max_errors
+        self._lock = Lock()
+        #: Statistics per schema: { schema name: SchemaStats }
+        self.schemas = {}
+        #: Error counts: { (schema name, path, message, validator name): count }
+        self.errors = Counter()
+
+    def observe(self, schema, seconds, error):
+        bucket = bisect_left(self.buckets, seconds)
+        errors = [] if error is None else [
+            (schema.name, format_path(e.path), e.message, get_primitive_name(e.validator) if e.validator is not None else u'-')
+            for e in error
+        ]
+
+        with self._lock:
+            try:
+                stats = self.schemas[schema.name]
+            except KeyError:
+                stats = self.schemas[schema.name] = SchemaStats(self.buckets)
+
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.bucket_counts[bucket] += 1
+            if error is not None:
+                stats.failures += 1
+                for key in errors:
+                    if key not in self.errors and len(self.errors) >= self.max_errors:
+                        key = (schema.name, OTHER_ERRORS, OTHER_ERRORS, OTHER_ERRORS)
+                    self.errors[key] += 1
+
+    def reset(self):
+        """ Forget all collected metrics """
+        with self._lock:
+            self.schemas.clear()
+            self.errors.clear()
+
+
+class PrometheusSink(InMemorySink):
+    """ A sink that renders the metrics in the Prometheus text format.
+
+    Serve the output of `render()` from your application's metrics endpoint: no server is started.
+
+    Metrics:
+
+    * `good_validations_total{schema, result}`: counter of calls, with `result` being "valid" or "invalid"
+    * `good_validation_seconds{schema}`: histogram of call durations
+    * `good_validation_errors_total{schema, path, message, validator}`: counter of errors
+
+    :param buckets: Histogram buckets: upper bounds, in seconds
+    :type buckets: tuple[float]
+    :param prefix: Metric name prefix
+    :type prefix: str
+    :param max_errors: The maximum number of error counters
+    :type max_errors: int
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='good_', max_errors=1000):
+        super(PrometheusSink, self).__init__(buckets, max_errors)
+        self.prefix = prefix
+
+    def render(self):
+        """ Render the metrics
+
+        :rtype: str
+        """
+        with self._lock:
+            schemas = [(name, stats.calls, stats.failures, stats.seconds, list(stats.bucket_counts))
+                       for name, stats in self.schemas.items()]
+            errors = list(self.errors.items())
+
+        p = self.prefix
+        lines = []
+
+        lines.append('# HELP {}validations_total Validation calls'.format(p))
+        lines.append('# TYPE {}validations_total counter'.format(p))
+        for name, calls, failures, seconds, bucket_counts in schemas:
+            lines.append('{}validations_total{{schema="{}",result="valid"}} {}'.format(p, _escape(name), calls - failures))
+            lines.append('{}validations_total{{schema="{}",result="invalid"}} {}'.format(p, _escape(name), failures))
+
+        lines.append('# HELP {}validation_seconds Validation call duration'.format(p))
+        lines.append('# TYPE {}validation_seconds histogram'.format(p))
+        for name, calls, failures, seconds, bucket_counts in schemas:
+            total = 0
+            for le, count in zip(self.buckets + (float('inf'),), bucket_counts):
+                total += count
+                lines.append('{}validation_seconds_bucket{{schema="{}",le="{}"}} {}'.format(
+                    p, _escape(name), '+Inf' if le == float('inf') else repr(float(le)), total))
+            lines.append('{}validation_seconds_sum{{schema="{}"}} {!r}'.format(p, _escape(name), seconds))
+            lines.append('{}validation_seconds_count{{schema="{}"}} {}'.format(p, _escape(name), calls))
+
+        lines.append('# HELP {}validation_errors_total Validation errors'.format(p))
+        lines.append('# TYPE {}validation_errors_total counter'.format(p))
+        for (name, path, message, validator), count in errors:
+            lines.append('{}validation_errors_total{{schema="{}",path="{}",message="{}",validator="{}"}} {}'.format(
+                p, _escape(name), _escape(path), _escape(message), _escape(validator), count))
+
+        return '\n'.join(lines) + '\n'
+
+
+def format_path(path):
+    """ Format an error path, replacing list indices with `*`
+
+    :type path: list
+    :rtype: str
+    """
+    return u''.join(u'[*]' if type(k) is int else u'[{!r}]'.format(k) for k in path)
+
+
+def _escape(value):
+    """ Escape a Prometheus label value """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def install(sink):
+    """ Start collecting metrics of all schemas.
+
+    Replaces the sink, if one is installed already.
+
+    :param sink: The sink to report the metrics to
+    :type sink: MetricsSink
+    :return: The sink
+    :rtype: MetricsSink
+    """
+    global _installed
+    uninstall()
+
+    original_call = Schema.__call__
+
+    def __call__(self, value, context=None, timeout=None):
+        # Nested schemas: only the outermost call is measured
+        if _measuring.get():
+            return original_call(self, value, context, timeout)
+
+        token = _measuring.set(True)
+        start = perf_counter()
+        try:
+            value = original_call(self, value, context, timeout)
+        except Invalid as e:
+            sink.observe(self, perf_counter() - start, e)
+            raise
+        finally:
+            _measuring.reset(token)
+        sink.observe(self, perf_counter() - start, None)
+        return value
+
+    __call__.__doc__ = original_call.__doc__
+    Schema.__call__ = __call__
+    _installed = (sink, original_call)
+    return sink
+
+
+def uninstall():
+    """ Stop collecting metrics: restore the original `Schema.__call__()`
+
+    :return: The sink that was installed, if any
+    :rtype: MetricsSink|None
+    """
+    global _installed
+    if _installed is None:
+        return None
+
+    sink, original_call = _installed
+    Schema.__call__ = original_call
+    _installed = None
+    return sink
+
+
+__all__ = ('install', 'uninstall', 'MetricsSink', 'InMemorySink', 'PrometheusSink', 'SchemaStats', 'format_path')
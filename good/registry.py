@@ -0,0 +1,194 @@
+""" A registry of named schemas.
+
+Applications with lots of schemas usually define them at the module level, and pay for their compilation
+on process start. With a pre-fork server, each worker has to compile them again, unless they were compiled
+by the master process before forking: then all workers share the compiled schemas copy-on-write.
+
+`SchemaRegistry` keeps schema definitions by name, and compiles them either on first use, or all at once:
+
+```python
+from good.registry import SchemaRegistry
+
+schemas = SchemaRegistry()
+schemas.register('user', {'name': str, 'age': int})
+schemas.register_ref('order', 'myapp.schemas:ORDER')  # importable reference: 'module:attribute'
+
+# In the master process, before forking
+schemas.precompile()
+
+# In the worker
+schemas['user']({'name': 'Alex', 'age': 18})
+```
+
+Copy-on-write only holds while the workers don't write to the shared pages, but the garbage collector does:
+it updates the header of every object it visits. On CPython 3.7+, the recommended sequence is:
+
+```python
+import gc
+
+gc.disable()  # early on master startup: no collections that would free memory in the middle of the pages
+
+...  # import the application, register the schemas
+
+schemas.precompile(freeze=True)  # just before forking: moves all objects to the permanent generation
+# fork the workers, and call `gc.enable()` in each of them
+```
+
+This is eager compilation, and nothing more: there's no snapshot of compiled schemas to load in a fresh process.
+Compiled schemas can't be serialized to a file: they're closures built around the schema definition,
+and user callables. A process that is not forked from the one that has precompiled the schemas compiles them again.
+Importable references are the way to share a schema definition between processes.
+
+`precompile()` tells how long every schema took to compile: see `misc/performance/registry.py`
+for the effect on the startup of forked workers.
+"""
+
+import gc
+from time import perf_counter
+from importlib import import_module
+
+from . import Schema
+
+
+def resolve_ref(ref):
+    """ Import an object by its reference: 'package.module:attribute'
+
+    ```python
+    from good.registry import resolve_ref
+
+    resolve_ref('myapp.schemas:USER')  #-> <the object>
+    ```
+
+    :param ref: Importable reference
+    :type ref: str
+    :return: The referenced object
+    :raises ImportError: Module not found
+    :raises AttributeError: Attribute not found
+    """
+    module_name, sep, attr_path = ref.partition(':')
+    assert sep and attr_path, 'Reference must be formatted as "module:attribute"'
+
+    obj = import_module(module_name)
+    for attr in attr_path.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class SchemaRegistry:
+    """ A registry of named schemas.
+
+    Schemas are compiled on first access, or all at once with `precompile()`.
+
+    :param schema_cls: The class to compile the schemas with
+    :type schema_cls: type
+    """
+
+    def __init__(self, schema_cls=Schema):
+        self.schema_cls = schema_cls
+        self.definitions = {}  # name -> (definition, Schema() kwargs, is-reference)
+        self.schemas = {}  # name -> Schema
+        #: Compilation time of every compiled schema, in seconds: { name: seconds }
+        self.compile_times = {}
+
+    def register(self, name, schema, **kwargs):
+        """ Register a schema definition.
+
+        :param name: Schema name
+        :type name: str
+        :param schema: Schema definition, or a compiled `Schema`
+        :type schema: *
+        :param kwargs: Arguments for the `Schema`: `default_keys`, `extra_keys`, etc
+        :return: The name
+        :rtype: str
+        """
+        assert not (isinstance(schema, Schema) and kwargs), 'Schema() arguments are not supported for compiled schemas'
+        self.definitions[name] = (schema, kwargs, False)
+        self.schemas.pop(name, None)
+        self.compile_times.pop(name, None)
+        return name
+
+    def register_ref(self, name, ref, **kwargs):
+        """ Register a schema by an importable reference.
+
+        The reference is only imported when the schema is compiled.
+
+        :param name: Schema name
+        :type name: str
+        :param ref: Reference to a schema definition or a compiled `Schema`: 'module:attribute'
+        :type ref: str
+        :param kwargs: Arguments for the `Schema`: `default_keys`, `extra_keys`, etc.
+            Not supported when the reference is a compiled `Schema`: checked when it's compiled.
+        :return: The name
+        :rtype: str
+        """
+        self.definitions[name] = (ref, kwargs, True)
+        self.schemas.pop(name, None)
+        self.compile_times.pop(name, None)
+        return name
+
+    def compile(self, name):
+        """ Compile a registered schema, unless it's already compiled
+
+        :param name: Schema name
+        :type name: str
+        :rtype: Schema
+        :raises KeyError: Unknown schema name
+        :raises SchemaError: Schema compilation error
+        """
+        try:
+            return self.schemas[name]
+        except KeyError:
+            pass
+
+        started = perf_counter()
+        schema, kwargs, is_ref = self.definitions[name]
+        if is_ref:
+            schema = resolve_ref(schema)
+            assert not (isinstance(schema, Schema) and kwargs), 'Schema() arguments are not supported for compiled schemas'
+        if not isinstance(schema, Schema):
+            schema = self.schema_cls(schema, **kwargs)
+
+        # A concurrent thread might have compiled it as well: that's okay, the result is the same
+        self.compile_times[name] = perf_counter() - started
+        return self.schemas.setdefault(name, schema)
+
+    def precompile(self, freeze=False):
+        """ Compile all registered schemas.
+
+        Call it in the master process before forking workers, so they share the compiled schemas.
+
+        :param freeze: Move all objects to the permanent generation of the garbage collector (`gc.freeze()`),
+            so that the GC in the workers does not touch them and the memory pages stay shared.
+            It affects the whole process, not just the schemas: only use it right before forking,
+            with the GC disabled since startup. See the sequence above.
+        :type freeze: bool
+        :return: Compilation time of the schemas compiled by this call, in seconds: { name: seconds }.
+            Schemas that were compiled already are not included.
+        :rtype: dict
+        :raises SchemaError: Schema compilation error
+        """
+        times = {}
+        for name in self.definitions:
+            if name not in self.schemas:
+                self.compile(name)
+                times[name] = self.compile_times[name]
+
+        if freeze and hasattr(gc, 'freeze'):
+            gc.freeze()
+
+        return times
+
+    def __getitem__(self, name):
+        return self.compile(name)
+
+    def __contains__(self, name):
+        return name in self.definitions
+
+    def __iter__(self):
+        return iter(self.definitions)
+
+    def __len__(self):
+        return len(self.definitions)
+
+
+__all__ = ('SchemaRegistry', 'resolve_ref')
@@ -1,5 +1,17 @@
-from .compiler import CompiledSchema
-from . import markers
+from copy import deepcopy
+from time import perf_counter
+from gettext import gettext as _
+
+from .compiler import CompiledSchema, _deadline
+from .errors import Invalid, ValidationTimeout
+from .context import _validation_context, ContextVar
+from .record import Record
+from .util import apply_changes
+from . import markers, signals
+
+
+#: Whether a schema call is in progress: errors are released once, when they leave the outermost call
+_in_call = ContextVar('good_in_call', default=False)
 
 
 class Schema:
@@ -248,11 +260,93 @@ class Schema:
 
     In addition, [Markers](#markers) have individual priorities,
     which can be higher that literals ([`Remove()`](#remove) marker) or lower than callables ([`Extra`](#extra) marker).
+
+    ## Thread Safety
+
+    A compiled `Schema` is not modified after compilation, and can be called from multiple threads at once:
+    every call reports its own errors. Note that mappings are sanitized in-place, and iterables are returned as is
+    when none of their values has changed, so the same input object should not be validated by multiple threads
+    simultaneously.
+
+    Markers are notified about the schema they're compiled into, so each `Schema` compiles a copy of the marker:
+    a single marker instance can safely be used in multiple schemas.
+
+    Some validators, e.g. [`Msg`](#msg), modify the errors they catch, so custom callables should always raise
+    fresh `Invalid` instances, never a shared one. Also, callables should not rely on any mutable state of their own.
+
+    ## Error Sink
+
+    With large inputs, collecting all errors into a [`MultipleInvalid`](#multipleinvalid) might cost too much memory.
+    Instead, errors can be delivered to a callback, one by one, as soon as they're found:
+
+    ```python
+    from good import Schema
+
+    def on_error(e):
+        report.write('{}\\n'.format(e))
+
+    schema = Schema([{'id': int}], on_error=on_error)
+    schema([{'id': 1}, {'id': 'a'}, {}])
+    #-> Invalid: Validation failed: expected List[Dictionary[id,*]], got 2 errors
+    ```
+
+    Every error is reported once, with its final absolute path.
+    When done, the Schema raises a summary `Invalid` with the number of errors in `Invalid.info['errors']`.
+
+    Note that callables that validate with their own schemas, like [`Any`](#any) or [`Msg`](#msg),
+    collect the errors as usual, and report them to the sink only when they fail as a whole.
+
+    ## Validation Context
+
+    Validators that depend on request-scoped data -- tenant settings, the current user, feature flags --
+    don't need a new `Schema` for every request. Instead, the data is given to the call as `context`,
+    and validators read it with `get_context()`:
+
+    ```python
+    from good import Schema, Invalid, Length, ContextRef, get_context
+
+    def Feature(v):
+        if v not in get_context()['features']:
+            raise Invalid(u'Feature not enabled')
+        return v
+
+    schema = Schema({
+        'name': Length(max=ContextRef('max_name_len')),
+        'features': [Feature],
+    })
+
+    schema(user_input, context={'max_name_len': 50, 'features': {'beta'}})
+    ```
+
+    The context is available to all validators & markers called during the validation, including those of
+    embedded schemas, and those running in a thread pool (see [`Blocking`](#blocking)).
+    Parameterized validators accept [`ContextRef`](#contextref) instead of constants.
+
+    ## Deadline
+
+    A single pathological input -- a huge list, or a value that makes a validator slow -- should not occupy a worker
+    for long. A `Schema` can be given a time budget, in seconds: for every call, or for a single one:
+
+    ```python
+    from good import Schema
+
+    schema = Schema([{'id': int, 'name': str}], deadline=0.5)
+
+    schema(user_input)               # 0.5s
+    schema(user_input, timeout=0.1)  # 0.1s
+    #-> ValidationTimeout: Validation timed out @ [12345, 'name']: expected 0.100s, got 0.102s
+    ```
+
+    When the time runs out, [`ValidationTimeout`](#validationtimeout) is raised, with the path to the value that
+    was being validated. Containers check the clock once in a while, between their values:
+    a single slow validator is not interrupted, but the validation stops right after it.
+
+    Embedded schemas can't extend the budget of the outer call: the earliest deadline wins.
     """
 
     compiled_schema_cls = CompiledSchema
 
-    def __init__(self, schema, default_keys=None, extra_keys=None):
+    def __init__(self, schema, default_keys=None, extra_keys=None, limits=None, on_error=None, output=None, keep_validator=True, deadline=None):
         """ Creates a compiled `Schema` object from the given schema definition.
 
         Under the hood, it uses `SchemaCompiler`: see the [source](good/schema/compiler.py) if interested.
@@ -270,28 +364,182 @@ class Schema:
             Defaults to `markers.Reject`
 
         :type extra_keys: *
+        :param limits: Resource limits for the input: see [`Limits`](#limits).
+
+            Unlike `default_keys` and `extra_keys`, limits apply to all embedded mappings and iterables.
+
+        :type limits: Limits|None
+        :param on_error: Error sink: a callable that receives every `Invalid` error as soon as it's found,
+            with its final absolute path. See [Error Sink](#error-sink).
+        :type on_error: callable|None
+        :param output: Output type for a mapping schema: validate into compact [`Record`](#record)s instead of dicts.
+        :type output: type|None
+        :param keep_validator: Whether the errors keep the `validator` objects that have failed.
+            With `False`, only their names are kept: see [`Invalid.release()`](#invalidrelease).
+        :type keep_validator: bool
+        :param deadline: The time budget for every call, in seconds. See [Deadline](#deadline).
+        :type deadline: float|None
         :raises SchemaError: Schema compilation error
         """
+        self.keep_validator = keep_validator
+        self.deadline = deadline
+        if on_error is not None and not keep_validator:
+            on_error = self._releasing_sink(on_error)
+
         self.compiled = self.compiled_schema_cls(
             schema, [],
             default_keys,
-            extra_keys)
+            extra_keys,
+            limits=limits,
+            on_error=on_error,
+            output=output)
         self.name = self.compiled.name
 
+    @staticmethod
+    def _releasing_sink(on_error):
+        """ Wrap an error sink so that the errors don't keep the validators """
+        def releasing_sink(e):
+            return on_error(e.release(keep_validator=False))
+        return releasing_sink
+
     def __repr__(self):
         return repr(self.compiled)
 
     def __str__(self):
         return str(self.compiled)
 
-    def __call__(self, value):
+    def __call__(self, value, context=None, timeout=None):
         """ Having a [`Schema`](#schema), user input can be validated by calling the Schema on the input value.
 
         When called, the Schema will return sanitized value, or raise exceptions.
 
         :param value: Input value to validate
+        :param context: Validation context: request-scoped data for the validators. See [Validation Context](#validation-context).
+
+            When not given, embedded schemas use the context of the outer call.
+
+        :param timeout: The time budget for this call, in seconds: overrides the `deadline` of the Schema.
+            See [Deadline](#deadline).
+        :type timeout: float|None
         :return: Sanitized value
         :raises good.Invalid: Validation error on a single value. See [`Invalid`](#invalid).
         :raises good.MultipleInvalid: Validation error on multiple values. See [`MultipleInvalid`](#multipleinvalid).
+        :raises good.ValidationTimeout: The time budget is exceeded
+        """
+        token = _validation_context.set(context) if context is not None else None
+        nested = _in_call.get()
+        call_token = _in_call.set(True) if not nested else None
+
+        # Deadline: an embedded schema can't extend the deadline of the outer call
+        budget = timeout if timeout is not None else self.deadline
+        deadline_token = None
+        if budget is not None:
+            started = perf_counter()
+            deadline = started + budget
+            outer_deadline = _deadline.get()
+            if outer_deadline is None or deadline < outer_deadline:
+                deadline_token = _deadline.set(deadline)
+
+        try:
+            if self.compiled.on_error is not None:
+                return self.compiled.validate_with_sink(value)
+            return self.compiled(value)
+        except Invalid as e:
+            # Within another schema call, the error is released when it leaves the outermost one,
+            # unless this schema drops the validators. Members of `Any` often fail: no need to pay for it twice
+            if nested and self.keep_validator:
+                raise
+
+            # Errors leave the schema: drop the references to the frames, and the input they hold.
+            # The traceback will still refer to this frame: it should not keep the input, or the schema either.
+            e.release(self.keep_validator)
+            del self, value
+            raise e
+        except signals.DeadlineExceeded as e:
+            # The deadline of an outer call: it's not ours to report
+            if deadline_token is None:
+                raise
+            path = e.path
+        finally:
+            if token is not None:
+                _validation_context.reset(token)
+            if call_token is not None:
+                _in_call.reset(call_token)
+            if deadline_token is not None:
+                _deadline.reset(deadline_token)
+
+        # Out of time. The error is raised out of the `except` block: it has no context to keep alive
+        del value
+        raise ValidationTimeout(
+            _(u'Validation timed out'),
+            u'{:.3f}s'.format(budget),
+            u'{:.3f}s'.format(perf_counter() - started),
+            path,
+            self.compiled.schema
+        ).release(self.keep_validator)
+
+    def validate_patch(self, validated_doc, changes):
+        """ Validate a partial update of a document: only the changed paths are re-validated.
+
+        Given a document that was validated by this `Schema`, and a mapping of changes `{path: value}`,
+        produces the same result as a full validation of the changed document, but the cost is proportional
+        to the size of the changes, not the size of the document:
+
+        ```python
+        from good import Schema, Optional, Entire, Exclusive
+
+        schema = Schema({
+            'name': str,
+            'tags': [{'name': str, 'score': int}],
+            Optional('email'): str,
+            Optional('phone'): str,
+            Entire: Exclusive('email', 'phone'),
+        })
+
+        doc = schema({'name': 'Mark', 'tags': [{'name': 'python', 'score': 5}], 'email': 'mark@example.com'})
+        doc = schema.validate_patch(doc, {
+            'name': 'Alex',  # a single key
+            ('tags', 0, 'score'): 10,  # a path: mapping keys & list indices
+        })
+        #-> {'name': 'Alex', 'tags': [{'name': 'python', 'score': 10}], 'email': 'mark@example.com'}
+
+        schema.validate_patch(doc, {'phone': '+1 555 0100'})
+        #-> Invalid: Choose one of the options, not multiple: expected Exclusive(email,phone), got email,phone
+        ```
+
+        Paths are tuples of mapping keys and list indices; a non-tuple path is a single key.
+        Mapping keys can be added, but not removed: for that, validate the whole document.
+
+        Mappings only re-validate the changed keys, and then re-execute the [`Entire`](#entire) markers,
+        which may depend on any key. Lists re-validate the changed items. Whenever a container can't be patched
+        (e.g. a changed key would be removed, or a list has multiple member schemas), the container is validated
+        entirely.
+
+        The validated document is not modified: changed containers are copied, unchanged values are shared
+        with the new document.
+
+        Note that `validated_doc` must be the output of this `Schema`, and validation must be idempotent:
+        validating an already sanitized value again should not change it.
+
+        :param validated_doc: A document validated by this `Schema`
+        :param changes: New values for the changed paths: `{path: value}`
+        :type changes: dict
+        :return: Sanitized document
+        :raises LookupError: A changed path does not exist in the document
+        :raises good.Invalid: Validation error
+        :raises good.MultipleInvalid: Validation errors
         """
-        return self.compiled(value)
+        changes = {path if isinstance(path, tuple) else (path,): value
+                   for path, value in changes.items()}
+
+        try:
+            # With an error sink, errors are reported with the absolute paths tracked by the containers: no shortcuts
+            if self.compiled.on_error is not None:
+                if isinstance(validated_doc, Record):
+                    validated_doc = validated_doc._asdict()
+                return self.compiled.validate_with_sink(apply_changes(deepcopy(validated_doc), changes))
+            return self.compiled.validate_patch(validated_doc, changes)
+        except Invalid as e:
+            e.release(self.keep_validator)
+            del self, validated_doc, changes
+            raise e
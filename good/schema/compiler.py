@@ -1,8 +1,17 @@
+from enum import Enum
+from copy import copy, deepcopy
+from collections import OrderedDict
+from itertools import islice
 from gettext import gettext as _
+from concurrent.futures import Future
+from time import perf_counter
 
 from . import markers, signals
 from .errors import SchemaError, Invalid, MultipleInvalid
-from .util import get_type_name, get_literal_name, get_callable_name,  const, primitive_type
+from .context import ContextVar, copy_context
+from .limits import NO_LIMITS
+from .record import Record
+from .util import get_type_name, get_literal_name, get_callable_name,  const, primitive_type, group_changes, apply_changes
 
 
 def Identity(v):
@@ -15,6 +24,41 @@ def Identity(v):
 Identity.name = _(u'*')  # Set a name on it (for repr())
 
 
+class _ErrorSinkState:
+    """ The state of a validation call that reports errors to the `on_error` sink """
+    __slots__ = ('path', 'count')
+
+    def __init__(self):
+        #: The path to the value currently being validated. Containers push & pop keys as they go.
+        self.path = []
+        #: The number of reported errors
+        self.count = 0
+
+#: The current _ErrorSinkState
+_error_sink_state = ContextVar('good_error_sink_state')
+
+#: The deadline of the current validation call: a `perf_counter()` value, or `None`
+_deadline = ContextVar('good_deadline', default=None)
+
+#: The executors whose workers run the current validation: I/O-bound values nested in them are validated inline.
+#: Waiting for a task of the same pool from its own worker would deadlock once all workers wait.
+_worker_of = ContextVar('good_worker_of', default=())
+
+
+def _run_task(executor, validate, value):
+    """ Validate a value as a task of the executor """
+    _worker_of.set(_worker_of.get() + (executor,))
+    return validate(value)
+
+
+def _submit(executor, validate, value):
+    """ Dispatch a value to the executor, in a copy of the current context
+
+    :rtype: concurrent.futures.Future
+    """
+    return executor.submit(copy_context().run, _run_task, executor, validate, value)
+
+
 class CompiledSchema:
     """ Schema compiler.
 
@@ -29,20 +73,57 @@ class CompiledSchema:
             This is used with mapping validation: a "matcher" is a lightweight alternative to CompiledSchema which economizes exceptions in favor of just returning booleans.
 
             Note that some values cannot be matchers: e.g. callables, which can typecast dictionary keys.
+    :param limits: Resource limits for the input, applied to all sub-schemas
+    :type limits: Limits|None
+    :param depth: The number of containers this schema is nested into
+    :type depth: int
+    :param on_error: Error sink: containers report errors to it as they're found, instead of collecting them.
+        Applied to all sub-schemas, except matchers. See `validate_with_sink()`.
+    :type on_error: callable|None
+    :param output: Output type for a mapping schema: a `Record` class. Not applied to sub-schemas.
+    :type output: type|None
     """
 
-    def __init__(self, schema, path, default_keys=None, extra_keys=None, matcher=False):
+    #: The maximum number of key sets for which a mapping schema remembers the routing of keys: see `_get_key_router()`.
+    #: The least recently used ones are forgotten.
+    max_key_plans = 64
+
+    #: Key sets are only remembered when they have at most this number of keys on top of the literal keys of the schema
+    max_key_plan_extra_keys = 8
+
+    #: Containers check the deadline once per this number of items
+    deadline_check_interval = 32
+
+    def __init__(self, schema, path, default_keys=None, extra_keys=None, matcher=False, limits=None, depth=0, on_error=None, output=None):
         assert default_keys is None or issubclass(default_keys, markers.Marker), '`default_keys` value must be a Marker or None'
+        assert output is None or issubclass(output, Record), '`output` value must be a Record class or None'
 
         self.path = path
         self.schema = schema
         self.default_keys = default_keys or markers.Required
         self.extra_keys = extra_keys or markers.Reject
         self.matcher = matcher
+        self.limits = limits or NO_LIMITS
+        self.depth = depth
+        self.on_error = on_error
+        self.output = output
 
         # Compile
         self.name = None
         self.compiled_type = None
+        self._supports_undefined = None
+        #: Compiled member schemas of an iterable schema: tuple[CompiledSchema]
+        self.compiled_members = None
+        #: Compiled keys of a mapping schema, sorted by priority: list[(key-schema, value-schema, is-literal, is-identity)]
+        self.compiled_keys = None
+        #: Analyzed keys of a mapping schema, for `validate_patch()`. Built on first use
+        self._patch_plan = NotImplemented
+        #: Routing of keys for the key sets a mapping schema has seen: { frozenset(keys): plan }
+        self._key_plans = None
+        #: Thread pool for I/O-bound callables, which containers validate concurrently: see `Blocking`
+        self.executor = None
+        #: Record class of a mapping schema with `output`
+        self.record_cls = None
         self.compiled = self.compile_schema(self.schema)
 
         assert self.compiled_type is not None, 'Compiler did not set a schema `compiled_type`'
@@ -97,16 +178,23 @@ class CompiledSchema:
         1. A [`Required`](#required) mapping key was not provided, and it's mapped to `Default()`
         2. .. no more supported cases. Yet.
 
+        The result is computed on first access and remembered.
+        Concurrent threads might compute it simultaneously, but since the result is always the same, that's harmless.
+
         :rtype: bool
         """
+        # Remembered
+        if self._supports_undefined is not None:
+            return self._supports_undefined
+
         # Test
         try:
             yes = self(const.UNDEFINED) is not const.UNDEFINED
         except (Invalid, SchemaError):
             yes = False
 
-        # Remember (lame @cached_property)
-        self.__dict__['supports_undefined'] = yes
+        # Remember
+        self._supports_undefined = yes
         return yes
 
     #region Compilation Utils
@@ -167,7 +255,7 @@ class CompiledSchema:
                           x.compiled.key_schema.priority if x.compiled_type == const.COMPILED_TYPE.MARKER else 0
                       ), reverse=True)
 
-    def sub_compile(self, schema, path=None, matcher=False):
+    def sub_compile(self, schema, path=None, matcher=False, nested=False):
         """ Compile a sub-schema
 
         :param schema: Validation schema
@@ -176,6 +264,8 @@ class CompiledSchema:
         :type path: list|None
         :param matcher: Compile a matcher?
         :type matcher: bool
+        :param nested: Is it a schema for the contents of this container?
+        :type nested: bool
         :rtype: CompiledSchema
         """
         return type(self)(
@@ -183,7 +273,10 @@ class CompiledSchema:
             self.path + (path or []),
             None,
             None,
-            matcher
+            matcher,
+            self.limits,
+            self.depth + 1 if nested else self.depth,
+            None if matcher else self.on_error
         )
 
     def Invalid(self, message, expected):
@@ -216,6 +309,269 @@ class CompiledSchema:
             )
         return InvalidPartial
 
+    def _limit_str_len(self, validator):
+        """ Wrap a validator with the `Limits.max_str_len` check, if the limit is set
+
+        :type validator: callable
+        :rtype: callable
+        """
+        max_str_len = self.limits.max_str_len
+        if max_str_len is None:
+            return validator
+
+        err_str_len = self.Invalid(_(u'Too long ({max} is the most)').format(max=max_str_len), get_literal_name(max_str_len))
+
+        def validate_str_len(v):
+            if isinstance(v, (str, bytes)) and len(v) > max_str_len:
+                raise err_str_len(get_literal_name(len(v)))
+            return validator(v)
+        return validate_str_len
+
+    def _check_depth(self):
+        """ Check the `Limits.max_depth` for a container schema on compilation.
+
+        :return: Error partial to raise on entry to the container, or `None` if the depth is okay
+        """
+        max_depth = self.limits.max_depth
+        if max_depth is None or self.depth < max_depth:
+            return None
+        return self.Invalid(_(u'Too deeply nested ({max} is the most)').format(max=max_depth), get_literal_name(max_depth))
+
+    #endregion
+
+    #region Error Sink
+
+    def validate_with_sink(self, value):
+        """ Validate a value, reporting the errors to the `on_error` sink.
+
+        Each error is reported once, with its absolute path: containers keep track of the path while validating
+        their members, and errors are never collected or enriched by the upper levels.
+
+        If any errors were reported, a summary `Invalid` is raised in the end: with the number of errors
+        in `Invalid.info['errors']`.
+
+        :param value: The value to validate
+        :return: Sanitized value
+        :raises Invalid: Errors were reported
+        """
+        assert self.on_error is not None, 'The schema was compiled without an error sink'
+
+        state = _ErrorSinkState()
+        token = _error_sink_state.set(state)
+        try:
+            return self(value)
+        except signals.ErrorsReported:
+            pass
+        except Invalid as e:
+            # Errors of the top-level schema itself
+            self.report_errors(e)
+        finally:
+            _error_sink_state.reset(token)
+
+        raise Invalid(_(u'Validation failed'),
+                      self.name,
+                      _(u'{count} errors').format(count=state.count),
+                      [],
+                      self.schema,
+                      errors=state.count)
+
+    def report_errors(self, e):
+        """ Report errors to the `on_error` sink.
+
+        The errors are prefixed with the path to the value currently being validated.
+
+        :type e: Invalid|MultipleInvalid
+        """
+        state = _error_sink_state.get()
+        for err in e:
+            err.path = state.path + err.path
+            state.count += 1
+            self.on_error(err.release())
+
+    #endregion
+
+    #region Patch
+
+    #: Markers that only act on the keys they've matched: they don't depend on the other keys of the mapping
+    _patch_markers = (markers.Required, markers.Optional, markers.Allow, markers.Remove, markers.Reject, markers.Extra)
+
+    def validate_patch(self, doc, changes):
+        """ Validate a document that has changed: re-validate the changed paths only.
+
+        `doc` must be the output of this schema. It is not modified: the changed containers are copied,
+        and the rest is shared with the new document.
+
+        Mappings re-validate the changed keys, and re-execute `Entire` markers, which may depend on any key.
+        Iterables with a single member schema re-validate the changed items.
+        Other schemas, and mappings that can't be patched (e.g. a key that's removed), are validated entirely.
+
+        :param doc: The validated document
+        :param changes: New values: { path-tuple: value }. The path is relative to this schema.
+        :type changes: dict[tuple, *]
+        :return: Sanitized value: same as the full validation of the changed document
+        :raises LookupError: A path does not exist in the document
+        :raises Invalid: Validation errors
+        """
+        if () not in changes:
+            if self.compiled_type == const.COMPILED_TYPE.MAPPING:
+                patched = self._patch_mapping(doc, changes)
+                if patched is not NotImplemented:
+                    return patched
+            elif self.compiled_type == const.COMPILED_TYPE.ITERABLE:
+                patched = self._patch_iterable(doc, changes)
+                if patched is not NotImplemented:
+                    return patched
+
+        # Full validation. Validation sanitizes mappings in-place: don't touch the original document
+        if isinstance(doc, Record):
+            doc = doc._asdict()
+        return self(apply_changes(deepcopy(doc), changes))
+
+    def _patch_mapping(self, doc, changes):
+        """ Re-validate the changed keys of a mapping
+
+        :return: Sanitized mapping, or `NotImplemented` when it has to be validated entirely
+        """
+        if not isinstance(doc, (type(self.schema), Record)):
+            return NotImplemented
+
+        plan = self._get_patch_plan()
+        if plan is None:
+            return NotImplemented
+        literal_keys, non_literals, entire = plan
+
+        # Pick the key schema for every changed key, in the same order the full validation does:
+        # non-literal key schemas with a higher priority have a chance to match before the literal
+        patches = []  # [(key-schema index, key, value-schema, {path: value})]
+        for k, key_changes in group_changes(changes).items():
+            index = literal_keys.get(k)
+            for non_literal_index, key_schema in non_literals:
+                if index is not None and non_literal_index > index:
+                    break
+                marker = key_schema.compiled
+                if marker.key is Identity:
+                    matched = True
+                else:
+                    # Keys that are sanitized are not supported
+                    matched, sanitized_k = key_schema(k)
+                    if matched and sanitized_k != k:
+                        return NotImplemented
+                if matched:
+                    index = non_literal_index
+                    break
+            key_schema, value_schema, is_literal, is_identity = self.compiled_keys[index]
+
+            # The key would be removed or rejected: it's simpler to validate the whole mapping
+            marker = key_schema.compiled
+            if isinstance(marker, (markers.Remove, markers.Reject)) or \
+                    (type(marker) is markers.Extra and isinstance(value_schema.compiled, (markers.Remove, markers.Reject))):
+                return NotImplemented
+            patches.append((index, k, value_schema, key_changes))
+
+        # New keys: check the limits
+        d = doc._asdict() if isinstance(doc, Record) else copy(doc)
+        if self.limits.max_keys is not None or self.limits.max_str_len is not None:
+            if any(k not in d for index, k, value_schema, key_changes in patches):
+                return NotImplemented
+
+        # Validate
+        errors = []
+        patches.sort(key=lambda patch: patch[0])
+        for index, k, value_schema, key_changes in patches:
+            try:
+                if () in key_changes:
+                    v = apply_changes(None, key_changes)
+                    d[k] = value_schema(v)
+                else:
+                    v = d[k]
+                    d[k] = value_schema.validate_patch(v, key_changes)
+            except signals.RemoveValue:
+                d.pop(k, None)
+            except Invalid as e:
+                # Same as the full validation: an invalid input value stays in the mapping, for `Entire` to see it
+                if () in key_changes:
+                    d[k] = v
+                errors.append(e.enrich(
+                    expected=value_schema.name,
+                    provided=get_literal_name(v),
+                    path=self.path + [k],
+                    validator=value_schema
+                ))
+
+        # Markers that validate the whole mapping
+        for key_schema in entire:
+            try:
+                key_schema.compiled.execute(d, [])
+            except Invalid as e:
+                errors.append(e.enrich(
+                    expected=key_schema.name,
+                    provided=None,
+                    path=self.path,
+                    validator=key_schema.compiled
+                ))
+
+        if errors:
+            raise MultipleInvalid.if_multiple(errors)
+        return self.record_cls._from_mapping(d) if self.record_cls is not None else d
+
+    def _get_patch_plan(self):
+        """ Analyze the keys of a mapping schema for `validate_patch()`. The result is cached.
+
+        :return: ({ literal key: index in `compiled_keys` }, [(index, non-literal key schema)], [`Entire` key schemas]),
+            or `None` if the mapping can't be patched
+        :rtype: tuple|None
+        """
+        if self._patch_plan is NotImplemented:
+            literal_keys, non_literals, entire = {}, [], []
+            for index, (key_schema, value_schema, is_literal, is_identity) in enumerate(self.compiled_keys):
+                marker = key_schema.compiled
+                if type(marker) is markers.Entire:
+                    entire.append(key_schema)
+                elif type(marker) not in self._patch_markers:
+                    # Custom markers may depend on any key
+                    self._patch_plan = None
+                    break
+                elif is_literal:
+                    literal_keys.setdefault(marker.key, index)
+                else:
+                    non_literals.append((index, key_schema))
+            else:
+                self._patch_plan = (literal_keys, non_literals, entire)
+        return self._patch_plan
+
+    def _patch_iterable(self, doc, changes):
+        """ Re-validate the changed items of an iterable
+
+        :return: Sanitized iterable, or `NotImplemented` when it has to be validated entirely
+        """
+        schema_type = type(self.schema)
+        if len(self.compiled_members) != 1 or not isinstance(doc, schema_type):
+            return NotImplemented
+        member = self.compiled_members[0]
+
+        items = list(doc)
+        errors = []
+        removed = []
+        for i, item_changes in sorted(group_changes(changes).items()):
+            if not 0 <= i < len(items):
+                raise IndexError(i)
+
+            try:
+                if () in item_changes:
+                    items[i] = member(apply_changes(None, item_changes))
+                else:
+                    items[i] = member.validate_patch(items[i], item_changes)
+            except signals.RemoveValue:
+                removed.append(i)
+            except Invalid as e:
+                errors.append(e.enrich(path=[i]))
+
+        if errors:
+            raise MultipleInvalid.if_multiple(errors)
+        for i in reversed(removed):
+            del items[i]
+        return schema_type(items)
+
     #endregion
 
     #region Compilation Procedure
@@ -257,6 +613,8 @@ class CompiledSchema:
 
         if compiler is None:
             raise SchemaError(_(u'Unsupported schema data type {!r}').format(type(schema).__name__))
+        if self.output is not None and compiler != self._compile_mapping:
+            raise SchemaError(_(u'Output type is only supported for mapping schemas'))
 
         return compiler(schema)
 
@@ -318,6 +676,10 @@ class CompiledSchema:
             # Fine
             return v
 
+        # Limits
+        if schema in (str, bytes):
+            return self._limit_str_len(validate_type)
+
         return validate_type
 
     def _compile_schema(self, schema):
@@ -326,6 +688,9 @@ class CompiledSchema:
 
         self.name = schema.name
         self.compiled_type = schema.compiled_type
+        self.compiled_members = schema.compiled_members
+        self.compiled_keys = schema.compiled_keys
+        self.executor = schema.executor
 
         return schema.compiled
 
@@ -339,7 +704,31 @@ class CompiledSchema:
         # Error partials
         err_value = self.Invalid(_(u'Invalid {enum} value').format(enum=self.name), self.name)
 
+        # Value table: a dict lookup is way cheaper than the ValueError raised by the Enum on every miss.
+        # Only when the Enum does not customize the lookup with `_missing_()`, and its values are hashable.
+        table = None
+        if getattr(schema._missing_, '__func__', None) is Enum._missing_.__func__:
+            try:
+                table = {member.value: member for member in schema}
+            except TypeError:
+                pass
+
         # Validator
+        if table is not None:
+            def validate_enum(v):
+                # Members pass through
+                if isinstance(v, schema):
+                    return v
+
+                try:
+                    member = table.get(v, const.UNDEFINED)
+                except TypeError:  # unhashable
+                    member = const.UNDEFINED
+                if member is const.UNDEFINED:
+                    raise err_value(get_literal_name(v))
+                return member
+            return validate_enum
+
         def validate_enum(v):
             try:
                 return schema(v)
@@ -353,6 +742,7 @@ class CompiledSchema:
         # Prepare self
         self.compiled_type = const.COMPILED_TYPE.CALLABLE
         self.name = get_callable_name(schema)
+        self.executor = getattr(schema, 'executor', None)
 
         # Error utils
         enrich_exception = lambda e, value: e.enrich(
@@ -386,13 +776,13 @@ class CompiledSchema:
                     return False, v
             return match_with_callable
 
-        return validate_with_callable
+        return self._limit_str_len(validate_with_callable)
 
     def _compile_iterable(self, schema):
         """ Compile iterable: iterable of schemas treated as allowed values """
         # Compile each member as a schema
         schema_type = type(schema)
-        schema_subs = tuple(map(self.sub_compile, schema))
+        schema_subs = tuple(self.sub_compile(member, nested=True) for member in schema)
 
         # When the schema is an iterable with a single item (e.g. [dict(...)]),
         # Invalid errors from schema members should be immediately used.
@@ -401,6 +791,7 @@ class CompiledSchema:
 
         # Prepare self
         self.compiled_type = const.COMPILED_TYPE.ITERABLE
+        self.compiled_members = schema_subs
         self.name = _(u'{iterable_cls}[{iterable_options}]').format(
             iterable_cls=get_type_name(schema_type),
             iterable_options=_(u'|').join(x.name for x in schema_subs)
@@ -410,6 +801,21 @@ class CompiledSchema:
         err_type = self.Invalid(_(u'Wrong value type'), get_type_name(schema_type))
         err_value = self.Invalid(_(u'Invalid value'), self.name)
 
+        # Limits
+        err_depth = self._check_depth()
+        max_items = self.limits.max_items
+        err_items = self.Invalid(_(u'Too many items ({max} is the most)').format(max=max_items), get_literal_name(max_items))
+
+        # Error sink
+        on_error = self.on_error
+        report_errors = self.report_errors
+
+        # I/O-bound member
+        executor = schema_subs[0].executor if len(schema_subs) == 1 else None
+
+        # Deadline
+        check_interval = self.deadline_check_interval
+
         # Validator
         def validate_iterable(l):
             # Type check
@@ -417,37 +823,165 @@ class CompiledSchema:
                 # expected=<type>, provided=<type>
                 raise err_type(provided=get_type_name(type(l)))
 
+            # Limits: before anything is copied
+            if err_depth is not None:
+                raise err_depth(get_literal_name(self.depth + 1))
+            if max_items is not None and len(l) > max_items:
+                raise err_items(get_literal_name(len(l)))
+
+            # With an error sink, errors are reported immediately, and the path is tracked at runtime
+            path = _error_sink_state.get().path if on_error is not None else None
+            reported = False
+
+            deadline = _deadline.get()
+
+            # I/O-bound member: validate all values concurrently, and then walk through the futures in order.
+            # Since the member is single, `Future.result()` raises the same errors as the member itself.
+            # Within a task of the same executor, values are validated inline.
+            items, members = l, schema_subs
+            pool = executor if executor is not None and executor not in _worker_of.get() else None
+            if pool is not None:
+                items = [_submit(pool, schema_subs[0], value) for value in l]
+                members = (Future.result,)
+
             # Each `v` member should match to any `schema` member
             errors = []  # Errors for every value
             values = []  # Sanitized values
-            for value_index, value in list(enumerate(l)):
-                # Walk through schema members and test if any of them match
-                for value_schema in schema_subs:
-                    try:
-                        # Try to validate
-                        values.append(value_schema(value))
-                        break  # Success!
-                    except signals.RemoveValue:
-                        # `value_schema` commanded to drop this value
-                        break
-                    except Invalid as e:
-                        if error_passthrough:
-                            # Error-Passthrough enabled: add the original error
-                            errors.append(e.enrich(path=[value_index]))
+            for value_index, value in enumerate(items):
+                # Deadline: checked every once in a while
+                if deadline is not None and value_index % check_interval == 0 and perf_counter() > deadline:
+                    # Out of time: drop the pending values
+                    if pool is not None:
+                        for future in items[value_index:]:
+                            future.cancel()
+                    raise signals.DeadlineExceeded([value_index])
+
+                if path is not None:
+                    path.append(value_index)
+                try:
+                    # Walk through schema members and test if any of them match
+                    for value_schema in members:
+                        try:
+                            # Try to validate
+                            values.append(value_schema(value))
+                            break  # Success!
+                        except signals.RemoveValue:
+                            # `value_schema` commanded to drop this value
+                            break
+                        except signals.ErrorsReported:
+                            # `value_schema` has reported its errors already
+                            reported = True
                             break
+                        except Invalid as e:
+                            if error_passthrough:
+                                # Error-Passthrough enabled: add the original error
+                                if path is None:
+                                    errors.append(e.enrich(path=[value_index]))
+                                else:
+                                    report_errors(e)
+                                    reported = True
+                                break
+                            else:
+                                # Error-Passthrough disabled: Ignore errors and hope other members will succeed better
+                                pass
+                    else:
+                        if path is None:
+                            errors.append(err_value(get_literal_name(value), path=[value_index]))
                         else:
-                            # Error-Passthrough disabled: Ignore errors and hope other members will succeed better
-                            pass
-                else:
-                    errors.append(err_value(get_literal_name(value), path=[value_index]))
+                            report_errors(err_value(get_literal_name(value)))
+                            reported = True
+                except signals.DeadlineExceeded as e:
+                    e.path.insert(0, value_index)
+                    if pool is not None:
+                        for future in items[value_index + 1:]:
+                            future.cancel()
+                    raise
+                finally:
+                    if path is not None:
+                        path.pop()
 
             # Errors?
             if errors:
                 raise MultipleInvalid.if_multiple(errors)
+            if reported:
+                raise signals.ErrorsReported()
 
             # Typecast and finish
             return schema_type(values)
 
+        # A single member, e.g. `[int]`: a dedicated loop
+        if len(schema_subs) == 1 and executor is None and on_error is None:
+            member = schema_subs[0]
+
+            # Type members, e.g. `[float]`, never change the value: they're checked inline
+            member_type = None
+            if member.compiled_type == const.COMPILED_TYPE.TYPE and \
+                    (self.limits.max_str_len is None or member.schema not in (str, bytes)):
+                member_type = member.schema
+
+            def validate_homogeneous(l):
+                # Type check
+                if not isinstance(l, schema_type):
+                    # expected=<type>, provided=<type>
+                    raise err_type(provided=get_type_name(type(l)))
+
+                # Limits: before anything is copied
+                if err_depth is not None:
+                    raise err_depth(get_literal_name(self.depth + 1))
+                if max_items is not None and len(l) > max_items:
+                    raise err_items(get_literal_name(len(l)))
+
+                # Values are only copied once one of them changes: until then, the input is as good as the output
+                errors = []
+                values = None
+                deadline = _deadline.get()
+                if member_type is not None:
+                    # Type checks take no time: the deadline is only checked once
+                    if deadline is not None and perf_counter() > deadline:
+                        raise signals.DeadlineExceeded()
+
+                    for value_index, value in enumerate(l):
+                        if type(value) is not member_type:
+                            try:
+                                member(value)  # raises the error
+                            except Invalid as e:
+                                errors.append(e.enrich(path=[value_index]))
+                else:
+                    for value_index, value in enumerate(l):
+                        if deadline is not None and value_index % check_interval == 0 and perf_counter() > deadline:
+                            raise signals.DeadlineExceeded([value_index])
+
+                        try:
+                            sanitized = member(value)
+                        except signals.DeadlineExceeded as e:
+                            e.path.insert(0, value_index)
+                            raise
+                        except signals.RemoveValue:
+                            # `member` commanded to drop this value
+                            if values is None:
+                                values = list(islice(l, value_index))
+                            continue
+                        except Invalid as e:
+                            errors.append(e.enrich(path=[value_index]))
+                            continue
+
+                        if values is not None:
+                            values.append(sanitized)
+                        elif sanitized is not value:
+                            values = list(islice(l, value_index))
+                            values.append(sanitized)
+
+                # Errors?
+                if errors:
+                    raise MultipleInvalid.if_multiple(errors)
+
+                # Nothing has changed: return the input itself, unless it's a subclass
+                if values is None:
+                    return l if type(l) is schema_type else schema_type(l)
+                return schema_type(values)
+
+            validate_iterable = validate_homogeneous
+
         # Matcher
         if self.matcher:
             return self._compile_callable(validate_iterable)  # Stupidly use it as callable
@@ -463,6 +997,9 @@ class CompiledSchema:
         if issubclass(type(schema), type):
             schema = schema(Identity)  \
                 .on_compiled(name=Identity.name)  # Set a special name on it
+        # Otherwise, compile a clone: the user might be using the same marker in other schemas
+        else:
+            schema = schema.clone()
 
         # Compile Marker's schema
         key_schema = self.sub_compile(schema.key, matcher=self.matcher)
@@ -490,7 +1027,7 @@ class CompiledSchema:
 
         # Compile both keys & values as schemas.
         # Key schemas are compiled as "Matchers" for performance.
-        compiled = {self.sub_compile(key, matcher=True): self.sub_compile(value)
+        compiled = {self.sub_compile(key, matcher=True, nested=True): self.sub_compile(value, nested=True)
                     for key, value in schema.items()}
 
         # Notify Markers that they were compiled.
@@ -520,6 +1057,7 @@ class CompiledSchema:
 
         # Prepare self
         self.compiled_type = const.COMPILED_TYPE.MAPPING
+        self.compiled_keys = compiled
         self.name = _(u'{mapping_cls}[{mapping_keys}]').format(
             mapping_cls=get_type_name(type(schema)),
             mapping_keys=_(u',').join(key_schema.name for key_schema, value_schema, is_literal, is_identity in compiled)
@@ -529,6 +1067,45 @@ class CompiledSchema:
         schema_type = type(schema)
         err_type = self.Invalid(_(u'Wrong value type'), get_type_name(schema_type))
 
+        # Output records
+        make_record = None
+        if self.output is not None:
+            self.record_cls = self._get_record_cls(compiled)
+            make_record = self.record_cls._from_mapping
+
+        # Limits
+        err_depth = self._check_depth()
+        check_interval = self.deadline_check_interval
+        max_keys = self.limits.max_keys
+        err_keys = self.Invalid(_(u'Too many keys ({max} is the most)').format(max=max_keys), get_literal_name(max_keys))
+        max_str_len = self.limits.max_str_len
+        err_key_len = self.Invalid(_(u'Key too long ({max} is the most)').format(max=max_str_len), get_literal_name(max_str_len))
+
+        # Error sink
+        on_error = self.on_error
+        report_errors = self.report_errors
+
+        # I/O-bound values: literal keys are dispatched right away, other keys -- once they're matched
+        has_blocking = any(value_schema.executor is not None for key_schema, value_schema, is_literal, is_identity in compiled)
+        blocking_literals = [(key_schema.compiled.key, value_schema)
+                             for key_schema, value_schema, is_literal, is_identity in compiled
+                             if is_literal and value_schema.executor is not None]
+
+        # Key routing plans: { frozenset(keys): plan }
+        route_keys = self._get_key_router(compiled)
+        key_plans = self._key_plans = OrderedDict() if route_keys is not None else None
+        max_key_plans = self.max_key_plans
+        max_key_plan_size = sum(1 for key_schema, value_schema, is_literal, is_identity in compiled if is_literal) + \
+                            self.max_key_plan_extra_keys
+
+        def submit(futures, k, v, value_schema):
+            """ Dispatch an I/O-bound value to the thread pool, unless it's already dispatched.
+
+            Within a task of the same pool, the value is left to be validated inline.
+            """
+            if k not in futures and value_schema.executor not in _worker_of.get():
+                futures[k] = (v, value_schema, _submit(value_schema.executor, value_schema, v))
+
         # Validator
         def validate_mapping(d):
             # Type check
@@ -536,22 +1113,76 @@ class CompiledSchema:
                 # expected=<type>, provided=<type>
                 raise err_type(provided=get_type_name(type(d)))
 
+            # Limits: before anything is copied
+            if err_depth is not None:
+                raise err_depth(get_literal_name(self.depth + 1))
+            if max_keys is not None and len(d) > max_keys:
+                raise err_keys(get_literal_name(len(d)))
+            if max_str_len is not None:
+                for k in d:
+                    if isinstance(k, (str, bytes)) and len(k) > max_str_len:
+                        raise err_key_len(get_literal_name(len(k)), path=[k])
+
+            # Deadline: checked on entry, and then every `check_interval` values
+            deadline = _deadline.get()
+            if deadline is not None and perf_counter() > deadline:
+                raise signals.DeadlineExceeded()
+            n_values = 0
+
             # For each schema key, pick matching input key-value pairs.
             # Since we always have Extra which is a catch-all -- this will always result into a full input coverage.
             # Also, key schemas are sorted according to the priority, we're handling each set of matching keys in order.
 
             errors = []  # Collect errors on the fly
-            d_keys = set(d.keys())  # Make a copy of dict keys for destructive iteration
 
-            for key_schema, value_schema, is_literal, is_identity in compiled:
+            # Inputs often come with one of a few key sets: the routing of keys is remembered for every key set.
+            # Only string keys are remembered, so that keys like `1` and `True` never share a plan.
+            # Large key sets are mostly made of arbitrary keys, which are unlikely to repeat: not remembered.
+            plan = None
+            if key_plans is not None and len(d) <= max_key_plan_size:
+                shape = frozenset(d)
+                plan = key_plans.get(shape)
+                if plan is not None:
+                    try:
+                        key_plans.move_to_end(shape)
+                    except KeyError:
+                        pass  # evicted by a concurrent thread
+                elif all(type(k) is str for k in shape):
+                    plan = key_plans[shape] = route_keys(set(shape))
+                    while len(key_plans) > max_key_plans:
+                        try:
+                            key_plans.popitem(last=False)
+                        except KeyError:
+                            break  # emptied by a concurrent thread
+
+            d_keys = set(d.keys()) if plan is None else None  # Make a copy of dict keys for destructive iteration
+
+            # With an error sink, errors are reported immediately, and the path is tracked at runtime
+            path = _error_sink_state.get().path if on_error is not None else None
+            reported = False
+
+            # I/O-bound values: {input-key: (input-value, value-schema, future)}
+            futures = None
+            if has_blocking:
+                futures = {}
+                for k, value_schema in blocking_literals:
+                    if k in d:
+                        submit(futures, k, d[k], value_schema)
+
+            for index, (key_schema, value_schema, is_literal, is_identity) in enumerate(compiled):
                 # First, collect matching (key, value) pairs for the `key_schema`.
                 # Note that `key_schema` can change the value (e.g. `Coerce(int)`), so for every key
                 # we store both the initial value (`input-key`) and the sanitized value (`sanitized-key`).
                 # This results into a list of triples: [(input-key, sanitized-key, input-value), ...].
 
                 matches = []
+                execute_marker = True
 
-                if is_literal:  # (short-circuit for literals)
+                if plan is not None:  # (a known key set: keys are already routed)
+                    keys, execute_marker = plan[index]
+                    if keys:
+                        matches = [(k, k, d[k]) for k in keys]
+                elif is_literal:  # (short-circuit for literals)
                     # Since mapping keys are mostly literals --
                     # save some iterations & function calls in favor of direct matching,
                     # which introduces a HUGE performance improvement
@@ -592,21 +1223,30 @@ class CompiledSchema:
                 # and then proceed with value validation.
 
                 # Execute Marker first.
-                if key_schema.compiled_type == const.COMPILED_TYPE.MARKER:
+                if execute_marker and key_schema.compiled_type == const.COMPILED_TYPE.MARKER:
                     # Note that Markers can raise errors as well.
                     # Since they're compiled - all marker errors are raised as `Invalid`.
                     try:
                         matches = key_schema.compiled.execute(d, matches)
+                    except signals.ErrorsReported:
+                        # The marker has validated something with a sub-schema, which has reported its errors already
+                        reported = True
+                        continue
                     except Invalid as e:
                         # Add marker errors to the list of Invalid reports for this schema.
                         # Using enrich(), we're also setting `path` prefix, and other info known at this step.
-                        errors.append(e.enrich(
+                        e.enrich(
                             # Markers are responsible to set `expected`, `provided`, `validator`
                             expected=key_schema.name,
                             provided=None,  # Marker's required to set that
                             path=self.path,
                             validator=key_schema.compiled
-                        ))
+                        )
+                        if path is None:
+                            errors.append(e)
+                        else:
+                            report_errors(e)
+                            reported = True
                         # If a marker raised an error -- the (key, value) pair is already Invalid, and no
                         # further validation is required.
                         continue
@@ -614,11 +1254,26 @@ class CompiledSchema:
                 # Proceed with validation.
                 # Now, we validate values for every (key, value) pairs in the current list of matches,
                 # and rebuild the mapping.
+                if futures is not None and value_schema.executor is not None:
+                    for k, sanitized_k, v in matches:
+                        submit(futures, k, v, value_schema)
+
                 for k, sanitized_k, v in matches:
+                    if path is not None:
+                        path.append(k)
                     try:
+                        if deadline is not None:
+                            n_values += 1
+                            if n_values % check_interval == 0 and perf_counter() > deadline:
+                                raise signals.DeadlineExceeded()
+
                         # Execute the value schema and store it into the rebuilt mapping
                         # using the sanitized key, which might be different from the original key.
-                        d[sanitized_k] = value_schema(v)
+                        # I/O-bound values are taken from the futures, as long as they were dispatched with the same input.
+                        if futures and k in futures and futures[k][0] is v and futures[k][1] is value_schema:
+                            d[sanitized_k] = futures.pop(k)[2].result()
+                        else:
+                            d[sanitized_k] = value_schema(v)
 
                         # Remove the original key in case `key_schema` has transformed it.
                         if k != sanitized_k:
@@ -626,27 +1281,222 @@ class CompiledSchema:
                     except signals.RemoveValue:
                         # `value_schema` commanded to drop this value
                         del d[k]
+                    except signals.ErrorsReported:
+                        # `value_schema` has reported its errors already
+                        reported = True
                     except Invalid as e:
                         # Any value validation errors are appended to the list of Invalid reports for the schema
                         # enrich() adds more info on the collected errors.
-                        errors.append(e.enrich(
-                            expected=value_schema.name,
-                            provided=get_literal_name(v),
-                            path=self.path + [k],
-                            validator=value_schema
-                        ))
+                        if path is None:
+                            errors.append(e.enrich(
+                                expected=value_schema.name,
+                                provided=get_literal_name(v),
+                                path=self.path + [k],
+                                validator=value_schema
+                            ))
+                        else:
+                            # With an error sink, the path is already known
+                            report_errors(e.enrich(
+                                expected=value_schema.name,
+                                provided=get_literal_name(v),
+                                validator=value_schema
+                            ))
+                            reported = True
+                    except signals.DeadlineExceeded as e:
+                        # Out of time: report the path reached so far, and drop the pending values
+                        e.path.insert(0, k)
+                        if futures:
+                            for future_v, future_schema, future in futures.values():
+                                future.cancel()
+                        raise
+                    finally:
+                        if path is not None:
+                            path.pop()
 
             assert not d_keys, 'Keys must be empty after destructive iteration. Remainder: {!r}'.format(d_keys)
 
+            # Values that were dispatched, but never used (e.g. a marker has dropped them)
+            if futures:
+                for v, value_schema, future in futures.values():
+                    future.cancel()
+
             # Errors?
             if errors:
                 # Note that we did not care about whether a sub-schema raised a single Invalid or MultipleInvalid,
                 # since MultipleInvalid will flatten the list for us.
                 raise MultipleInvalid.if_multiple(errors)
+            if reported:
+                raise signals.ErrorsReported()
 
             # Finish
+            if make_record is not None:
+                # Only the fields are left in the mapping: extra keys were either rejected, or removed
+                return make_record(d)
             return d
 
+        # A single type key, e.g. `{str: int}`: a dedicated loop
+        if on_error is None and not has_blocking and make_record is None:
+            validate_mapping = self._compile_typed_mapping(compiled, validate_mapping) or validate_mapping
+
         return validate_mapping
 
+    def _compile_typed_mapping(self, compiled_keys, validate_mapping):
+        """ Compile a dedicated loop for a mapping with a single type key, e.g. `{str: int}`
+
+        When all input keys have the type, they're validated with no key matching, and no marker calls.
+        Other inputs are handed over to `validate_mapping()`.
+
+        :param compiled_keys: Compiled keys of the mapping schema: see `compiled_keys`
+        :type compiled_keys: list
+        :param validate_mapping: The generic validator
+        :type validate_mapping: callable
+        :return: The validator, or `None` if the schema has a different shape
+        :rtype: callable|None
+        """
+        # Shape: (Required|Optional)(type), and an `Extra` that does nothing unless there are extra keys
+        if len(compiled_keys) != 2:
+            return None
+        (key_schema, value_schema, is_literal, is_identity), (extra_schema, extra_value_schema, _, _) = compiled_keys
+        marker, extra = key_schema.compiled, extra_schema.compiled
+        if type(marker) not in (markers.Required, markers.Optional) or \
+                marker.key_schema.compiled_type != const.COMPILED_TYPE.TYPE:
+            return None
+        if type(extra) is not markers.Extra or \
+                isinstance(extra_value_schema.compiled, markers.Marker) and \
+                type(extra_value_schema.compiled) not in (markers.Reject, markers.Remove, markers.Allow):
+            return None
+
+        key_type = marker.key
+        required = type(marker) is markers.Required
+        schema_type = type(self.schema)
+
+        # Limits
+        err_depth = self._check_depth()
+        check_interval = self.deadline_check_interval
+        max_keys = self.limits.max_keys
+        max_str_len = self.limits.max_str_len
+
+        def validate_typed_mapping(d):
+            # Anything special goes the generic way: not a dict, no keys when they're required, keys of other types,
+            # exceeded limits
+            if not isinstance(d, schema_type) or (required and not d) or \
+                    err_depth is not None or (max_keys is not None and len(d) > max_keys):
+                return validate_mapping(d)
+            for k in d:
+                if type(k) is not key_type or \
+                        (max_str_len is not None and isinstance(k, (str, bytes)) and len(k) > max_str_len):
+                    return validate_mapping(d)
+
+            # Deadline: checked on entry, and then every `check_interval` values
+            deadline = _deadline.get()
+            if deadline is not None and perf_counter() > deadline:
+                raise signals.DeadlineExceeded()
+
+            # Validate values in-place
+            errors = []
+            removed = None
+            for n, (k, v) in enumerate(d.items(), 1):
+                try:
+                    if deadline is not None and n % check_interval == 0 and perf_counter() > deadline:
+                        raise signals.DeadlineExceeded()
+                    sanitized = value_schema(v)
+                except signals.DeadlineExceeded as e:
+                    e.path.insert(0, k)
+                    raise
+                except signals.RemoveValue:
+                    # `value_schema` commanded to drop this value
+                    if removed is None:
+                        removed = []
+                    removed.append(k)
+                    continue
+                except Invalid as e:
+                    errors.append(e.enrich(
+                        expected=value_schema.name,
+                        provided=get_literal_name(v),
+                        path=self.path + [k],
+                        validator=value_schema
+                    ))
+                    continue
+                if sanitized is not v:
+                    d[k] = sanitized  # (the size does not change: safe to do while iterating)
+
+            if removed is not None:
+                for k in removed:
+                    del d[k]
+
+            # Errors?
+            if errors:
+                raise MultipleInvalid.if_multiple(errors)
+            return d
+
+        return validate_typed_mapping
+
+    def _get_key_router(self, compiled_keys):
+        """ Get a function that routes a set of keys to the key schemas of a mapping
+
+        Routing can be remembered only when key schemas are pure functions of the key, and don't change it:
+        literals, types, and catch-alls like `Extra`.
+
+        :param compiled_keys: Compiled keys of the mapping schema: see `compiled_keys`
+        :type compiled_keys: list
+        :return: A function that takes a set of keys and returns a plan: [(keys, execute-marker?)]
+            for every key schema, or `None` if routing can't be remembered
+        :rtype: callable|None
+        """
+        for key_schema, value_schema, is_literal, is_identity in compiled_keys:
+            marker = key_schema.compiled
+            if key_schema.compiled_type != const.COMPILED_TYPE.MARKER:
+                return None
+            if not (marker.key is Identity or
+                    marker.key_schema.compiled_type in (const.COMPILED_TYPE.LITERAL, const.COMPILED_TYPE.TYPE)):
+                return None
+
+        def route_keys(d_keys):
+            """ Match the keys against key schemas, just like `validate_mapping()` does
+
+            :type d_keys: set
+            :rtype: tuple[tuple[tuple, bool]]
+            """
+            plan = []
+            for key_schema, value_schema, is_literal, is_identity in compiled_keys:
+                marker = key_schema.compiled
+                if is_literal:
+                    keys = (marker.key,) if marker.key in d_keys else ()
+                else:
+                    keys = tuple(k for k in d_keys if key_schema(k)[0])
+                d_keys.difference_update(keys)
+
+                # Markers that do nothing on these matches are skipped
+                execute_marker = not (type(marker) in (markers.Optional, markers.Allow) or
+                                      type(marker) is markers.Required and keys)
+                plan.append((keys, execute_marker))
+            return tuple(plan)
+
+        return route_keys
+
+    def _get_record_cls(self, compiled_keys):
+        """ Get the output record class for a mapping schema
+
+        :param compiled_keys: Compiled keys of the mapping schema: see `compiled_keys`
+        :type compiled_keys: list
+        :rtype: type
+        :raises SchemaError: The schema can't be validated into records
+        """
+        fields = []
+        for key_schema, value_schema, is_literal, is_identity in compiled_keys:
+            marker = key_schema.compiled
+            if is_literal:
+                # Literal keys become fields, unless they're dropped
+                if not isinstance(marker, (markers.Remove, markers.Reject)):
+                    fields.append(marker.key)
+            elif type(marker) is markers.Extra and \
+                    value_schema.compiled_type == const.COMPILED_TYPE.MARKER and \
+                    isinstance(value_schema.compiled, (markers.Remove, markers.Reject)):
+                # Extra keys are dropped
+                pass
+            else:
+                raise SchemaError(_(u'Output records only support literal keys, and extra keys must be rejected or removed: '
+                                    u'got {}').format(key_schema.name))
+        return self.output.define(fields)
+
     #endregion
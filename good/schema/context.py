@@ -0,0 +1,157 @@
+""" Validation context: request-scoped data available to validators """
+
+from gettext import gettext as _
+
+from .util import const
+
+try:
+    from contextvars import ContextVar, copy_context
+except ImportError:  # Python < 3.7: thread-local variables
+    from threading import local as _thread_local
+
+    _local = _thread_local()
+
+    def _get_vars():
+        """ Get the variables of the current thread: { ContextVar: value } """
+        try:
+            return _local.vars
+        except AttributeError:
+            _local.vars = {}
+            return _local.vars
+
+    class ContextVar:
+        """ A minimal substitute for `contextvars.ContextVar`: a thread-local variable """
+
+        def __init__(self, name, **kwargs):
+            self.name = name
+            self._default = kwargs  # {'default': value}, if given
+
+        def get(self, *default):
+            try:
+                return _get_vars()[self]
+            except KeyError:
+                if default:
+                    return default[0]
+                if self._default:
+                    return self._default['default']
+                raise LookupError(self)
+
+        def set(self, value):
+            """ Set the value. The token is the previous value """
+            vars = _get_vars()
+            token = vars.get(self, _Missing)
+            vars[self] = value
+            return token
+
+        def reset(self, token):
+            if token is _Missing:
+                _get_vars().pop(self, None)
+            else:
+                _get_vars()[self] = token
+
+    class _Missing:
+        """ A variable that was not set """
+
+    class _Context:
+        """ A minimal substitute for `contextvars.Context`: a copy of the variables, to run a function with """
+
+        def __init__(self, vars):
+            self.vars = vars
+
+        def run(self, callable, *args, **kwargs):
+            saved = _get_vars()
+            _local.vars = dict(self.vars)
+            try:
+                return callable(*args, **kwargs)
+            finally:
+                _local.vars = saved
+
+    def copy_context():
+        """ A minimal substitute for `contextvars.copy_context()` """
+        return _Context(dict(_get_vars()))
+
+
+#: The context of the current validation call: see `Schema.__call__()`
+_validation_context = ContextVar('good_validation_context', default=None)
+
+
+def get_context():
+    """ Get the context of the current validation call.
+
+    Validators and markers that depend on request-scoped data read it from the context,
+    which is given to the [`Schema`](#schema) call:
+
+    ```python
+    from good import Schema, Invalid, get_context
+
+    def OwnedByUser(v):
+        if v not in get_context()['user'].project_ids:
+            raise Invalid(u'Not your project')
+        return v
+
+    schema = Schema({'project_id': OwnedByUser})
+    schema({'project_id': 1}, context={'user': current_user})
+    ```
+
+    :return: The context, or `None` when the schema was called without one
+    """
+    return _validation_context.get()
+
+
+class ContextRef:
+    """ A reference to a value in the validation context.
+
+    Parameterized validators, like [`Length`](#length), [`Range`](#range) and [`Clamp`](#clamp),
+    accept it instead of a constant, and read the value from the context on every call:
+
+    ```python
+    from good import Schema, Length, ContextRef
+
+    schema = Schema({
+        'name': Length(max=ContextRef('max_name_len', default=50)),
+    })
+
+    schema({'name': 'a' * 100}, context={'max_name_len': 200})  #-> ok
+    schema({'name': 'a' * 100})
+    #-> Invalid: Too long (50 is the most) @ ['name']: expected 50, got 100
+    ```
+
+    This way, a schema is compiled once, and reused by requests with different settings.
+
+    :param name: The key in the context mapping
+    :type name: str
+    :param default: The value to use when the context has no such key, or there's no context.
+        Without a default, a missing value is a `LookupError`.
+    """
+
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default=const.UNDEFINED):
+        self.name = name
+        self.default = default
+
+    def __repr__(self):
+        return '{cls}({0.name!r})'.format(self, cls=type(self).__name__)
+
+    def __str__(self):
+        return _(u'<{name}>').format(name=self.name)
+
+    def get(self):
+        """ Get the value from the current context
+
+        :raises LookupError: The context has no such key, and there's no default
+        """
+        context = _validation_context.get()
+        try:
+            return context[self.name]
+        except (KeyError, TypeError):
+            if self.default is not const.UNDEFINED:
+                return self.default
+            if context is None:
+                raise LookupError(_(u'No validation context: {!r} requires a `context`').format(self))
+            raise LookupError(_(u'Validation context has no {!r}').format(self.name))
+
+
+def deref(value):
+    """ Get the value of a `ContextRef`, or return any other value as is """
+    return value.get() if isinstance(value, ContextRef) else value
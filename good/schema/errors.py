@@ -18,6 +18,9 @@ from good import Invalid, MultipleInvalid
 """
 
 
+from .util import get_primitive_name
+
+
 class BaseError(Exception):
     """ Base validation exception """
 
@@ -81,6 +84,10 @@ class Invalid(BaseError):
                'info={0.info!r})' \
             .format(self, cls=type(self).__name__,)
 
+    def __reduce__(self):
+        # Exceptions are copied & pickled using `args`, which do not reflect the changes made by `enrich()`
+        return type(self), (self.message,), self.__dict__
+
     def __str__(self):
         return u'{message}: expected {0.expected}, got {0.provided}'.format(
             self,
@@ -93,6 +100,29 @@ class Invalid(BaseError):
             )
         )
 
+    def release(self, keep_validator=True):
+        """ Release the references to the validation internals.
+
+        An error that was raised deep inside a schema has a traceback with every frame it went through,
+        and the frames refer to the whole input. When errors are kept around -- e.g. in batch reports --
+        they would retain all of that memory.
+
+        [`Schema`](#schema) calls it on every error that leaves the outermost call, so normally, there's no need to call it:
+        the tracebacks and chained exceptions (`__context__`, `__cause__`) are dropped.
+
+        :param keep_validator: Whether to keep `validator` objects. When `False`, they're replaced with their names.
+        :type keep_validator: bool
+        :return: self
+        :rtype: Invalid|MultipleInvalid
+        """
+        for e in (self,) + tuple(self):  # (`MultipleInvalid` and its errors)
+            e.__traceback__ = e.__context__ = e.__cause__ = None
+            if not keep_validator and e.validator is not None and not isinstance(e.validator, str):
+                name = getattr(e.validator, 'name', None)
+                e.validator = name if isinstance(name, str) else get_primitive_name(e.validator)
+            e.args = (e.message, e.expected, e.provided, e.path, e.validator)
+        return self
+
     def enrich(self, expected=None, provided=None, path=None, validator=None):
         """ Enrich this error with additional information.
 
@@ -145,6 +175,14 @@ class Invalid(BaseError):
         return self
 
 
+class ValidationTimeout(Invalid):
+    """ Validation has taken longer than allowed: see `deadline` & `timeout` of [`Schema`](#schema).
+
+    The `path` tells which value was being validated when the time ran out.
+    `expected` is the time budget, and `provided` is the time spent.
+    """
+
+
 class MultipleInvalid(Invalid):
     """ Validation errors for multiple values.
 
@@ -196,6 +234,9 @@ class MultipleInvalid(Invalid):
     def __repr__(self):
         return '{cls}({0!r})'.format(self.errors, cls=type(self).__name__)
 
+    def __reduce__(self):
+        return type(self), (self.errors,), self.__dict__
+
     @classmethod
     def flatten(cls, errors):
         """ Unwind `MultipleErrors` to have a plain list of `Invalid`
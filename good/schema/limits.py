@@ -0,0 +1,55 @@
+""" Resource limits for the validated input """
+
+
+class Limits:
+    """ Resource limits that protect the validation process from oversized input.
+
+    When a single payload is huge, validating it costs memory and CPU time proportional to its size,
+    even if it's obviously garbage. `Limits` defines cheap sanity checks that are performed on entry
+    to each node, before the input is iterated or copied:
+
+    ```python
+    from good import Schema, Limits
+
+    schema = Schema({
+        'name': str,
+        'tags': [str],
+    }, limits=Limits(max_items=100, max_keys=10, max_depth=2, max_str_len=1000))
+
+    schema({'name': 'a', 'tags': ['x'] * 1000})
+    #-> Invalid: Too many items (100 is the most) @ ['tags']: expected 100, got 1000
+    ```
+
+    Unlike `default_keys` & `extra_keys`, limits apply to all containers compiled as a part of the `Schema`,
+    including embedded mappings and iterables. However, they are not inherited by `Schema` objects that are
+    compiled separately: e.g. the sub-schemas of [`Any`](#any) or [`Msg`](#msg).
+
+    :param max_items: The maximum number of items in an iterable
+    :type max_items: int|None
+    :param max_keys: The maximum number of keys in a mapping
+    :type max_keys: int|None
+    :param max_depth: The maximum number of nested containers (mappings & iterables), including the top-level one
+    :type max_depth: int|None
+    :param max_str_len: The maximum length of strings: mapping keys, and values validated by types & callables
+    :type max_str_len: int|None
+    """
+
+    def __init__(self, max_items=None, max_keys=None, max_depth=None, max_str_len=None):
+        for limit in (max_items, max_keys, max_depth, max_str_len):
+            assert limit is None or isinstance(limit, int), 'Limits must be integers or None'
+
+        self.max_items = max_items
+        self.max_keys = max_keys
+        self.max_depth = max_depth
+        self.max_str_len = max_str_len
+
+    def __repr__(self):
+        return '{cls}(max_items={0.max_items!r}, ' \
+               'max_keys={0.max_keys!r}, ' \
+               'max_depth={0.max_depth!r}, ' \
+               'max_str_len={0.max_str_len!r})' \
+            .format(self, cls=type(self).__name__)
+
+
+#: No limits
+NO_LIMITS = Limits()
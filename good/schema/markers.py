@@ -27,6 +27,7 @@ Each marker can have it's own unique behavior since nothing is hardcoded into th
 Keep on reading to learn how markers perform.
 """
 
+from copy import copy
 from gettext import gettext as _
 
 from .signals import RemoveValue
@@ -118,6 +119,21 @@ class Marker:
             self.as_mapping_key = True
         return self
 
+    def clone(self):
+        """ Get a copy of this marker, without the information set by `on_compiled()`.
+
+        Since markers are notified on compilation, CompiledSchema always compiles a clone:
+        this way, a marker instance can be used in multiple schemas, and compiled schemas don't share any state.
+
+        :rtype: Marker
+        """
+        marker = copy(self)
+        marker.name = None
+        marker.key_schema = None
+        marker.value_schema = None
+        marker.as_mapping_key = False
+        return marker
+
     def __repr__(self):
         return '{cls}({0})'.format(
             self.name or self.key,
@@ -0,0 +1,146 @@
+""" Compact typed records: the output of mapping schemas """
+
+from gettext import gettext as _
+from keyword import iskeyword
+
+from .errors import SchemaError
+
+
+class Record:
+    """ A compact record: the output of a mapping schema compiled with `Schema(output=Record)`.
+
+    A `dict` costs a lot of memory per instance. When millions of validated mappings are kept in memory,
+    the schema can produce records instead: instances of a class with `__slots__`, generated from
+    the literal keys of the schema, in schema order:
+
+    ```python
+    from good import Schema, Optional, Record
+
+    schema = Schema({
+        'id': int,
+        'name': str,
+        Optional('age'): int,
+    }, output=Record)
+
+    user = schema({'id': 1, 'name': 'Alex'})
+    user  #-> Record(id=1, name='Alex')
+    user.name  #-> 'Alex'
+    user._fields  #-> ('id', 'name', 'age')
+    user._asdict()  #-> {'id': 1, 'name': 'Alex'}
+    ```
+
+    Optional keys which were not provided are left unset: accessing them raises `AttributeError`.
+
+    Only literal keys are supported, and they must be valid identifiers. Extra keys must be either
+    [`Reject`](#reject)ed or [`Remove`](#remove)d, so the output always fits into the record:
+    other schemas raise a `SchemaError`.
+
+    Records are validated and built in a single call: no intermediate copies are made.
+    To add methods, subclass `Record` and use the subclass as `output`.
+
+    Note that `output` only applies to the top-level mapping; embedded mappings are still validated into dicts.
+    """
+
+    __slots__ = ()
+
+    #: Field names, in schema order
+    _fields = ()
+
+    #: Generated classes: { (base class, fields): class }
+    _classes = {}
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def define(cls, fields):
+        """ Get a record class with the given fields.
+
+        Classes are cached, so schemas with the same fields share a single class.
+
+        :param fields: Field names
+        :type fields: tuple[str]
+        :rtype: type
+        :raises SchemaError: Field names are not valid identifiers
+        """
+        fields = tuple(fields)
+        try:
+            return cls._classes[cls, fields]
+        except KeyError:
+            pass
+
+        for name in fields:
+            if not isinstance(name, str) or not name.isidentifier() or iskeyword(name) or name.startswith('_'):
+                raise SchemaError(_(u'Record field name must be a public identifier: {!r}').format(name))
+
+        record_cls = type(cls.__name__, (cls,), {
+            '__slots__': fields,
+            '__module__': cls.__module__,
+            '_fields': fields,
+        })
+        record_cls._from_mapping = _make_from_mapping(record_cls)
+        return cls._classes.setdefault((cls, fields), record_cls)
+
+    @classmethod
+    def _from_mapping(cls, d):
+        """ Create a record from a mapping. Keys which are not fields are ignored.
+
+        Generated classes replace it with a faster function made for their fields.
+
+        :type d: dict
+        """
+        record = cls.__new__(cls)
+        for name in cls._fields:
+            if name in d:
+                setattr(record, name, d[name])
+        return record
+
+    def _asdict(self):
+        """ Convert the record to a dict, with the fields that are set
+
+        :rtype: dict
+        """
+        d = {}
+        for name in self._fields:
+            try:
+                d[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return d
+
+    def __eq__(self, other):
+        if not isinstance(other, Record) or self._fields != other._fields:
+            return NotImplemented
+        return self._asdict() == other._asdict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{cls}({fields})'.format(
+            cls=type(self).__name__,
+            fields=', '.join('{}={!r}'.format(name, value) for name, value in self._asdict().items()))
+
+    def __reduce__(self):
+        # Generated classes are not importable: pickle the base class & the fields
+        return _restore_record, (type(self).__bases__[0], self._fields, self._asdict())
+
+
+def _make_from_mapping(record_cls):
+    """ Generate `_from_mapping()` for a record class, the way `collections.namedtuple()` does.
+
+    Plain attribute assignments are much faster than setattr() calls in a loop.
+    Field names are safe to use in the code: they're verified to be identifiers.
+    """
+    source = 'def _from_mapping(d):\n' \
+             '    record = new(record_cls)\n' + \
+             ''.join('    if {0!r} in d: record.{0} = d[{0!r}]\n'.format(name) for name in record_cls._fields) + \
+             '    return record\n'
+    namespace = {'new': record_cls.__new__, 'record_cls': record_cls}
+    exec(source, namespace)
+    return namespace['_from_mapping']
+
+
+def _restore_record(base, fields, values):
+    """ Unpickle a record """
+    return base.define(fields)(**values)
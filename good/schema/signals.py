@@ -4,3 +4,19 @@ class BaseSignal(Exception):
 
 class RemoveValue(Exception):
     """ Signal SchemaCompiler to remove this value """
+
+
+class ErrorsReported(BaseSignal):
+    """ Signal the parent schema that the errors were already reported to the `on_error` sink """
+
+
+class DeadlineExceeded(BaseSignal):
+    """ Signal the `Schema` that the validation deadline is exceeded: it raises `ValidationTimeout`
+
+    Containers prepend their keys to the `path` as the signal goes through them.
+    """
+
+    def __init__(self, path=None):
+        super(DeadlineExceeded, self).__init__()
+        #: The path to the value that was being validated
+        self.path = path or []
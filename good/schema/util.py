@@ -214,3 +214,46 @@ def primitive_type(schema):
 def commajoin_as_strings(iterable):
     """ Join the given iterable with ',' """
     return _(u',').join((str(i) for i in iterable))
+
+
+def group_changes(changes):
+    """ Group document changes by the first path item
+
+    :param changes: { path-tuple: value }
+    :type changes: dict[tuple, *]
+    :return: { first path item: { the rest of the path: value } }
+    :rtype: dict
+    """
+    groups = {}
+    for path, value in changes.items():
+        groups.setdefault(path[0], {})[path[1:]] = value
+    return groups
+
+
+def apply_changes(value, changes):
+    """ Apply changes to a document. Mappings and lists are modified in-place, tuples are rebuilt.
+
+    The empty path replaces the document itself, and deeper paths are applied on top of it.
+
+    :param value: The document
+    :param changes: { path-tuple: value }
+    :type changes: dict[tuple, *]
+    :return: The changed document
+    :raises LookupError: A path does not exist in the document
+    """
+    if () in changes:
+        value = changes[()]
+
+    groups = group_changes({path: v for path, v in changes.items() if path})
+    if not groups:
+        return value
+
+    is_tuple = isinstance(value, tuple)
+    if is_tuple:
+        value = list(value)
+    for k, sub_changes in groups.items():
+        if () in sub_changes:
+            value[k] = apply_changes(None, sub_changes)
+        else:
+            value[k] = apply_changes(value[k], sub_changes)
+    return tuple(value) if is_tuple else value
@@ -129,6 +129,9 @@ class Boolean(ValidatorBase):
     _true_values_ci  = (u'y', u'Y', u'yes', u'Yes', u'YES', u'true',  u'True',  u'TRUE',  u'on',  u'On',  u'ON' )
     _false_values_ci = (u'n', u'N', u'no',  u'No',  u'NO',  u'false', u'False', u'FALSE', u'off', u'Off', u'OFF')
 
+    #: Boolean strings lookup table
+    _values = dict(dict.fromkeys(_true_values_ci, True), **dict.fromkeys(_false_values_ci, False))
+
     def __init__(self):
         self.name = _(u'Boolean')
 
@@ -141,14 +144,11 @@ class Boolean(ValidatorBase):
             return v != 0
         # Str
         elif isinstance(v, str):
-            v = str(v)
             # Match
-            if v in self._true_values_ci:
-                return True
-            elif v in self._false_values_ci:
-                return False
-            else:
+            value = self._values.get(str(v))
+            if value is None:
                 raise Invalid(_(u'Wrong boolean value'))
+            return value
         # Other types
         else:
             raise Invalid(_(u'Wrong boolean value type'), provided=get_type_name(type(v)))
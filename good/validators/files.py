@@ -1,23 +1,219 @@
 import os
+import stat
+from time import monotonic
+from threading import Lock
+from collections import OrderedDict
 from gettext import gettext as _
 
 from .base import ValidatorBase
 from .. import Invalid
 
 
+class StatCache:
+    """ A cache of `os.stat()` results, shared between file validators.
+
+    Every file validator does a single `os.stat()` call per value. With a cache, validators that check
+    the same path reuse the result, and no path is stat()ed twice within `ttl` seconds:
+
+    ```python
+    from good import Schema, All, IsFile, MaxSize, StatCache
+
+    cache = StatCache(ttl=60)
+    schema = Schema([All(IsFile(cache=cache), MaxSize(1024, cache=cache))])
+    ```
+
+    When validating many paths under the same directory, list it with `prefetch()`:
+    a single `os.scandir()` call tells which paths exist, and what their types are.
+    Paths are normalized: `prefetch('/data')` is used for `'/data/file'`, `'/data//file'` and `'/data/./file'`.
+    `..` is kept as is: with symlinks, `'/data/link/..'` is not necessarily `'/data'`.
+
+    ```python
+    cache.prefetch('/var/spool/data')
+    schema(['/var/spool/data/a.csv', '/var/spool/data/b.csv'])
+    ```
+
+    Expired results are dropped as new ones are added, so the cache only holds the paths seen within `ttl` seconds.
+
+    It's safe to use from multiple threads, e.g. with [`Blocking()`](#blocking) validators.
+
+    :param ttl: The number of seconds to remember the results for
+    :type ttl: float
+    """
+
+    def __init__(self, ttl=10.0):
+        self.ttl = ttl
+        self._lock = Lock()
+        # In the order of expiration: the oldest go first
+        self.entries = OrderedDict()  # normalized path -> (expires, os.stat_result | os.DirEntry | None)
+        self.listings = OrderedDict()  # normalized directory -> expires
+
+    def stat(self, path):
+        """ Get the stat of a path
+
+        :param path: The path
+        :type path: str|bytes
+        :return: `os.stat_result`, or `os.DirEntry` for prefetched paths, or `None` if the path does not exist
+        :rtype: os.stat_result|os.DirEntry|None
+        """
+        if not isinstance(path, (str, bytes)) or not path:
+            return _stat(path)
+        key, is_dir = _normalize(path)
+        now = monotonic()
+
+        with self._lock:
+            # Cached
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                return _dir_only(entry[1]) if is_dir else entry[1]
+
+            # Missing from a prefetched directory
+            parent, name = os.path.split(key)
+            if name and self.listings.get(parent or _curdir(key), 0) > now:
+                return None
+
+        # Stat: without the trailing separator, so that the result is valid for both forms
+        st = _stat(key)
+        with self._lock:
+            self._evict(now)
+            self.entries.pop(key, None)
+            self.entries[key] = (now + self.ttl, st)
+        return _dir_only(st) if is_dir else st
+
+    def prefetch(self, directory):
+        """ List the directory, and remember its entries.
+
+        Until the `ttl` expires, paths under this directory that were not listed are reported as missing.
+
+        :param directory: The directory to list
+        :type directory: str|bytes
+        :return: The number of entries
+        :rtype: int
+        :raises OSError: Failed to list the directory
+        """
+        directory, is_dir = _normalize(directory)
+
+        # Read the listing at once: the iterator is closed when it's exhausted.
+        # Entries of the current directory are keyed by their names, the way relative paths are normalized
+        is_curdir = directory == _curdir(directory)
+        listed = []
+        for entry in list(os.scandir(directory)):
+            # Symlinks are resolved right away: a dangling symlink does not exist
+            st = entry if not entry.is_symlink() else _stat(entry.path)
+            listed.append((entry.name if is_curdir else os.path.join(directory, entry.name), st))
+
+        now = monotonic()
+        expires = now + self.ttl
+        with self._lock:
+            self._evict(now)
+            for path, st in listed:
+                self.entries.pop(path, None)
+                self.entries[path] = (expires, st)
+            self.listings.pop(directory, None)
+            self.listings[directory] = expires
+        return len(listed)
+
+    def _evict(self, now):
+        """ Drop the expired results: they're ordered by expiration, so only the oldest ones are looked at.
+
+        Must be called with the lock held.
+        """
+        entries, listings = self.entries, self.listings
+        while entries and next(iter(entries.values()))[0] <= now:
+            entries.popitem(last=False)
+        while listings and next(iter(listings.values())) <= now:
+            listings.popitem(last=False)
+
+    def clear(self):
+        """ Forget everything """
+        with self._lock:
+            self.entries.clear()
+            self.listings.clear()
+
+
+def _normalize(path):
+    """ Normalize a path to be used as a cache key.
+
+    Redundant separators, `.` components and trailing separators are dropped.
+    Paths with `..` components are kept as is: with symlinks, `a/..` is not necessarily the parent of `a`.
+
+    :type path: str|bytes
+    :return: (normalized path, whether the path must be a directory: it has a trailing separator)
+    :rtype: (str|bytes, bool)
+    """
+    if isinstance(path, bytes):
+        seps, parent = tuple(os.fsencode(sep) for sep in (os.sep, os.altsep) if sep), b'..'
+    else:
+        seps, parent = tuple(sep for sep in (os.sep, os.altsep) if sep), '..'
+
+    parts = path.replace(seps[-1], seps[0]).split(seps[0]) if len(seps) > 1 else path.split(seps[0])
+    if parent in parts:
+        return path, False
+    return os.path.normpath(path), path.endswith(seps)
+
+
+def _curdir(path):
+    """ The name of the current directory, of the same type as the path
+
+    :type path: str|bytes
+    :rtype: str|bytes
+    """
+    return os.fsencode(os.curdir) if isinstance(path, bytes) else os.curdir
+
+
+def _dir_only(st):
+    """ The stat of a path with a trailing separator: only directories exist this way
+
+    :type st: os.stat_result|os.DirEntry|None
+    :rtype: os.stat_result|os.DirEntry|None
+    """
+    if st is None or (stat.S_ISDIR(st.st_mode) if isinstance(st, os.stat_result) else st.is_dir()):
+        return st
+    return None
+
+
+def _stat(path):
+    """ Stat a path, following symlinks
+
+    :rtype: os.stat_result|None
+    """
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
 class PathExists(ValidatorBase):
-    """ Verify that the path exists. """
+    """ Verify that the path exists.
+
+    All file validators do a single `os.stat()` call per value.
+    To share the results between validators, provide a [`StatCache`](#statcache).
+
+    :param cache: The cache for `os.stat()` results
+    :type cache: StatCache|None
+    """
 
     name = u'Existing path'
 
-    def __init__(self):
+    def __init__(self, cache=None):
         super(PathExists, self).__init__()
+        self.stat = cache.stat if cache is not None else _stat
 
     def __call__(self, v):
-        if not os.path.exists(v):
+        st = self.stat(v)
+        if st is None:
             raise Invalid(_(u'Path does not exist'), provided=u'Missing path')
+        self.check(v, st)
         return v
 
+    def check(self, v, st):
+        """ Check the stat of an existing path
+
+        :param v: The path
+        :param st: The stat result: `os.stat_result`, or `os.DirEntry` for paths prefetched by `StatCache`
+        :type st: os.stat_result|os.DirEntry
+        :raises Invalid: errors
+        """
+
 
 class IsFile(PathExists):
     """ Verify that the file exists.
@@ -35,11 +231,9 @@ class IsFile(PathExists):
 
     name = u'File path'
 
-    def __call__(self, v):
-        super(IsFile, self).__call__(v)
-        if not os.path.isfile(v):
+    def check(self, v, st):
+        if not (stat.S_ISREG(st.st_mode) if isinstance(st, os.stat_result) else st.is_file()):
             raise Invalid(_(u'Is not a file'), provided=u'Not a file')
-        return v
 
 
 class IsDir(PathExists):
@@ -47,12 +241,82 @@ class IsDir(PathExists):
 
     name = u'Directory path'
 
-    def __call__(self, v):
-        super(IsDir, self).__call__(v)
-        if not os.path.isdir(v):
+    def check(self, v, st):
+        if not (stat.S_ISDIR(st.st_mode) if isinstance(st, os.stat_result) else st.is_dir()):
             raise Invalid(_(u'Is not a directory'), provided=u'Not a directory')
-        return v
 
 
+class IsReadable(PathExists):
+    """ Verify that the path is readable by the current user.
+
+    The check uses the permission bits of the path, so it does not take ACLs into account.
+
+    ```python
+    from good import Schema, IsReadable
+
+    schema = Schema(IsReadable())
+
+    schema('/etc/hosts')  #-> '/etc/hosts'
+    schema('/etc/shadow')
+    #-> Invalid: Path is not readable: expected Readable path, got Not readable
+    ```
+    """
+
+    name = u'Readable path'
+
+    def check(self, v, st):
+        if not _is_readable(v, st if isinstance(st, os.stat_result) else st.stat()):
+            raise Invalid(_(u'Path is not readable'), provided=u'Not readable')
+
+
+def _is_readable(path, st):
+    """ Check whether the current user can read a path, using its stat result
+
+    :type st: os.stat_result
+    :rtype: bool
+    """
+    if not hasattr(os, 'geteuid'):
+        return os.access(path, os.R_OK)
+
+    uid = os.geteuid()
+    if uid == 0:
+        return True
+    if st.st_uid == uid:
+        return bool(st.st_mode & stat.S_IRUSR)
+    if st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+        return bool(st.st_mode & stat.S_IRGRP)
+    return bool(st.st_mode & stat.S_IROTH)
+
+
+class MaxSize(PathExists):
+    """ Verify that the file size does not exceed the limit.
+
+    ```python
+    from good import Schema, MaxSize
+
+    schema = Schema(MaxSize(1024))
+
+    schema('/etc/hosts')  #-> '/etc/hosts'
+    schema('/bin/bash')
+    #-> Invalid: File too large (1024 bytes is the most): expected File up to 1024 bytes, got 1183448 bytes
+    ```
+
+    :param max: The maximum size, in bytes
+    :type max: int
+    :param cache: The cache for `os.stat()` results
+    :type cache: StatCache|None
+    """
+
+    def __init__(self, max, cache=None):
+        super(MaxSize, self).__init__(cache)
+        self.max = max
+        self.name = _(u'File up to {max} bytes').format(max=max)
+
+    def check(self, v, st):
+        size = (st if isinstance(st, os.stat_result) else st.stat()).st_size
+        if size > self.max:
+            raise Invalid(_(u'File too large ({max} bytes is the most)').format(max=self.max),
+                          provided=_(u'{size} bytes').format(size=size))
+
 
-__all__ = ('IsFile', 'IsDir', 'PathExists',)
+__all__ = ('IsFile', 'IsDir', 'PathExists', 'IsReadable', 'MaxSize', 'StatCache',)
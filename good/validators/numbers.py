@@ -3,6 +3,7 @@ from gettext import gettext as _
 from .base import ValidatorBase
 from .. import Invalid
 from ..schema.util import get_literal_name, get_type_name
+from ..schema.context import ContextRef, deref
 
 
 class Range(ValidatorBase):
@@ -23,21 +24,26 @@ class Range(ValidatorBase):
     If the value cannot be compared to a number -- raises [`Invalid`](#invalid).
     Note that in Python2 almost everything can be compared to a number, including strings, dicts and lists!
 
+    The bounds can be read from the validation context: see [`ContextRef`](#contextref).
+
     :param min: Minimal allowed value, or `None` to impose no limits.
-    :type min: int|float|None
+    :type min: int|float|ContextRef|None
     :param max: Maximal allowed value, or `None` to impose no limits.
-    :type max: int|float|None
+    :type max: int|float|ContextRef|None
     """
 
     def __init__(self, min=None, max=None):
         # `min` validator
-        self.min_error = lambda: Invalid(_(u'Value must be at least {min}').format(min=min), get_literal_name(min))
+        self.min_error = lambda min: Invalid(_(u'Value must be at least {min}').format(min=min), get_literal_name(min))
         self.min = min
 
         # `max` validator
-        self.max_error = lambda: Invalid(_(u'Value must be at most {max}').format(max=max),  get_literal_name(max))
+        self.max_error = lambda max: Invalid(_(u'Value must be at most {max}').format(max=max),  get_literal_name(max))
         self.max = max
 
+        # Bounds from the context
+        self.dynamic = isinstance(min, ContextRef) or isinstance(max, ContextRef)
+
         # Name
         self.name = _(u'Range({min}..{max})').format(
             min=_(u'') if min is None else min,
@@ -45,12 +51,16 @@ class Range(ValidatorBase):
         )
 
     def __call__(self, v):
+        min, max = self.min, self.max
+        if self.dynamic:
+            min, max = deref(min), deref(max)
+
         # Validate
         try:
-            if self.min is not None and v < self.min:
-                raise self.min_error()
-            if self.max is not None and v > self.max:
-                raise self.max_error()
+            if min is not None and v < min:
+                raise self.min_error(min)
+            if max is not None and v > max:
+                raise self.max_error(max)
         except TypeError:  # cannot compare
             raise Invalid(_(u'Value should be a number'), _(u'Number'), get_type_name(type(v)))
 
@@ -75,16 +85,21 @@ class Clamp(ValidatorBase):
     If the value cannot be compared to a number -- raises [`Invalid`](#invalid).
     Note that in Python2 almost everything can be compared to a number, including strings, dicts and lists!
 
+    The bounds can be read from the validation context: see [`ContextRef`](#contextref).
+
     :param min: Minimal allowed value, or `None` to impose no limits.
-    :type min: int|float|None
+    :type min: int|float|ContextRef|None
     :param max: Maximal allowed value, or `None` to impose no limits.
-    :type max: int|float|None
+    :type max: int|float|ContextRef|None
     """
 
     def __init__(self, min=None, max=None):
         self.min = min
         self.max = max
 
+        # Bounds from the context
+        self.dynamic = isinstance(min, ContextRef) or isinstance(max, ContextRef)
+
         # Name
         self.name = _(u'Clamp({min}..{max})').format(
             min=_(u'') if min is None else min,
@@ -92,12 +107,16 @@ class Clamp(ValidatorBase):
         )
 
     def __call__(self, v):
+        min, max = self.min, self.max
+        if self.dynamic:
+            min, max = deref(min), deref(max)
+
         # Clamp
         try:
-            if self.min is not None and v < self.min:
-                return self.min
-            if self.max is not None and v > self.max:
-                return self.max
+            if min is not None and v < min:
+                return min
+            if max is not None and v > max:
+                return max
         except TypeError:  # cannot compare
             raise Invalid(_(u'Value should be a number'), _(u'Number'), get_type_name(type(v)))
 
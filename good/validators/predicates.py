@@ -1,8 +1,10 @@
+from collections import abc
 from gettext import gettext as _
 
 from .. import Schema, Invalid, MultipleInvalid, Required, Optional
 from .base import ValidatorBase
-from ..schema.util import get_literal_name, const, commajoin_as_strings
+from .strings import Match, is_fusable_pattern, fuse_patterns
+from ..schema.util import get_literal_name, get_type_name, const, commajoin_as_strings
 
 
 class Maybe(ValidatorBase):
@@ -83,6 +85,29 @@ class Any(ValidatorBase):
     schema(0)  #-> 'false'
     ```
 
+    Consecutive [`Match`](#match) validators are combined into a single regular expression,
+    so that a value is matched against all of them in one go. Use `branch()` to find out which one has matched:
+
+    ```python
+    routes = Any(Match(r'^/users/[0-9]+$'), Match(r'^/users/[a-z]+$'), Match(r'^/posts/'))
+    routes.branch('/users/me')  #-> (1, '/users/me')
+    ```
+
+    When all the schemas are mappings that share a required key with a literal value -- a *tag* --
+    the value of this key is used to pick the branch right away, and only this branch is tried:
+
+    ```python
+    event = Any(
+        {'type': 'click', 'x': int, 'y': int},
+        {'type': 'view', 'url': str},
+    )
+    event.dispatch  #-> ('type', {(str, 'click'): (0,), (str, 'view'): (1,)})
+    event({'type': 'view', 'url': '/'})  # only the 2nd schema is tried
+    ```
+
+    The result is the same as if the schemas were tried in order, but the other branches are not even called.
+    To get a detailed error for an unknown tag, use [`Discriminated`](#discriminated).
+
     :param schemas: List of schemas to try.
     """
 
@@ -97,17 +122,198 @@ class Any(ValidatorBase):
         # Name
         self.name = _(u'Any({})').format(_(u'|'.join(x.name for x in self.compiled)))
 
-    def __call__(self, v):
+        # Steps to try: [(index, CompiledSchema)], or [(indexes, combined-pattern)] for consecutive Match()es
+        self.steps = self._get_steps(self.compiled)
+
+        # Mappings with a shared tag: (key, { (type, tag): indexes }), or None
+        self.dispatch = self._get_dispatch(self.compiled)
+
+    @staticmethod
+    def _get_steps(compiled):
+        """ Combine consecutive Match() validators into a single pattern
+
+        Members are called as compiled schemas: their errors never leave `Any`, so there's nothing to release.
+
+        :type compiled: tuple[Schema]
+        :rtype: list[tuple]
+        """
+        steps = []
+        run = []  # [(index, pattern)] of consecutive Match()es
+
+        def flush():
+            rex = fuse_patterns([rex for i, rex in run]) if len(run) > 1 else None
+            if rex is not None:
+                steps.append((tuple(i for i, rex in run), rex))
+            else:
+                steps.extend((i, compiled[i].compiled) for i, rex in run)
+            del run[:]
+
+        for i, schema in enumerate(compiled):
+            validator = schema.compiled.schema
+            if isinstance(validator, Match) and type(validator).__call__ is Match.__call__ \
+                    and is_fusable_pattern(validator.rex):
+                # Patterns with different flags go to different runs
+                if run and run[0][1].flags != validator.rex.flags:
+                    flush()
+                run.append((i, validator.rex))
+            else:
+                flush()
+                steps.append((i, schema.compiled))
+        flush()
+        return steps
+
+    @staticmethod
+    def _get_dispatch(compiled):
+        """ Find a required key with a literal value shared by all mapping schemas
+
+        Literals match both the type and the value, so tags are looked up by (type, value).
+        Schemas with the same tag are tried in order.
+
+        :type compiled: tuple[Schema]
+        :return: (key, { (type, tag): (index, ...) }), or None when the schemas can't be dispatched
+        :rtype: tuple|None
+        """
+        # { key: tag } for every schema
+        schema_tags = []
+        for schema in compiled:
+            if schema.compiled.compiled_type != const.COMPILED_TYPE.MAPPING:
+                return None
+
+            tags, seen = {}, set()
+            for key_schema, value_schema, is_literal, is_identity in schema.compiled.compiled_keys:
+                if not is_literal:
+                    continue
+                marker = key_schema.compiled
+                if marker.key in seen:
+                    # Several markers on the same key
+                    tags.pop(marker.key, None)
+                    continue
+                seen.add(marker.key)
+                if type(marker) is Required and value_schema.compiled_type == const.COMPILED_TYPE.LITERAL:
+                    tags[marker.key] = value_schema.schema
+            schema_tags.append(tags)
+
+        # Pick the shared key that tells the most schemas apart
+        best = None
+        for key in schema_tags[0] if len(schema_tags) > 1 else ():
+            table = {}
+            try:
+                for index, tags in enumerate(schema_tags):
+                    tag = tags[key]
+                    table[type(tag), tag] = table.get((type(tag), tag), ()) + (index,)
+            except (KeyError, TypeError):
+                continue  # not shared, or not hashable
+            if len(table) > 1 and (best is None or len(table) > len(best[1])):
+                best = (key, table)
+        return best
+
+    def branch(self, v):
+        """ Validate the value, and tell which of the schemas has matched
+
+        :param v: The value to validate
+        :return: (index of the schema, sanitized value)
+        :rtype: tuple[int, *]
+        :raises Invalid: Neither of the schemas has matched
+        """
+        # Tagged mappings: only the schemas with the same tag can match
+        if self.dispatch is not None:
+            key, table = self.dispatch
+            try:
+                tag = v[key] if isinstance(v, abc.Mapping) else None
+                indexes = table[type(tag), tag]
+            except (KeyError, TypeError):
+                indexes = ()  # no tag, unknown or unhashable tag
+            for index in indexes:
+                try:
+                    return index, self.compiled[index].compiled(v)
+                except Invalid:
+                    pass
+            raise Invalid(_(u'Invalid value'))
+
         # Try schemas in order
-        for schema in self.compiled:
+        for index, schema in self.steps:
+            # Combined Match()es: group '_g<n>' has matched
+            if type(index) is tuple:
+                try:
+                    match = schema.match(v)
+                except TypeError:
+                    continue  # not a string
+                if match is not None:
+                    return index[int(match.lastgroup[2:])], v
+                continue
+
+            # Schema
             try:
-                return schema(v)
+                return index, schema(v)
             except Invalid:
                 pass
 
         # Nothing worked
         raise Invalid(_(u'Invalid value'))
 
+    def __call__(self, v):
+        return self.branch(v)[1]
+
+
+class Discriminated(ValidatorBase):
+    """ Validate a tagged union of mappings: pick the schema by the value of the `key`.
+
+    Polymorphic objects often have a field which tells their type. Instead of trying every schema
+    in turn, like [`Any`](#any) does, `Discriminated` reads this field once, and validates the mapping
+    with the schema for this value only:
+
+    ```python
+    from good import Schema, Discriminated
+
+    schema = Schema(Discriminated('type', {
+        'click': {'type': 'click', 'x': int, 'y': int},
+        'view':  {'type': 'view', 'url': str},
+    }))
+
+    schema({'type': 'view', 'url': '/'})  #-> {'type': 'view', 'url': '/'}
+    schema({'type': 'view', 'url': 1})
+    #-> Invalid: Wrong type @ [url]: expected String, got Integer number
+    schema({'type': 'scroll'})
+    #-> Invalid: Unknown variant @ [type]: expected click|view, got scroll
+    schema({})
+    #-> Invalid: Required key not provided @ [type]: expected type, got -none-
+    ```
+
+    In contrast to `Any`, errors are reported by the chosen schema, so they're as detailed as they can be.
+
+    Just like literals, the tag should match both by type and value: `1`, `1.0` and `True` are different tags.
+
+    :param key: The key of the tag
+    :param schemas: Schemas for every tag: { tag: schema }
+    :type schemas: dict
+    """
+
+    def __init__(self, key, schemas):
+        self.key = key
+        self.compiled = {tag: Schema(schema) for tag, schema in schemas.items()}
+        self.branches = {(type(tag), tag): schema for tag, schema in self.compiled.items()}
+        self.expected_tags = _(u'|').join(get_literal_name(tag) for tag in self.compiled)
+        self.name = _(u'Discriminated({key}: {tags})').format(key=get_literal_name(key), tags=self.expected_tags)
+
+    def __call__(self, v):
+        # Type check
+        if not isinstance(v, abc.Mapping):
+            raise Invalid(_(u'Wrong value type'), get_type_name(dict), get_type_name(type(v)))
+
+        # Tag
+        try:
+            tag = v[self.key]
+        except KeyError:
+            raise Invalid(_(u'Required key not provided'), get_literal_name(self.key), _(u'-none-'), [self.key])
+
+        # Branch
+        try:
+            schema = self.branches[type(tag), tag]
+        except (KeyError, TypeError):
+            raise Invalid(_(u'Unknown variant'), self.expected_tags, get_literal_name(tag), [self.key])
+
+        return schema(v)
+
 
 class All(ValidatorBase):
     """ Value must pass all validators wrapped with `All()` predicate.
@@ -356,4 +562,4 @@ class Exclusive(ValidatorBase):
 
 
 
-__all__ = ('Maybe', 'Any', 'All', 'Neither', 'Inclusive', 'Exclusive')
+__all__ = ('Maybe', 'Any', 'Discriminated', 'All', 'Neither', 'Inclusive', 'Exclusive')
@@ -1,5 +1,5 @@
 import re
-from functools import wraps
+from functools import wraps, lru_cache
 from gettext import gettext as _
 from urllib.parse import urlunsplit
 
@@ -8,6 +8,54 @@ from .. import Invalid
 from ..schema.util import get_type_name
 
 
+@lru_cache(maxsize=1024)
+def _re_compile(pattern, flags=0):
+    """ Compile a regular expression, with a cache shared by all string validators
+
+    :param pattern: RegExp pattern: a string, or a compiled pattern
+    :type pattern: str|_SRE_Pattern
+    :rtype: _SRE_Pattern
+    """
+    return re.compile(pattern, flags)
+
+
+#: Pattern features that depend on group numbers or names: backreferences and conditionals.
+#: Verbose patterns can't be combined either: their comments would swallow the parentheses
+_rex_group_refs = re.compile(r'\\\d|\(\?P=|\(\?\(')
+
+
+def is_fusable_pattern(rex):
+    """ Check whether a compiled pattern can be combined with others by `fuse_patterns()`
+
+    :type rex: _SRE_Pattern
+    :rtype: bool
+    """
+    return isinstance(rex.pattern, str) \
+           and not rex.flags & re.VERBOSE \
+           and not _rex_group_refs.search(rex.pattern)
+
+
+def fuse_patterns(rexes):
+    """ Combine multiple compiled patterns into a single alternation: `(?P<_g0>...)|(?P<_g1>...)|...`
+
+    Matching the alternation is equivalent to trying the patterns one by one with `match()`:
+    the first pattern that matches wins, and `Match.lastgroup` tells which one it was: `'_g<index>'`.
+
+    :param rexes: Compiled patterns that are fusable (see `is_fusable_pattern()`), and have the same flags
+    :type rexes: list[_SRE_Pattern]
+    :return: The combined pattern, or `None` if the patterns can't be combined
+    :rtype: _SRE_Pattern|None
+    """
+    flags = rexes[0].flags
+    assert all(rex.flags == flags and is_fusable_pattern(rex) for rex in rexes)
+
+    try:
+        return _re_compile(u'|'.join(u'(?P<_g{}>{})'.format(i, rex.pattern) for i, rex in enumerate(rexes)), flags)
+    except re.error:
+        # e.g. duplicate group names, or global flags within the pattern
+        return None
+
+
 def stringmethod(func):
     """ Validator factory which call a single method on the string. """
     method_name = func()
@@ -84,7 +132,7 @@ class Match(ValidatorBase):
     """
 
     def __init__(self, pattern, message=None, expected=None):
-        self.rex = re.compile(pattern)  # accepts compiled patterns as well
+        self.rex = _re_compile(pattern)  # accepts compiled patterns as well
         self.name = expected or _(u'(special format)')
         self.message = message or _(u'Wrong format')
 
@@ -167,11 +215,18 @@ class Url(ValidatorBase):
     schema('http://example.com')  #-> 'http://example.com'
     ```
 
+    URLs that are already in the canonical form (with an allowed protocol, and a path) are returned as is.
+
     :param protocols: List of allowed protocols.
 
         If no protocol is provided by the user -- the first protocol is used by default.
 
     :type protocols: str|list[str]
+    :param normalize: Normalize the URL: add the default protocol and the path.
+
+        With `normalize=False`, the URL is only validated, and the input is returned as is.
+
+    :type normalize: bool
     """
 
     _url_rex = r'^' \
@@ -184,13 +239,14 @@ class Url(ValidatorBase):
 
     name = u'URL'
 
-    def __init__(self, protocols=('http', 'https')):
+    def __init__(self, protocols=('http', 'https'), normalize=True):
         self.protocols = tuple(x.lower()
                                for x in ((protocols,)
                                          if isinstance(protocols, str) else
                                          tuple(protocols)))
+        self.normalize = normalize
 
-        self.rex = re.compile(self._url_rex)
+        self.rex = _re_compile(self._url_rex)
 
     def __call__(self, v):
         # Match
@@ -203,6 +259,14 @@ class Url(ValidatorBase):
         if not match:
             raise Invalid(_(u'Wrong URL format'))
 
+        # Fast path: the URL is valid, and normalization would not change anything
+        scheme = match.group('scheme')
+        if scheme is not None \
+                and scheme.lower() in self.protocols \
+                and '.' in match.group('host') \
+                and (not self.normalize or match.start('path') != -1 and v.startswith('://', len(scheme))):
+            return v
+
         try:
             # Prepare
             parts = match.groupdict()
@@ -215,6 +279,10 @@ class Url(ValidatorBase):
             if '.' not in parts['host']:
                 raise Invalid(u'Incorrect domain name')
 
+            # Validate only
+            if not self.normalize:
+                return v
+
             # Combine back again
             return urlunsplit((
                 parts['scheme'],
@@ -1,8 +1,8 @@
 from gettext import gettext as _
 
 from .base import ValidatorBase
-from .. import Invalid
-from ..schema.util import get_primitive_name, get_type_name
+from .. import Schema, Invalid, MultipleInvalid
+from ..schema.util import get_primitive_name, get_type_name, get_literal_name, const
 
 
 class Type(ValidatorBase):
@@ -70,4 +70,98 @@ class Coerce(ValidatorBase):
         except (TypeError, ValueError):
             raise Invalid(_(u'Invalid value'))
 
-__all__ = ('Type', 'Coerce',)
+
+
+class Tuple(ValidatorBase):
+    """ Validate a fixed-shape sequence: every item with the schema at its position.
+
+    Iterable schemas, like `[int, str]`, treat every item as "any of these", and can't tell a record
+    like `(timestamp, lat, lon)` from a list of numbers. `Tuple` validates item #i with schema #i,
+    and checks the length:
+
+    ```python
+    from good import Schema, Tuple, Range
+
+    schema = Schema(Tuple(int, Range(-90, 90), Range(-180, 180)))
+
+    schema([1577836800, 55.75, 37.62])  #-> [1577836800, 55.75, 37.62]
+    schema([1577836800, 95.0, 37.62])
+    #-> Invalid: Value must be at most 90 @ [1]: expected 90, got 95.0
+    schema([1577836800, 55.75])
+    #-> Invalid: Wrong number of items: expected 3, got 2
+    ```
+
+    Additional items can be allowed with a schema for the tail:
+
+    ```python
+    schema = Schema(Tuple(str, rest=float))
+
+    schema(('temperature', 20.5, 21.0, 19.5))  #-> ('temperature', 20.5, 21.0, 19.5)
+    ```
+
+    Both lists and tuples are accepted, and the sanitized value has the same type.
+
+    :param schemas: Schemas for the items, by position
+    :param rest: Schema for the additional items, or `None` to allow no additional items
+    """
+
+    def __init__(self, *schemas, rest=None):
+        # Compiled schemas are called directly: errors are released by the outer `Schema`
+        self.compiled = tuple(Schema(schema).compiled for schema in schemas)
+        self.rest = Schema(rest).compiled if rest is not None else None
+
+        # Schemas with a type check inline: (schema, type|None)
+        self.positions = tuple((schema, self._get_type(schema)) for schema in self.compiled)
+        self.rest_type = self._get_type(self.rest) if self.rest is not None else None
+
+        # Name
+        self.name = _(u'Tuple({})').format(_(u',').join(
+            [x.name for x in self.compiled] +
+            ([_(u'{}...').format(self.rest.name)] if self.rest is not None else [])
+        ))
+        self.expected_length = get_literal_name(len(self.compiled)) if self.rest is None else \
+            _(u'{} or more').format(len(self.compiled))
+
+    @staticmethod
+    def _get_type(compiled):
+        """ Get the type of a type schema, which never changes the value, or `None`
+
+        :type compiled: CompiledSchema
+        """
+        return compiled.schema if compiled.compiled_type == const.COMPILED_TYPE.TYPE else None
+
+    def __call__(self, v):
+        # Type check
+        if not isinstance(v, (list, tuple)):
+            raise Invalid(_(u'Wrong value type'), get_type_name(tuple), get_type_name(type(v)))
+
+        # Length
+        n = len(self.compiled)
+        if len(v) < n if self.rest is not None else len(v) != n:
+            raise Invalid(_(u'Wrong number of items'), self.expected_length, get_literal_name(len(v)))
+
+        # Items
+        errors = []
+        values = None  # copied once a value changes
+        for index, value in enumerate(v):
+            schema, schema_type = self.positions[index] if index < n else (self.rest, self.rest_type)
+            if schema_type is not None and type(value) is schema_type:
+                continue
+            try:
+                sanitized = schema(value)
+            except Invalid as e:
+                errors.append(e.enrich(path=[index]))
+                continue
+            if values is None and sanitized is not value:
+                values = list(v)
+            if values is not None:
+                values[index] = sanitized
+
+        if errors:
+            raise MultipleInvalid.if_multiple(errors)
+        if values is None:
+            return v
+        return tuple(values) if isinstance(v, tuple) else values
+
+
+__all__ = ('Type', 'Coerce', 'Tuple',)
@@ -4,12 +4,13 @@ from gettext import gettext as _
 from .base import ValidatorBase
 from .. import Invalid
 from ..schema.util import get_literal_name, get_type_name, get_primitive_name, const
+from ..schema.context import ContextRef, deref
 
 # Try to load Enum type (if supported)
 try:
-    from enum import EnumMeta as _EnumMeta
+    from enum import Enum as _Enum, EnumMeta as _EnumMeta
 except ImportError:
-    _EnumMeta = None
+    _Enum = _EnumMeta = None
 
  
 class In(ValidatorBase):
@@ -92,23 +93,28 @@ class Length(ValidatorBase):
     #-> Invalid: Too long (3 is the most): expected Length(..3), got 4
     ```
 
+    The bounds can be read from the validation context: see [`ContextRef`](#contextref).
+
     :param min: Minimal allowed length, or `None` to impose no limits.
-    :type min: int|None
+    :type min: int|ContextRef|None
     :param max: Maximal allowed length, or `None` to impose no limits.
-    :type max: int|None
+    :type max: int|ContextRef|None
     """
 
     def __init__(self, min=None, max=None):
         # `min` validator
-        self.min_error = lambda length: Invalid(_(u'Too short ({min} is the least)').format(min=min),
-                                                get_literal_name(min), get_literal_name(length))
+        self.min_error = lambda min, length: Invalid(_(u'Too short ({min} is the least)').format(min=min),
+                                                     get_literal_name(min), get_literal_name(length))
         self.min = min
 
         # `max` validator
-        self.max_error = lambda length: Invalid(_(u'Too long ({max} is the most)').format(max=max),
-                                                get_literal_name(max), get_literal_name(length))
+        self.max_error = lambda max, length: Invalid(_(u'Too long ({max} is the most)').format(max=max),
+                                                     get_literal_name(max), get_literal_name(length))
         self.max = max
 
+        # Bounds from the context
+        self.dynamic = isinstance(min, ContextRef) or isinstance(max, ContextRef)
+
         # Name
         self.name = _(u'Length({min}..{max})').format(
             min=_(u'') if min is None else min,
@@ -120,12 +126,15 @@ class Length(ValidatorBase):
             raise Invalid(_(u'Input is not a collection'), u'Collection', get_type_name(type(v)))
 
         length = len(v)
+        min, max = self.min, self.max
+        if self.dynamic:
+            min, max = deref(min), deref(max)
 
         # Validate
-        if self.min is not None and length < self.min:
-            raise self.min_error(length)
-        if self.max is not None and length > self.max:
-            raise self.max_error(length)
+        if min is not None and length < min:
+            raise self.min_error(min, length)
+        if max is not None and length > max:
+            raise self.max_error(max, length)
 
         # Ok
         return v
@@ -301,6 +310,9 @@ class Map(ValidatorBase):
     * When `mode=Map.VAL`, does only reverse matching (by value)
     * When `mode=Map.BOTH`, does bidirectional matching (by key first, then by value)
 
+    All lookups are precomputed into a single dict, so that both hits and misses are cheap.
+    The only exception is an Enum that overrides `_missing_()`: its values are looked up by calling the Enum.
+
     Another neat feature is that `Map` supports `in` containment checks,
     which works great together with [`In`](#in): `In(Map(enum-value))` will test if a value is convertible, but won't
     actually do the convertion.
@@ -367,7 +379,53 @@ class Map(ValidatorBase):
                 self.mapping_rev = {v: k for k, v in self.mapping.items()}
                 self.rlookup = lambda v: self.mapping_rev[v]
 
+        #: Precomputed lookup table: {input: output}, or `None` when the lookups can't be precomputed
+        self.table = self._get_table()
+
+    def _get_table(self):
+        """ Precompute the lookup table for the current mode
+
+        :rtype: dict|None
+        """
+        if self.enum is not None:
+            # Enum: name -> member, value -> member
+            if self.mode & self.VAL and getattr(self.enum._missing_, '__func__', None) is not _Enum._missing_.__func__:
+                return None  # custom lookup by value
+            forward = dict(self.enum.__members__)
+            try:
+                reverse = {member.value: member for member in self.enum}
+            except TypeError:
+                return None  # unhashable values
+        elif type(self.mapping) is dict:
+            # Mapping: key -> value, value -> key
+            forward = self.mapping
+            reverse = self.mapping_rev
+        else:
+            return None  # custom mapping
+
+        # Combine: lookup by key goes first
+        table = {}
+        if self.mode & self.VAL:
+            table.update(reverse)
+        if self.mode & self.KEY:
+            table.update(forward)
+        return table
+
     def __getitem__(self, v):
+        # Enum members pass through
+        if self.enum is not None and isinstance(v, self.enum):
+            return v
+
+        # Precomputed lookup
+        if self.table is not None:
+            try:
+                value = self.table.get(v, const.UNDEFINED)
+            except TypeError:  # unhashable
+                value = const.UNDEFINED
+            if value is const.UNDEFINED:
+                raise KeyError(v)
+            return value
+
         # Try both forward and reverse lookups
         for lookup in (self.lookup, self.rlookup):
             # If enabled
@@ -1,4 +1,4 @@
-import good, good.schema.errors, good.voluptuous
+import good, good.schema.errors, good.voluptuous, good.json, good.cache, good.metrics, good.bulk
 from exdoc import doc, getmembers
 
 import json
@@ -20,9 +20,14 @@ data = {
     'voluptuous': doc(good.voluptuous),
 
     'Schema': doccls(good.Schema, None, '__call__'),
+    'Limits': doccls(good.Limits),
+    'Record': doccls(good.Record),
+    'ContextRef': doccls(good.ContextRef),
+    'get_context': doc(good.get_context),
     'errors': doc(good.schema.errors),
     'Invalid': doccls(good.Invalid),
     'MultipleInvalid': doccls(good.MultipleInvalid),
+    'ValidationTimeout': doccls(good.ValidationTimeout),
     'markers': docmodule(good.markers),
 
     'helpers': docmodule(good.helpers),
@@ -35,6 +40,11 @@ data = {
     'strings': docmodule(good.validators.strings),
     'dates': docmodule(good.validators.dates),
     'files': docmodule(good.validators.files),
+
+    'json': docmodule(good.json),
+    'cache': docmodule(good.cache),
+    'metrics': docmodule(good.metrics),
+    'bulk': docmodule(good.bulk),
 }
 
 # Patches
@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+
+""" Throughput of `good.bulk.validate_file()` with a growing number of worker processes.
+
+A JSON Lines file is written to a temporary directory, and validated with 1, 2, 4, ... processes,
+up to the number of CPUs.
+
+Usage: ./bulk.py [lines]
+"""
+
+import os
+import sys
+import json
+import tempfile
+from time import perf_counter
+
+import good.bulk
+from good import Optional, Length, Range, Coerce
+
+
+#: The schema: workers import it by reference
+ROW = {
+    'id': Coerce(int),
+    'name': Length(min=1, max=50),
+    'email': str,
+    Optional('age'): Range(0, 150),
+    'tags': [str],
+    'score': float,
+}
+
+
+def write_file(path, n):
+    """ Write `n` lines, every 1000th one is invalid """
+    with open(path, 'w') as f:
+        for i in range(n):
+            f.write(json.dumps({
+                'id': str(i),
+                'name': 'user{}'.format(i),
+                'email': 'user{}@example.com'.format(i),
+                'age': i % 100 if i % 1000 else 200,
+                'tags': ['a', 'b'],
+                'score': i / 3,
+            }))
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rows.jsonl')
+        write_file(path, n_lines)
+        print('# {} lines, {:.1f} MB, {} CPUs'.format(n_lines, os.path.getsize(path) / 1e6, cpus))
+
+        print('# processes\tseconds\tlines/sec\tspeedup')
+        processes, base = 1, None
+        while True:
+            t = perf_counter()
+            report = good.bulk.validate_file(path, '__main__:ROW', processes=processes)
+            seconds = perf_counter() - t
+            assert report.lines == n_lines and report.invalid == (n_lines + 999) // 1000
+            base = base or seconds
+            print('{}\t{:.2f}\t{:.0f}\t{:.2f}'.format(processes, seconds, n_lines / seconds, base / seconds))
+
+            if processes >= cpus:
+                break
+            processes = min(processes * 2, cpus)
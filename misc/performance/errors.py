@@ -0,0 +1,76 @@
+#! /usr/bin/env python
+
+""" Memory retained by validation errors that are kept around, e.g. in a batch report.
+
+Every mode validates invalid documents, each with a schema of its own, keeps the errors,
+and drops both the documents and the schemas.
+
+* `traceback`: errors as they're raised inside the schema, with tracebacks (the behavior before `Invalid.release()`)
+* `Schema()`: errors raised by the `Schema`: no tracebacks
+* `keep_validator=False`: no tracebacks, validator names instead of validators
+
+Usage: ./errors.py [documents]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from good import Schema, Invalid, Coerce, Length
+
+
+def definition():
+    return {
+        'id': Coerce(int),
+        'name': Length(max=10),
+        'items': [{'sku': str, 'qty': int}],
+    }
+
+
+def generate_documents(n):
+    """ Generate `n` documents with 3 errors each, and a big payload """
+    for i in range(n):
+        yield {
+            'id': 'x{}'.format(i),
+            'name': 'a' * 20,
+            'items': [{'sku': 'sku{}'.format(j), 'qty': j} for j in range(50)] + [{'sku': 1, 'qty': 1}],
+        }
+
+
+def measure(make_validator, n):
+    """ Validate the documents, keep the errors
+
+    :return: (errors, bytes per error)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    errors = []
+    for doc in generate_documents(n):
+        validate = make_validator()
+        try:
+            validate(doc)
+        except Invalid as e:
+            errors.append(e)
+    del validate, doc
+    gc.collect()
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    n_errors = sum(len(list(e)) for e in errors)
+    return n_errors, (after - before) / n_errors
+
+
+if __name__ == '__main__':
+    n_documents = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print('# mode\terrors\tbytes/error')
+    for name, make_validator in (
+            ('traceback', lambda: Schema(definition()).compiled),
+            ('Schema()', lambda: Schema(definition())),
+            ('keep_validator=False', lambda: Schema(definition(), keep_validator=False)),
+    ):
+        n_errors, size = measure(make_validator, n_documents)
+        print('{}\t{}\t{:.0f}'.format(name, n_errors, size))
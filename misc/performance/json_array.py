@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+
+""" Validate a big JSON array: `good.json.loads()` of the whole document vs `good.json.iter_array()` item by item.
+
+Reports the time, and the peak memory traced while validating. The file is written to a temporary directory first.
+
+Usage: ./json_array.py [items]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import good.json
+from good import Schema, Extra, Remove
+
+
+schema = Schema({
+    'id': int,
+    'name': str,
+    'tags': [str],
+    'score': float,
+    Extra: Remove,
+})
+
+
+def write_document(path, n):
+    """ Write an array of `n` items """
+    with open(path, 'w') as f:
+        f.write('[')
+        for i in range(n):
+            if i:
+                f.write(',\n')
+            json.dump({'id': i, 'name': 'item{}'.format(i), 'tags': ['a', 'b', 'c'], 'score': i / 3, 'junk': 'x' * 50}, f)
+        f.write(']')
+
+
+def validate_loads(path):
+    with open(path, 'rb') as f:
+        return len(good.json.loads(f.read(), [schema]))
+
+
+def validate_iter_array(path):
+    with open(path, 'rb') as f:
+        return sum(1 for item in good.json.iter_array(f, schema))
+
+
+if __name__ == '__main__':
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'array.json')
+        write_document(path, n_items)
+        print('# {} items, {:.1f} MB'.format(n_items, os.path.getsize(path) / 1e6))
+
+        print('# mode\tseconds\tpeak MB')
+        for name, validate in (('loads', validate_loads), ('iter_array', validate_iter_array)):
+            # Time: without tracing, which slows allocations down
+            t = perf_counter()
+            assert validate(path) == n_items
+            seconds = perf_counter() - t
+
+            tracemalloc.start()
+            validate(path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('{}\t{:.2f}\t{:.1f}'.format(name, seconds, peak / 1e6))
@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+
+""" Measure the overhead of metrics collection.
+
+Usage: ./metrics.py [samples]
+
+Validates the same samples without a sink, with `InMemorySink`, and with `PrometheusSink`,
+and reports the time per call.
+"""
+
+import sys
+from copy import deepcopy
+from time import perf_counter
+
+import good.metrics
+from good import Schema, Invalid, Optional, Extra, Remove, Default, Coerce, Length, Range, Msg, Any
+
+
+schema = Schema({
+    'id': Coerce(int),
+    'name': Length(min=1, max=50),
+    Optional('age'): Msg(Range(0, 150), u'Wrong age'),
+    Optional('tags'): [Any(str, Coerce(str))],
+    'role': Any('user', 'admin', Default('user')),
+    Extra: Remove,
+})
+
+
+def generate_samples(n):
+    """ Generate `n` inputs: both valid and invalid """
+    for i in range(n):
+        yield {
+            'id': str(i),
+            'name': 'user{}'.format(i) if i % 7 else '',
+            'age': i % 200,
+            'tags': ['a', i, 'b'],
+            'junk': i,
+        }
+
+
+def run(samples):
+    """ Validate the samples: the best of several rounds
+
+    :return: Seconds per call
+    """
+    best = None
+    for _ in range(5):
+        inputs = deepcopy(samples)
+        t = perf_counter()
+        for v in inputs:
+            try:
+                schema(v)
+            except Invalid:
+                pass
+        elapsed = perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(samples)
+
+
+if __name__ == '__main__':
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    samples = list(generate_samples(n_samples))
+
+    print('# sink\tusec/call\toverhead')
+    base = None
+    for name, sink in (('none', None),
+                       ('InMemorySink', good.metrics.InMemorySink()),
+                       ('PrometheusSink', good.metrics.PrometheusSink())):
+        if sink is not None:
+            good.metrics.install(sink)
+        seconds = run(samples)
+        good.metrics.uninstall()
+
+        base = base or seconds
+        print('{}\t{:.2f}\t{:+.1f}%'.format(name, seconds * 1e6, (seconds / base - 1) * 100))
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+
+""" Startup of forked workers with many schemas: compiled in every worker, or precompiled before forking.
+
+A registry of `n` schemas, each a mapping of 10 fields with nested lists & mappings.
+
+* `precompile()`: the time the master spends compiling all schemas, once
+* `cold worker`: a worker forked before compilation: it compiles every schema on first use
+* `warm worker`: a worker forked after `precompile()`: the schemas are ready
+
+Worker times are measured from the fork until every schema is available.
+
+Usage: ./registry.py [schemas] [workers]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+from good import Schema, Optional, Coerce, Length, Range, Any, Extra, Remove
+from good.registry import SchemaRegistry
+
+
+def definition(i):
+    return {
+        'id': Coerce(int),
+        'name': Length(max=100),
+        'kind': Any('a', 'b', 'c'),
+        Optional('score'): Range(0, 100),
+        'tags': [str],
+        'owner': {'id': int, 'email': str, Optional('name'): str},
+        'items': [{'sku': str, 'qty': Range(1, 1000), Optional('price'): float}],
+        Optional('notes'): Any(None, str),
+        Optional('field{}'.format(i)): int,
+        Extra: Remove,
+    }
+
+
+def make_registry(n):
+    schemas = SchemaRegistry()
+    for i in range(n):
+        schemas.register('schema{}'.format(i), definition(i))
+    return schemas
+
+
+def worker_startup(schemas, workers):
+    """ Fork workers that get every schema, and measure how long it takes them
+
+    :return: Average seconds per worker
+    :rtype: float
+    """
+    total = 0.0
+    for i in range(workers):
+        r, w = os.pipe()
+        started = perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            # Worker
+            os.close(r)
+            for name in schemas:
+                schemas[name]
+            os.write(w, repr(perf_counter() - started).encode())
+            os._exit(0)
+
+        os.close(w)
+        with os.fdopen(r) as f:
+            total += float(f.read())
+        os.waitpid(pid, 0)
+    return total / workers
+
+
+if __name__ == '__main__':
+    n_schemas = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    schemas = make_registry(n_schemas)
+    cold = worker_startup(schemas, n_workers)
+
+    times = schemas.precompile()
+    warm = worker_startup(schemas, n_workers)
+
+    print('# {} schemas, {} workers'.format(n_schemas, n_workers))
+    print('precompile()\t{:.1f} ms\t(slowest schema: {:.2f} ms)'.format(
+        sum(times.values()) * 1000, max(times.values()) * 1000))
+    print('cold worker\t{:.1f} ms'.format(cold * 1000))
+    print('warm worker\t{:.1f} ms'.format(warm * 1000))
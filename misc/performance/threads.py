@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+
+""" Validate from multiple threads, and report the scaling.
+
+Usage: ./threads.py [max-threads] [samples]
+
+Every thread validates `samples` inputs with a shared Schema, and the results are compared
+against the results of sequential validation. With the GIL, the throughput stays flat;
+with free-threaded Python, it should grow with the number of threads.
+"""
+
+import sys
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+from good import Schema, Invalid, Optional, Extra, Remove, Default, Coerce, Length, Range, Msg, Any
+
+
+schema = Schema({
+    'id': Coerce(int),
+    'name': Length(min=1, max=50),
+    Optional('age'): Msg(Range(0, 150), u'Wrong age'),
+    Optional('tags'): [Any(str, Coerce(str))],
+    'role': Any('user', 'admin', Default('user')),
+    'address': {
+        'city': str,
+        'zip': Default(None),
+    },
+    Extra: Remove,
+})
+
+
+def generate_samples(n):
+    """ Generate `n` inputs: both valid and invalid """
+    for i in range(n):
+        yield {
+            'id': str(i),
+            'name': 'user{}'.format(i) if i % 7 else '',
+            'age': i % 200,
+            'tags': ['a', i, 'b'],
+            'address': {'city': 'City'} if i % 5 else {'city': i},
+            'junk': i,
+        }
+
+
+def validate(value):
+    """ Validate a value, return the result or the errors """
+    try:
+        return schema(value)
+    except Invalid as e:
+        return sorted(str(err) for err in e)
+
+
+def run(threads, samples):
+    """ Validate the samples in every thread
+
+    :return: (time, results of every thread)
+    """
+    def worker(_):
+        return [validate(v) for v in samples]
+
+    with ThreadPoolExecutor(threads) as pool:
+        t = perf_counter()
+        results = list(pool.map(worker, range(threads)))
+        return perf_counter() - t, results
+
+
+if __name__ == '__main__':
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    samples = list(generate_samples(n_samples))
+    expected = [validate(v) for v in samples]
+    gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+
+    print('# GIL: {}'.format('enabled' if gil else 'disabled'))
+    print('# threads\tvalidations/sec\tscaling')
+    base = None
+    threads = 1
+    while threads <= max_threads:
+        elapsed, results = run(threads, samples)
+        assert all(r == expected for r in results), 'Concurrent results differ from sequential ones!'
+
+        vps = threads * n_samples / elapsed
+        base = base or vps
+        print('{}\t{:.0f}\t{:.2f}x'.format(threads, vps, vps / base))
+        threads *= 2
@@ -1,14 +1,29 @@
 from __future__ import print_function
+import os
 import unittest
+import tempfile
+import threading
 import collections
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, time, timedelta, timezone
 import json
+import pickle
 from random import shuffle
-from copy import deepcopy
+from copy import copy, deepcopy
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 import enum
+try:
+    import dataclasses
+except ImportError:  # Python < 3.7
+    dataclasses = None
 import pytz
 
 from good import *
+import good.json
+import good.metrics
+import good.bulk
+from good.registry import SchemaRegistry, resolve_ref
+from good.cache import CachedSchema
 from good.schema.markers import Marker
 from good.schema.util import get_type_name, Undefined, const
 from good.validators.dates import FixedOffset
@@ -717,6 +732,395 @@ class SchemaCoreTest(GoodTestBase):
         for s in shifted_lists(schema_list):
             Schema(collections.OrderedDict(s))(data)
 
+    def test_limits(self):
+        """ Test Schema(limits=) """
+        limits = Limits(max_items=2, max_keys=3, max_depth=2, max_str_len=5)
+        schema = Schema({
+            'name': str,
+            'tags': [str],
+            Optional('sub'): {'a': {'b': int}},
+        }, limits=limits)
+
+        self.assertValid(schema, {'name': u'abc', 'tags': [u'a', u'b']})
+
+        self.assertInvalid(schema, {'name': u'abcdef', 'tags': [u'a', u'b', u'c']}, MultipleInvalid([
+            Invalid(u'Too long (5 is the most)', u'5', u'6', ['name'], str),
+            Invalid(u'Too many items (2 is the most)', u'2', u'3', ['tags'], [str]),
+        ]))
+        self.assertInvalid(schema, {'name': u'a', 'tags': [], 'x': 1, 'y': 2},
+                           Invalid(u'Too many keys (3 is the most)', u'3', u'4', [], schema.compiled.schema))
+        self.assertInvalid(schema, {'name': u'a', 'tags': [], 'longkey': 1},
+                           Invalid(u'Key too long (5 is the most)', u'5', u'7', ['longkey'], schema.compiled.schema))
+        self.assertInvalid(schema, {'name': u'a', 'tags': [], 'sub': {'a': {'b': 1}}},
+                           Invalid(u'Too deeply nested (2 is the most)', u'2', u'3', ['sub', 'a'], {'b': int}))
+
+    def test_thread_safety(self):
+        """ Test that compiled schemas share no state """
+        # A marker instance can be used in multiple schemas
+        key = Required('a')
+        s1 = Schema({key: int})
+        s2 = Schema({key: Default(0)})
+        self.assertValid(s2, {}, {'a': 0})
+        self.assertInvalid(s1, {}, Invalid(u'Required key not provided', u'a', u'-none-', ['a'], key))
+        self.assertIsNone(key.value_schema)
+
+        # Concurrent validation gives the same results as sequential
+        schema = Schema({
+            'id': Coerce(int),
+            'tags': [Msg(str, u'Need a string')],
+            'role': Any('user', 'admin', Default('user')),
+            Extra: Remove,
+        })
+
+        def validate(v):
+            try:
+                return schema(v)
+            except Invalid as e:
+                return sorted(str(err) for err in e)
+
+        samples = [{'id': str(i), 'tags': ['a', i] if i % 3 else ['a'], 'junk': i} for i in range(200)]
+        expected = [validate(v) for v in samples]
+        with ThreadPoolExecutor(8) as pool:
+            for _ in range(5):
+                self.assertEqual(list(pool.map(validate, samples)), expected)
+
+    def test_on_error(self):
+        """ Test Schema(on_error=) """
+        schema_def = [{
+            'id': int,
+            'sub': {'x': [int]},
+            Optional('m'): Msg(int, u'Need a number'),
+        }]
+        value = [{'id': 1, 'sub': {'x': [1, 'a']}}, {'id': 'a', 'sub': {'x': []}, 'm': 'q'}, {}, 5]
+
+        # Same errors as collected by MultipleInvalid, in the same order
+        try:
+            Schema(schema_def)(deepcopy(value))
+        except MultipleInvalid as e:
+            expected = e.errors
+
+        reported = []
+        schema = Schema(schema_def, on_error=reported.append)
+        self.assertInvalid(schema, deepcopy(value),
+                           Invalid(u'Validation failed', schema.name, u'6 errors', [], schema_def, errors=6))
+        self.assertEqual([str(e) for e in reported], [str(e) for e in expected])
+        self.assertEqual([e.path for e in reported], [[0, 'sub', 'x', 1], [1, 'id'], [1, 'm'], [2, 'id'], [2, 'sub'], [3]])
+
+        # Valid input
+        del reported[:]
+        self.assertValid(schema, [{'id': 1, 'sub': {'x': [1]}}])
+        self.assertEqual(reported, [])
+
+        # Top-level error
+        del reported[:]
+        schema = Schema(int, on_error=reported.append)
+        self.assertInvalid(schema, 'a', Invalid(u'Validation failed', u'Integer number', u'1 errors', [], int, errors=1))
+        self.assertEqual([str(e) for e in reported], [u'Wrong type: expected Integer number, got String'])
+
+    def test_validate_patch(self):
+        """ Test Schema.validate_patch() """
+        schema = Schema({
+            'name': str,
+            'tags': [{'name': str, Optional('score'): int}],
+            Optional('email'): str,
+            Optional('phone'): str,
+            Remove('junk'): object,
+            Entire: Exclusive('email', 'phone'),
+        })
+        doc = schema({'name': u'Mark', 'tags': [{'name': u'a'}, {'name': u'b', 'score': 1}], 'email': u'a@b.c'})
+        original = deepcopy(doc)
+
+        # Keys, nested keys, list items; a plain key is a path
+        patched = schema.validate_patch(doc, {'name': u'Alex', ('tags', 0, 'score'): 5, ('tags', 1): {'name': u'c'}})
+        self.assertEqual(patched, {'name': u'Alex', 'tags': [{'name': u'a', 'score': 5}, {'name': u'c'}], 'email': u'a@b.c'})
+        self.assertEqual(doc, original)  # not modified
+        self.assertIs(schema.validate_patch(doc, {'name': u'Alex'})['tags'], doc['tags'])  # unchanged values are shared
+
+        # Errors: same as the full validation, `Entire` markers included
+        try:
+            schema.validate_patch(doc, {'phone': 1, ('tags', 1, 'score'): u'x'})
+            self.fail('No error')
+        except MultipleInvalid as e:
+            self.assertEqual(sorted(str(err) for err in e), sorted([
+                u'Wrong type @ [\'phone\']: expected String, got Integer number',
+                u'Wrong type @ [\'tags\'][1][\'score\']: expected Integer number, got String',
+                u'Choose one of the options, not multiple: expected Exclusive(email,phone), got email,phone',
+            ]))
+
+        # Keys that can't be patched: the mapping is validated entirely
+        self.assertEqual(schema.validate_patch(doc, {'junk': 1}), original)
+
+        # Missing paths
+        self.assertRaises(LookupError, schema.validate_patch, doc, {('nope', 'x'): 1})
+        self.assertRaises(LookupError, schema.validate_patch, doc, {('tags', 5, 'score'): 1})
+
+        # Records
+        schema = Schema({'id': int, Optional('age'): int}, output=Record)
+        self.assertEqual(schema.validate_patch(schema({'id': 1}), {'age': 18}), schema({'id': 1, 'age': 18}))
+
+    def test_context(self):
+        """ Test Schema(context=) """
+
+        def Feature(v):
+            if v not in get_context()['features']:
+                raise Invalid(u'Feature not enabled')
+            return v
+
+        schema = Schema({
+            'name': Length(max=ContextRef('max_len', default=3)),
+            'age': Range(ContextRef('min_age'), 150),
+            Optional('score'): Clamp(max=ContextRef('max_score')),
+            Optional('features'): [Schema(Feature)],  # a separate schema: uses the context of the outer call
+        })
+        self.assertEqual(Length(max=ContextRef('max_len')).name, u'Length(..<max_len>)')
+
+        context = {'max_len': 5, 'min_age': 18, 'max_score': 10, 'features': {'beta'}}
+        self.assertEqual(schema({'name': u'abcde', 'age': 18, 'score': 20, 'features': [u'beta']}, context=context),
+                         {'name': u'abcde', 'age': 18, 'score': 10, 'features': [u'beta']})
+        self.assertIsNone(get_context())
+
+        try:
+            schema({'name': u'abcdef', 'age': 17, 'features': [u'beta', u'gamma']}, context=context)
+            self.fail('No error')
+        except MultipleInvalid as e:
+            self.assertEqual(sorted(str(err) for err in e), [
+                u"Feature not enabled @ ['features'][1]: expected Feature(), got gamma",
+                u"Too long (5 is the most) @ ['name']: expected 5, got 6",
+                u"Value must be at least 18 @ ['age']: expected 18, got 17",
+            ])
+
+        # Defaults
+        length = Length(max=ContextRef('max_len', default=3))
+        self.assertInvalid(Schema(length), u'abcd', Invalid(u'Too long (3 is the most)', u'3', u'4', [], length))
+        self.assertEqual(Schema(Length(max=ContextRef('max_len', default=3)))(u'abcd', context={'max_len': 4}), u'abcd')
+
+        # Missing values
+        self.assertRaises(LookupError, Schema(Range(ContextRef('min'))), 1)
+        self.assertRaises(LookupError, Schema(Range(ContextRef('min'))), 1, context={})
+
+    def test_release_errors(self):
+        """ Test that errors leaving the Schema release the tracebacks, and optionally the validators """
+        definition = {'id': Coerce(int), 'tags': [str]}
+        doc = {'id': u'x', 'tags': [1]}
+
+        def raised(schema, value):
+            try:
+                schema(value)
+            except Invalid as e:
+                return e
+            self.fail('No error')
+
+        # Tracebacks & chained exceptions are dropped: the frames it goes through don't keep the input
+        e = raised(Schema(definition), dict(doc))
+        for err in (e,) + tuple(e):
+            self.assertIsNone(err.__context__)
+            self.assertIsNone(err.__cause__)
+        tb = e.__traceback__
+        self.assertEqual(tb.tb_next.tb_frame.f_code.co_name, '__call__')  # Schema.__call__()
+        self.assertIsNone(tb.tb_next.tb_next)
+        self.assertNotIn('value', tb.tb_next.tb_frame.f_locals)
+        self.assertEqual([type(err.validator) for err in e], [Coerce, type])
+
+        # Only the names of validators
+        e = raised(Schema(definition, keep_validator=False), dict(doc))
+        self.assertEqual([err.validator for err in e], [u'*Integer number', u'String'])
+        self.assertEqual(pickle.loads(pickle.dumps(e)).errors[0].validator, u'*Integer number')
+
+        # Nested schemas: released once, by the outermost call, unless they drop the validators themselves
+        e = raised(Schema({'tags': Schema([str])}), {'tags': [1]})
+        self.assertIsNone(e.__traceback__.tb_next.tb_next)
+        self.assertEqual(e.validator, str)
+        e = raised(Schema({'tags': Schema([str], keep_validator=False)}), {'tags': [1]})
+        self.assertEqual(e.validator, u'String')
+
+        # Error sink
+        errors = []
+        raised(Schema(definition, on_error=errors.append, keep_validator=False), dict(doc))
+        self.assertEqual(sorted(err.validator for err in errors), [u'*Integer number', u'String'])
+        self.assertEqual([err.__traceback__ for err in errors], [None, None])
+
+    def test_deadline(self):
+        """ Test `deadline` & `timeout`: the time budget of validation """
+        def slow(v):
+            threading.Event().wait(0.02)
+            return v
+
+        def raised(schema, value, **kwargs):
+            try:
+                schema(value, **kwargs)
+            except ValidationTimeout as e:
+                return e
+            self.fail('No timeout')
+
+        # Enough time
+        schema = Schema({'items': [slow]})
+        self.assertEqual(schema({'items': [1, 2]}, timeout=1.0), {'items': [1, 2]})
+
+        # Out of time: containers check the deadline once per `deadline_check_interval` values
+        e = raised(schema, {'items': list(range(100))}, timeout=0.01)
+        self.assertIsInstance(e, Invalid)
+        self.assertEqual(e.message, u'Validation timed out')
+        self.assertEqual(e.path, ['items', 32])
+        self.assertEqual(e.expected, u'0.010s')
+        self.assertIsNone(e.__context__)
+
+        # Schema deadline; {type: schema}
+        e = raised(Schema({str: slow}, deadline=0.01), {str(i): i for i in range(100)})
+        self.assertEqual(e.path, [u'31'])
+
+        # An embedded schema can't extend the deadline of the outer call. Mappings check it on entry as well
+        schema = Schema([{'item': Schema(slow, deadline=10)}])
+        e = raised(schema, [{'item': i} for i in range(100)], timeout=0.01)
+        self.assertEqual(e.path, [1])
+
+        # Error sink
+        e = raised(Schema([slow], on_error=lambda e: None), list(range(100)), timeout=0.01)
+        self.assertEqual(e.path, [32])
+
+        # Blocking: the pending values are dropped
+        calls = []
+        def blocking_slow(v):
+            calls.append(v)
+            return slow(v)
+        with ThreadPoolExecutor(1) as pool:
+            raised(Schema([Blocking(blocking_slow, pool=pool)]), list(range(100)), timeout=0.01)
+        self.assertLess(len(calls), 40)
+
+        # Not cached
+        cached = CachedSchema([slow])
+        self.assertRaises(ValidationTimeout, cached.validate_key, 'k', 1, schema, [{'item': i} for i in range(40)], timeout=0.01)
+        self.assertEqual(cached.cache_info().entries, 0)
+
+    def test_homogeneous_containers(self):
+        """ Test dedicated loops for `[schema]` and `{type: schema}` """
+
+        # [type]: the input is returned as is
+        schema = Schema([float])
+        l = [1.0, 2.0]
+        self.assertIs(schema(l), l)
+        self.assertInvalid(schema, [1.0, 2, u'3'], MultipleInvalid([
+            Invalid(s.es_type, s.t_float, s.t_int, [1], float),
+            Invalid(s.es_type, s.t_float, s.t_str, [2], float),
+        ]))
+
+        class MyList(list): pass
+        self.assertEqual(type(schema(MyList([1.0]))), list)
+        self.assertEqual(Schema((int,))((1, 2)), (1, 2))
+
+        # [schema]: copied only when a value changes
+        schema = Schema([Any(int, Coerce(int), Remove)])
+        l = [1, 2]
+        self.assertIs(schema(l), l)
+        self.assertEqual(schema([1, u'2', 3]), [1, 2, 3])
+        self.assertEqual(schema([1, None, 3]), [1, 3])
+        self.assertEqual(schema([None, u'2']), [2])
+
+        # Limits
+        self.assertInvalid(Schema([str], limits=Limits(max_items=2, max_str_len=2)), [u'a', u'abc'],
+                           Invalid(u'Too long (2 is the most)', u'2', u'3', [1], str))
+
+        # {type: schema}: validated in-place
+        schema = Schema({str: Any(int, Coerce(int), Remove)})
+        d = {u'a': 1, u'b': u'2', u'c': None}
+        self.assertIs(schema(d), d)
+        self.assertEqual(d, {u'a': 1, u'b': 2})
+        self.assertInvalid(Schema({str: int}), {u'a': 1, u'b': u'2'},
+                           Invalid(s.es_type, s.t_int, s.t_str, [u'b'], int))
+
+        # Other inputs: the generic way
+        self.assertInvalid(Schema({str: int}), {}, Invalid(s.es_required, s.t_str, s.v_no, [], Required(str)))
+        self.assertValid(Schema({Optional(str): int}), {})
+        self.assertInvalid(Schema({str: int}), {u'a': 1, 1: 1}, Invalid(s.es_extra, s.v_no, u'1', [1], Extra))
+        self.assertValid(Schema({str: int, Extra: Remove}), {u'a': 1, 1: 1}, {u'a': 1})
+        schema = Schema({str: int}, limits=Limits(max_str_len=2))
+        self.assertInvalid(schema, {u'abc': 1},
+                           Invalid(u'Key too long (2 is the most)', u'2', u'3', [u'abc'], schema.compiled.schema))
+
+    def test_key_plans(self):
+        """ Test mapping key routing, remembered for every key set """
+
+        schema = Schema({
+            'id': int,
+            Optional('age'): int,
+            Remove('junk'): Any,
+            Optional(str): str,
+            Extra: Reject,
+        })
+        plans = schema.compiled._key_plans
+
+        # Same key set: same results
+        for i in range(3):
+            self.assertValid(schema, {'id': 1, 'junk': 1, 'name': u'a'}, {'id': 1, 'name': u'a'})
+            self.assertValid(schema, {'id': 1, 'age': 2}, {'id': 1, 'age': 2})
+            self.assertInvalid(schema, {'name': u'a'}, Invalid(s.es_required, u'id', s.v_no, ['id'], Required('id')))
+            self.assertInvalid(schema, {'id': 1, 'name': 2}, Invalid(s.es_type, s.t_str, s.t_int, ['name'], str))
+        self.assertEqual(len(plans), 4)
+
+        # Non-string keys are not remembered
+        self.assertInvalid(schema, {'id': 1, 1: 1}, Invalid(s.es_extra, s.v_no, u'1', [1], Extra))
+        self.assertEqual(len(plans), 4)
+
+        # The number of key sets is bounded: the least recently used are forgotten
+        for i in range(schema.compiled.max_key_plans):
+            self.assertValid(schema, {'id': 1, 'k{}'.format(i): u'a'})
+        self.assertEqual(len(plans), schema.compiled.max_key_plans)
+        self.assertValid(schema, {'id': 1, 'age': 1, 'junk': 1, 'name': u'a'}, {'id': 1, 'age': 1, 'name': u'a'})
+        self.assertEqual(len(plans), schema.compiled.max_key_plans)
+        self.assertEqual(next(reversed(plans)), frozenset(('id', 'age', 'junk', 'name')))
+
+        # The size of key sets is bounded: 3 literal keys, and a few more
+        plans.clear()
+        self.assertValid(schema, dict({'id': 1}, **{'k{}'.format(i): u'a' for i in range(3 + schema.compiled.max_key_plan_extra_keys)}))
+        self.assertEqual(len(plans), 0)
+
+        # Key schemas that are not pure functions of the key: not remembered
+        schema = Schema({Coerce(int): int})
+        self.assertIsNone(schema.compiled._key_plans)
+        self.assertValid(schema, {'1': 1}, {1: 1})
+
+    def test_output_record(self):
+        """ Test Schema(output=Record) """
+        schema = Schema({
+            'id': int,
+            'name': str,
+            Optional('age'): int,
+            'role': Default(u'user'),
+            Remove('junk'): object,
+            Extra: Remove,
+        }, output=Record)
+
+        # Valid
+        user = schema({'id': 1, 'name': u'Alex', 'junk': 1, 'extra': 2})
+        self.assertIsInstance(user, Record)
+        self.assertEqual(user._fields, ('id', 'name', 'age', 'role'))
+        self.assertEqual((user.id, user.name, user.role), (1, u'Alex', u'user'))
+        self.assertRaises(AttributeError, getattr, user, 'age')  # not provided
+        self.assertRaises(AttributeError, setattr, user, 'extra', 1)  # no __dict__
+        self.assertEqual(user._asdict(), {'id': 1, 'name': u'Alex', 'role': u'user'})
+        self.assertEqual(user, type(user)(id=1, name=u'Alex', role=u'user'))
+        self.assertEqual(repr(user), "Record(id=1, name='Alex', role='user')")
+        self.assertEqual(pickle.loads(pickle.dumps(user)), user)
+
+        # Schemas with the same fields share the class
+        self.assertIs(type(Schema({'id': int, 'name': int, 'age': int, 'role': int}, output=Record)({'id': 1, 'name': 1, 'age': 1, 'role': 1})),
+                      type(user))
+
+        # Invalid: same errors as with dicts
+        self.assertInvalid(schema, {'id': u'1', 'extra': 2}, MultipleInvalid([
+            Invalid(s.es_type, s.t_int, s.t_str, ['id'], int),
+            Invalid(s.es_required, u'name', s.v_no, ['name'], Required('name')),
+        ]))
+
+        # Embedded mappings are still dicts
+        self.assertEqual(Schema({'a': {'b': int}}, output=Record)({'a': {'b': 1}}).a, {'b': 1})
+
+        # Unsupported schemas
+        self.assertRaises(SchemaError, Schema, [int], output=Record)
+        self.assertRaises(SchemaError, Schema, {str: int}, output=Record)
+        self.assertRaises(SchemaError, Schema, {'a': int, Extra: Allow}, output=Record)
+        self.assertRaises(SchemaError, Schema, {'first-name': str}, output=Record)
+        self.assertRaises(SchemaError, Schema, {'_fields': str}, output=Record)
+
 class InvalidJsonTest(unittest.TestCase):
 
     def test_json(self):
@@ -748,6 +1152,328 @@ class InvalidJsonTest(unittest.TestCase):
         ])
 
 
+class JsonLoadsTest(GoodTestBase):
+    """ Test: good.json """
+
+    def test_loads(self):
+        """ Test good.json.loads() """
+        schema = Schema({
+            'name': str,
+            'tags': [{'id': int, Remove('debug'): object}],
+            Optional('legacy'): Remove,
+        }, extra_keys=Remove)
+
+        # Dropped values are never decoded
+        floats = []
+        def parse_float(v):
+            floats.append(v)
+            return float(v)
+
+        value = good.json.loads(
+            b'{"name": "a", "junk": {"x": [1.5, "]}"]}, "tags": [{"id": 1, "debug": [2.5]}], "legacy": 3.5}',
+            schema, parse_float=parse_float)
+        self.assertEqual(value, {'name': u'a', 'tags': [{'id': 1}]})
+        self.assertEqual(floats, [])
+
+        # Errors are reported with paths
+        schema = Schema({'name': str, 'tags': [{'id': int}]})
+        try:
+            good.json.loads('{"name": 1, "tags": [{"id": 1}, {"id": "2"}], "junk": [[[]]]}', schema)
+            self.fail('False positive')
+        except MultipleInvalid as ee:
+            self.assertInvalidError(ee, MultipleInvalid([
+                Invalid(s.es_type, s.t_str, s.t_int, ['name'], str),
+                Invalid(s.es_type, s.t_int, s.t_str, ['tags', 1, 'id'], int),
+                Invalid(s.es_extra, s.v_no, u'junk', ['junk'], Extra),
+            ]))
+
+        # Malformed JSON
+        self.assertRaises(ValueError, good.json.loads, '{"name": "a",}', schema)
+        self.assertRaises(ValueError, good.json.loads, '{"name": "a"} 1', schema)
+
+        # Skipped values are valid JSON too
+        schema = Schema({'name': str}, extra_keys=Remove)
+        for junk in (u'[}', u'[1 2]', u'{"a" 1}', u'[01]', u'"\\x"', u'tru', u'{"a": [1, {"b": }]}'):
+            with self.assertRaises(ValueError):
+                json.loads(junk)
+            self.assertRaises(ValueError, good.json.loads, u'{"name": "a", "x": %s}' % junk, schema)
+        self.assertEqual(good.json.loads(u'{"name": "a", "x": [1, {"b": [null, "\\u2603"]}, -1.5e3]}', schema), {'name': u'a'})
+
+        # Rejected values are decoded: same errors as with json.loads()
+        schema = Schema({'name': str, Reject('x'): object})
+        for doc in (u'{"name": "a", "x": [1]}', u'{"name": "a", "y": {"a": 1}}'):
+            with self.assertRaises(Invalid) as expected:
+                schema(json.loads(doc))
+            with self.assertRaises(Invalid) as actual:
+                good.json.loads(doc, schema)
+            self.assertInvalidError(actual.exception, expected.exception)
+        self.assertRaises(ValueError, good.json.loads, u'{"name": "a", "x": [}}', schema)
+
+        # `from good import *` does not shadow the stdlib `json`
+        self.assertNotIn('json', good.__all__)
+
+    def test_iter_array(self):
+        """ Test good.json.iter_array() """
+        import io
+        schema = Schema({'id': int, 'tags': [str]})
+        items = [{'id': i, 'tags': [u'a\u2603', u'"]}'] * (i % 3)} for i in range(20)]
+        document = json.dumps(items, indent=1, ensure_ascii=False)
+
+        # Any chunk size, text or binary
+        for chunk_size in (1, 2, 5, 4096):
+            self.assertEqual(list(good.json.iter_array(io.StringIO(document), schema, chunk_size=chunk_size)), items)
+            self.assertEqual(list(good.json.iter_array(io.BytesIO(document.encode('utf-8')), schema, chunk_size=chunk_size)), items)
+        self.assertEqual(list(good.json.iter_array(io.StringIO(u' [ 1.5 , 12345 , -1e-3 ] '), float, chunk_size=1, parse_int=float)),
+                         [1.5, 12345.0, -1e-3])
+        self.assertEqual(list(good.json.iter_array(io.StringIO(u'[]'), int)), [])
+
+        # Items are read lazily, and validated one by one: errors have the index in the path
+        f = io.StringIO(u'[{"id": 1, "tags": []}, {"id": "2", "tags": []}, {"id": 3, "tags": []}]')
+        values = good.json.iter_array(f, schema, chunk_size=8)
+        self.assertEqual(next(values), {'id': 1, 'tags': []})
+        self.assertLess(f.tell(), len(f.getvalue()))
+        with self.assertRaises(Invalid) as ctx:
+            next(values)
+        self.assertEqual(ctx.exception.path, [1, 'id'])
+
+        f = io.StringIO(u'[1, "2", 3]')
+        self.assertEqual(list(good.json.iter_array(f, int, errors='skip')), [1, 3])
+
+        # Malformed JSON: errors have positions in the document
+        for doc in (u'{"id": 1}', u'[1, 2', u'[1,\n 2 3]', u'[1,]', u'[1] 2', u'[1, tru]'):
+            with self.assertRaises(ValueError) as ctx:
+                list(good.json.iter_array(io.StringIO(doc), int, chunk_size=2))
+            try:
+                json.loads(doc)
+            except ValueError as e:
+                if doc != u'{"id": 1}':
+                    self.assertEqual(str(ctx.exception), str(e))
+
+        # Malformed item: the error is raised right away, the rest of the file is not read
+        tail = u', {"id": 1, "name": "abcdef"}' * 100000
+        for doc in (u'[{"id": 1,, "name": "a"}' + tail + u']', u'[{"id": 1, "name": "a\x01"}' + tail + u']'):
+            f = io.StringIO(doc)
+            with self.assertRaises(ValueError) as ctx:
+                list(good.json.iter_array(f, dict, chunk_size=1024))
+            self.assertLessEqual(f.tell(), 2048)
+            with self.assertRaises(ValueError) as expected:
+                json.loads(doc)
+            self.assertEqual(str(ctx.exception), str(expected.exception))
+
+        # Long strings & tokens cut by chunks are incomplete, not malformed
+        doc = u'[' + u', '.join([u'"' + u'x' * 5000 + u'"', u'-Infinity', u'true', u'"\\u0041"', u'1e-10']) + u']'
+        self.assertEqual(list(good.json.iter_array(io.StringIO(doc), Any(str, float, bool), chunk_size=7)), json.loads(doc))
+
+
+class BulkTest(GoodTestBase):
+    """ Test: good.bulk """
+
+    def test_split_ranges(self):
+        """ Test split_ranges() """
+        self.assertEqual(good.bulk.split_ranges(b'a\nbb\nccc\n', 0, 3), [(0, 5), (5, 9)])
+        self.assertEqual(good.bulk.split_ranges(b'a\nbb\nccc', 0, 10), [(0, 2), (2, 5), (5, 8)])
+        self.assertEqual(good.bulk.split_ranges(b'h\na\nb\n', 2, 2), [(2, 4), (4, 6)])
+        self.assertEqual(good.bulk.split_ranges(b'', 0, 2), [])
+
+    def test_validate_file(self):
+        """ Test validate_file() """
+        with tempfile.TemporaryDirectory() as tmp:
+            # JSON Lines: the same report with any number of processes & ranges
+            path = os.path.join(tmp, 'rows.jsonl')
+            with open(path, 'w') as f:
+                for i in range(100):
+                    f.write(u'[]\n' if i % 30 == 29 else u'{"id": %d}\n' % i)
+                f.write(u'\n{"id": \n{}')
+
+            for processes in (1, 2):
+                report = good.bulk.validate_file(path, 'builtins:dict', processes=processes, ranges_per_process=3)
+                self.assertEqual(report[:3], (103, 98, 4))
+                self.assertEqual([e.path for e in report.errors], [[30], [60], [90], [102]])
+                self.assertInvalidError(report.errors[0], Invalid(s.es_type, u'Dictionary', u'List', [30], u'Dictionary'))
+                self.assertEqual(report.errors[-1].message, u'Malformed JSON')
+
+            self.assertEqual(good.bulk.validate_file(path, 'builtins:dict', processes=1, max_errors=1).errors[0].path, [30])
+
+            # CSV: rows are dicts, the header is the first line
+            path = os.path.join(tmp, 'rows.csv')
+            with open(path, 'w') as f:
+                f.write(u'id,name\r\n1,"a, b"\r\n2\r\n\r\n3,c\r\n')
+            report = good.bulk.validate_file(path, 'builtins:dict', processes=1, ranges_per_process=2)
+            self.assertEqual(report[:3], (5, 2, 1))
+            self.assertInvalidError(report.errors[0], Invalid(u'Wrong number of fields', u'2', u'1', [3]))
+
+            # Empty file
+            path = os.path.join(tmp, 'empty.jsonl')
+            open(path, 'w').close()
+            self.assertEqual(good.bulk.validate_file(path, 'builtins:dict'), (0, 0, 0, []))
+
+
+class RegistryTest(GoodTestBase):
+    """ Test: good.registry """
+
+    #: A compiled schema, referenced by the tests
+    COMPILED = Schema(int)
+
+    def test_SchemaRegistry(self):
+        """ Test SchemaRegistry """
+        self.assertIs(resolve_ref('collections:OrderedDict'), collections.OrderedDict)
+        self.assertIs(resolve_ref('os:path.join'), __import__('os').path.join)
+
+        schemas = SchemaRegistry()
+        schemas.register('user', {'name': str}, extra_keys=Allow)
+        schemas.register_ref('odict', 'collections:OrderedDict')
+        self.assertEqual(set(schemas), {'user', 'odict'})
+        self.assertNotIn('user', schemas.schemas)  # lazy
+
+        # Compile
+        times = schemas.precompile()
+        self.assertEqual(set(times), {'user', 'odict'})
+        self.assertTrue(all(seconds >= 0 for seconds in times.values()))
+        self.assertEqual(schemas.compile_times, times)
+        self.assertEqual(schemas.precompile(), {})  # compiled already
+        user = schemas['user']
+        self.assertIs(schemas['user'], user)  # compiled once
+        self.assertValid(user, {'name': u'a', 'age': 1})
+        self.assertValid(schemas['odict'], collections.OrderedDict())
+
+        # Re-register
+        schemas.register('user', {'name': str})
+        self.assertInvalid(schemas['user'], {'name': u'a', 'age': 1}, None)
+        self.assertRaises(KeyError, schemas.compile, 'nope')
+
+        # Compiled schemas by reference: no arguments
+        schemas.register_ref('compiled', __name__ + ':RegistryTest.COMPILED', extra_keys=Allow)
+        self.assertRaises(AssertionError, schemas.compile, 'compiled')
+        schemas.register_ref('compiled', __name__ + ':RegistryTest.COMPILED')
+        self.assertIs(schemas['compiled'], self.COMPILED)
+
+
+class CacheTest(GoodTestBase):
+    """ Test: good.cache """
+
+    def test_CachedSchema(self):
+        """ Test CachedSchema """
+        schema = CachedSchema({'name': str, 'tags': [str], Extra: Remove}, max_entries=2)
+
+        # Cached copies
+        value = schema({'name': u'a', 'tags': [u'x'], 'junk': 1})
+        value['tags'].append(u'y')
+        self.assertEqual(schema({'name': u'a', 'tags': [u'x'], 'junk': 1}), {'name': u'a', 'tags': [u'x']})
+        self.assertEqual(schema.cache_info(), (1, 1, 0, 0, 1, 8))
+
+        # Errors are cached & copied
+        for i in range(2):
+            self.assertInvalid(schema, {'name': 1, 'tags': []},
+                               Invalid(s.es_type, s.t_str, s.t_int, ['name'], str))
+        self.assertEqual(schema.cache_info().hits, 2)
+
+        # Types are a part of the key
+        schema = CachedSchema(int)
+        self.assertValid(schema, 1)
+        self.assertInvalid(schema, True, Invalid(s.es_type, s.t_int, u'Boolean', [], int))
+
+        # Equal values that look different are different inputs
+        schema = CachedSchema(lambda v: str(v))
+        for a, b in ((0.0, -0.0),
+                     (Decimal('1.0'), Decimal('1.00')),
+                     (datetime(2020, 1, 1, 12, tzinfo=timezone.utc),
+                      datetime(2020, 1, 1, 15, tzinfo=timezone(timedelta(hours=3))))):
+            self.assertEqual((a, schema(a), schema(b)), (a, str(a), str(b)))
+
+        # Uncacheable inputs
+        schema = CachedSchema(int)
+        self.assertInvalid(schema, object(), Invalid(s.es_type, s.t_int, u'Object', [], int))
+        self.assertEqual(schema.cache_info().uncacheable, 1)
+
+        # Eviction by cost
+        schema = CachedSchema([int], max_cost=9)
+        schema([1, 2, 3])
+        schema([1, 2, 3, 4, 5])
+        self.assertEqual(schema.cache_info()[3:], (1, 1, 6))
+
+        # Context: not cached, either given or inherited from an outer call
+        def owned(v):
+            if v not in get_context()['ids']:
+                raise Invalid(u'Not yours')
+            return v
+        schema = CachedSchema(owned)
+        self.assertEqual(schema(1, context={'ids': {1}}), 1)
+        with self.assertRaises(Invalid):
+            schema(1, context={'ids': {2}})
+        outer = Schema({'id': schema})
+        self.assertEqual(outer({'id': 1}, context={'ids': {1}}), {'id': 1})
+        self.assertEqual(schema.cache_info()[:3], (0, 0, 3))
+
+        # Timeout
+        schema = CachedSchema(int)
+        self.assertEqual([schema(1, timeout=1.0) for i in range(2)], [1, 1])
+        self.assertEqual(schema.cache_info()[:2], (1, 1))
+
+        # JSON: keyed by the raw document
+        schema = CachedSchema({'name': str})
+        for i in range(2):
+            self.assertEqual(good.json.loads(b'{"name": "a"}', schema), {'name': u'a'})
+        self.assertEqual(schema.cache_info()[:2], (1, 1))
+
+    def test_errors_copy(self):
+        """ Test copying & pickling errors """
+        e = MultipleInvalid([
+            Invalid(s.es_type, s.t_int, s.t_str, ['a'], int, custom=1).enrich(path=['x']),
+            Invalid(s.es_value, u'1', u'2', [], None),
+        ])
+        for copied in (copy(e), pickle.loads(pickle.dumps(e))):
+            self.assertInvalidError(copied, e)
+            self.assertEqual(copied.errors[0].path, ['x', 'a'])
+            self.assertEqual(copied.errors[0].info, {'custom': 1})
+
+
+class MetricsTest(GoodTestBase):
+    """ Test: good.metrics """
+
+    def test_install(self):
+        """ Test install(), uninstall() & sinks """
+        original_call = Schema.__call__
+        sink = good.metrics.install(good.metrics.PrometheusSink(buckets=(1.0,)))
+        self.addCleanup(good.metrics.uninstall)
+        self.assertIsNot(Schema.__call__, original_call)
+
+        schema = Schema({'name': str, 'tags': [{'id': Any(int, Coerce(int))}]})
+        self.assertValid(schema, {'name': u'a', 'tags': [{'id': 1}]})
+        for i in range(2):
+            self.assertInvalid(schema, {'name': 1, 'tags': [{'id': 1}, {'id': u'x'}]}, None)
+
+        # Only the outermost calls are measured: `Any` members are not
+        stats = sink.schemas[schema.name]
+        self.assertEqual(list(sink.schemas), [schema.name])
+        self.assertEqual((stats.calls, stats.failures, sum(stats.bucket_counts)), (3, 2, 3))
+        self.assertEqual(sink.errors, {
+            (schema.name, u"['name']", s.es_type, s.t_str): 2,
+            (schema.name, u"['tags'][*]['id']", s.es_value, u'Any(Integer number|*Integer number)'): 2,
+        })
+
+        # Prometheus format
+        text = sink.render()
+        self.assertIn(u'good_validations_total{{schema="{}",result="invalid"}} 2\n'.format(schema.name), text)
+        self.assertIn(u'good_validation_seconds_bucket{{schema="{}",le="+Inf"}} 3\n'.format(schema.name), text)
+        self.assertIn(u'good_validation_seconds_count{{schema="{}"}} 3\n'.format(schema.name), text)
+        self.assertIn(u'path="[\'name\']",message="Wrong type",validator="String"} 2\n', text)
+
+        # Keys from the input: the number of error counters is capped
+        sink.max_errors = len(sink.errors) + 1
+        keyed = Schema({str: int})
+        for k in (u'a', u'b', u'c', u'a'):
+            self.assertInvalid(keyed, {k: u'x'}, None)
+        other = good.metrics.OTHER_ERRORS
+        self.assertEqual(sink.errors[(keyed.name, u"['a']", s.es_type, s.t_int)], 2)
+        self.assertEqual(sink.errors[(keyed.name, other, other, other)], 2)
+
+        # Uninstall
+        self.assertIs(good.metrics.uninstall(), sink)
+        self.assertIs(Schema.__call__, original_call)
+        schema({'name': u'a', 'tags': []})
+        self.assertEqual(stats.calls, 3)
+
+
 class HelpersTest(GoodTestBase):
     """ Test: Helpers """
 
@@ -778,8 +1504,11 @@ class HelpersTest(GoodTestBase):
         class SPerson(OPerson):
             __slots__ = ('name', 'age')
 
+        # Dataclass
+        DPerson = dataclasses.make_dataclass('DPerson', ('name', 'age')) if dataclasses is not None else None
+
         # Test on every class
-        for Person in (OPerson, TPerson, SPerson):
+        for Person in filter(None, (OPerson, TPerson, SPerson, DPerson)):
             # Object()
             object_validator = Object({
                 u'name': str,
@@ -787,6 +1516,7 @@ class HelpersTest(GoodTestBase):
             })
             schema = Schema(object_validator)
 
+            self.assertIsNotNone(object_validator.attribute_keys)  # direct attribute access
             self.assertValid(schema, Person(u'Alex', 18), Person(u'Alex', 18))
             self.assertInvalid(schema, type('A', (object,), {})(), MultipleInvalid([
                 Invalid(s.es_required, u'name', s.v_no, [u'name'], Required(u'name')),
@@ -810,6 +1540,22 @@ class HelpersTest(GoodTestBase):
             self.assertInvalid(schema, type('A', (object,), {})(),
                                Invalid(s.es_value_type, u'Object({})'.format(Person.__name__), u'Object(A)', [], object_validator))
 
+        # Extra attributes
+        object_validator = Object({u'name': str})
+        schema = Schema(object_validator)
+        self.assertInvalid(schema, OPerson(u'Alex', 18),
+                           Invalid(s.es_extra, s.v_no, u'age', [u'age'], Extra))
+        self.assertValid(Schema(Object({u'name': str, Extra: Allow})), OPerson(u'Alex', 18))
+
+        # Default
+        person = Schema(Object({u'name': str, u'age': int, u'height': Default(0)}))(OPerson(u'Alex', 18))
+        self.assertEqual(vars(person), {u'name': u'Alex', u'age': 18, u'height': 0})
+
+        # Markers that need the mapping: validated through a proxy
+        object_validator = Object({str: Any(str, int)})
+        self.assertIsNone(object_validator.attribute_keys)
+        self.assertValid(Schema(object_validator), OPerson(u'Alex', 18), OPerson(u'Alex', 18))
+
     def test_Msg(self):
         """ Test Msg() """
 
@@ -868,6 +1614,100 @@ class HelpersTest(GoodTestBase):
         self.assertInvalid(schema, u'1',
                            Invalid(u'Must be 1', u'isOne()', u'1', [], isOne))
 
+    def test_Blocking(self):
+        """ Test Blocking() """
+        threads = set()
+
+        def double(v):
+            threads.add(threading.current_thread())
+            if v < 0:
+                raise Invalid(u'Negative')
+            return v * 2
+        double.name = u'double'
+
+        with ThreadPoolExecutor(4) as pool:
+            blocking = Blocking(double, pool=pool)
+
+            # Iterable: same results as with sequential validation
+            schema = Schema([blocking])
+            self.assertValid(schema, [1, 2, 3], [2, 4, 6])
+            self.assertInvalid(schema, [1, -1, 2, -2], MultipleInvalid([
+                Invalid(u'Negative', u'double', u'-1', [1], double),
+                Invalid(u'Negative', u'double', u'-2', [3], double),
+            ]))
+
+            # Mapping
+            schema = Schema({'a': blocking, 'b': blocking, Optional(str): blocking, Extra: Remove})
+            self.assertValid(schema, {'a': 1, 'b': 2, 'c': 3, 1: 0}, {'a': 2, 'b': 4, 'c': 6})
+            self.assertInvalid(schema, {'a': 1, 'b': -1, 'c': 2, 'd': -2}, MultipleInvalid([
+                Invalid(u'Negative', u'double', u'-1', ['b'], double),
+                Invalid(u'Negative', u'double', u'-2', ['d'], double),
+            ]))
+
+        # Validated in the pool
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+
+        # Used as a plain validator
+        threads.clear()
+        self.assertValid(Schema(Blocking(double)), 1, 2)
+        self.assertEqual(threads, {threading.current_thread()})
+
+        # Nested in the same pool: validated inline by the worker, otherwise the workers would wait for each other
+        def validate_nested(schema, value):
+            result = []
+            t = threading.Thread(target=lambda: result.append(schema(value)), daemon=True)
+            t.start()
+            t.join(10)
+            self.assertFalse(t.is_alive(), 'Deadlock')
+            return result[0]
+
+        self.assertEqual(validate_nested(Schema([Blocking([Blocking(int)])]), [[1, 2]] * 64), [[1, 2]] * 64)
+        with ThreadPoolExecutor(2) as pool:
+            schema = Schema({'a': Blocking([Blocking(int, pool=pool)], pool=pool), 'b': Blocking({'c': Blocking(int, pool=pool)}, pool=pool)})
+            self.assertEqual(validate_nested(Schema([schema]), [{'a': [1, 2], 'b': {'c': 3}}] * 8),
+                             [{'a': [1, 2], 'b': {'c': 3}}] * 8)
+
+    def test_Stream(self):
+        """ Test Stream() """
+        consumed = []
+
+        def rows(n, bad=()):
+            for i in range(n):
+                consumed.append(i)
+                yield {'id': u'x' if i in bad else i}
+
+        # Lazy: items are validated as they're consumed
+        schema = Schema(Stream({'id': int}))
+        self.assertEqual(schema.name, u'Stream(Dictionary[id,*])')
+        stream = schema(rows(3))
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(stream), {'id': 0})
+        self.assertEqual(consumed, [0])
+        self.assertEqual(list(stream), [{'id': 1}, {'id': 2}])
+
+        # errors='raise': stop at the first invalid item
+        stream = schema(rows(5, bad=(1, 3)))
+        self.assertEqual(next(stream), {'id': 0})
+        with self.assertRaises(Invalid) as ctx:
+            next(stream)
+        self.assertEqual(ctx.exception.path, [1, 'id'])
+        self.assertEqual(list(stream), [])
+
+        # errors='skip', errors='yield'
+        self.assertEqual(list(Schema(Stream(int, errors='skip'))(iter([1, u'a', 3]))), [1, 3])
+        values = list(Schema(Stream(int, errors='yield'))(iter([1, u'a', 3])))
+        self.assertEqual(values[::2], [1, 3])
+        self.assertInvalidError(values[1], Invalid(s.es_type, s.t_int, s.t_str, [1], int))
+
+        # Context of the call
+        schema = Schema(Stream(Length(max=ContextRef('max'))))
+        self.assertEqual(list(schema(iter([u'ab', u'abc']), context={'max': 3})), [u'ab', u'abc'])
+
+        # Not an iterable
+        stream = Stream(int)
+        self.assertInvalid(Schema(stream), u'abc', Invalid(s.es_value_type, u'Iterable', s.t_str, [], stream))
+
 
 class PredicatesTest(GoodTestBase):
     """ Test: Validators.Predicates """
@@ -920,6 +1760,75 @@ class PredicatesTest(GoodTestBase):
         ))
         self.assertEqual(schema.name, u'Any(1|2|3|4|5|6|7|8)')
 
+        # Combined Match()es
+        any = Any(Match(r'^/users/[0-9]+$'), Match(r'^/users/'), 1, Match(r'(a)\1'), Match(r'^/posts/'), Match(r'^/tags/'))
+        schema = Schema(any)
+        self.assertEqual(len(any.steps), 4)  # [0+1], 2, 3, [4+5]
+        self.assertEqual(schema.name, u'Any((special format)|(special format)|1|(special format)|(special format)|(special format))')
+
+        self.assertValid(schema, u'/users/1')
+        self.assertValid(schema, 1)
+        self.assertEqual(any.branch(u'/users/1'), (0, u'/users/1'))
+        self.assertEqual(any.branch(u'/users/me'), (1, u'/users/me'))
+        self.assertEqual(any.branch(u'aa'), (3, u'aa'))
+        self.assertEqual(any.branch(u'/tags/a'), (5, u'/tags/a'))
+        self.assertInvalid(schema, u'/', Invalid(s.es_value, any.name, u'/', [], any))
+        self.assertInvalid(schema, b'/users/1', Invalid(s.es_value, any.name, u"b'/users/1'", [], any))
+
+        # Tagged mappings
+        any = Any({'type': 'click', 'x': int}, {'type': 'view', 'url': str}, {'type': 'view', 'page': int}, {'type': 1})
+        schema = Schema(any)
+        self.assertEqual(any.dispatch, ('type', {(str, 'click'): (0,), (str, 'view'): (1, 2), (int, 1): (3,)}))
+
+        self.assertEqual(any.branch({'type': 'view', 'url': u'/'}), (1, {'type': 'view', 'url': u'/'}))
+        self.assertEqual(any.branch({'type': 'view', 'page': 1}), (2, {'type': 'view', 'page': 1}))
+        self.assertEqual(any.branch({'type': 1}), (3, {'type': 1}))
+        self.assertInvalid(schema, {'type': True}, Invalid(s.es_value, any.name, u"{'type': True}", [], any))
+        self.assertInvalid(schema, {'type': 'view'}, Invalid(s.es_value, any.name, u"{'type': 'view'}", [], any))
+        self.assertInvalid(schema, {'type': []}, Invalid(s.es_value, any.name, u"{'type': []}", [], any))
+        self.assertInvalid(schema, {}, Invalid(s.es_value, any.name, u'{}', [], any))
+        self.assertInvalid(schema, [], Invalid(s.es_value, any.name, u'[]', [], any))
+
+        # Not dispatched: not all schemas are mappings, the tag is optional, the tag is not a literal
+        self.assertIsNone(Any({'type': 'a'}, None).dispatch)
+        self.assertIsNone(Any({Optional('type'): 'a'}, {Optional('type'): 'b'}).dispatch)
+        self.assertIsNone(Any({'type': str}, {'type': 'b'}).dispatch)
+
+    def test_Discriminated(self):
+        """ Test Discriminated() """
+
+        discriminated = Discriminated('type', {
+            'click': {'type': 'click', 'x': int},
+            'view': {'type': 'view', 'url': str},
+            1: {'type': 1},
+        })
+        schema = Schema(discriminated)
+        self.assertEqual(schema.name, u'Discriminated(type: click|view|1)')
+
+        self.assertValid(schema, {'type': 'click', 'x': 1})
+        self.assertValid(schema, {'type': 'view', 'url': u'/'})
+        self.assertValid(schema, {'type': 1})
+
+        # Errors of the chosen schema
+        self.assertInvalid(schema, {'type': 'view', 'url': 1},
+                           Invalid(s.es_type, s.t_str, s.t_int, ['url'], str))
+        self.assertInvalid(schema, {'type': 'view', 'x': 1}, MultipleInvalid([
+            Invalid(s.es_required, u'url', s.v_no, ['url'], Required('url')),
+            Invalid(s.es_extra, s.v_no, u'x', ['x'], Extra),
+        ]))
+
+        # Tag errors
+        self.assertInvalid(schema, {'type': 'scroll'},
+                           Invalid(u'Unknown variant', u'click|view|1', u'scroll', ['type'], discriminated))
+        self.assertInvalid(schema, {'type': True},
+                           Invalid(u'Unknown variant', u'click|view|1', u'True', ['type'], discriminated))
+        self.assertInvalid(schema, {'type': []},
+                           Invalid(u'Unknown variant', u'click|view|1', u'[]', ['type'], discriminated))
+        self.assertInvalid(schema, {},
+                           Invalid(s.es_required, u'type', s.v_no, ['type'], discriminated))
+        self.assertInvalid(schema, [],
+                           Invalid(s.es_value_type, s.t_dict, s.t_list, [], discriminated))
+
     def test_All(self):
         """ Test All() """
 
@@ -1072,6 +1981,41 @@ class TypesTest(GoodTestBase):
         self.assertInvalid(schema, u'a',
                            Invalid(u'Not an integer', u'*intify()', u'a', [], coerce_int))
 
+    def test_Tuple(self):
+        """ Test Tuple() """
+
+        row = Tuple(int, Range(-90, 90), Coerce(float))
+        schema = Schema(row)
+        self.assertEqual(schema.name, u'Tuple(Integer number,Range(-90..90),*Fractional number)')
+
+        l = [1, 2, 3.0]
+        self.assertIs(schema(l), l)
+        self.assertValid(schema, [1, 2, 3], [1, 2, 3.0])
+        self.assertValid(schema, (1, 2, u'3'), (1, 2, 3.0))
+
+        # Errors
+        self.assertInvalid(schema, [1.0, 100, 3], MultipleInvalid([
+            Invalid(s.es_type, s.t_int, s.t_float, [0], int),
+            Invalid(u'Value must be at most 90', u'90', u'100', [1], row.compiled[1].schema),
+        ]))
+        self.assertInvalid(schema, [1, 2],
+                           Invalid(u'Wrong number of items', u'3', u'2', [], row))
+        self.assertInvalid(schema, [1, 2, 3, 4],
+                           Invalid(u'Wrong number of items', u'3', u'4', [], row))
+        self.assertInvalid(schema, {1: 1},
+                           Invalid(s.es_value_type, get_type_name(tuple), s.t_dict, [], row))
+
+        # Variadic tail
+        row = Tuple(str, rest=float)
+        schema = Schema(row)
+        self.assertEqual(schema.name, u'Tuple(String,Fractional number...)')
+        self.assertValid(schema, [u'a'])
+        self.assertValid(schema, [u'a', 1.0, 2.0])
+        self.assertInvalid(schema, [u'a', 1.0, 2],
+                           Invalid(s.es_type, s.t_float, s.t_int, [2], float))
+        self.assertInvalid(schema, [],
+                           Invalid(u'Wrong number of items', u'1 or more', u'0', [], row))
+
 
 class ValuesTest(GoodTestBase):
     """ Test: Validators.Values """
@@ -1223,6 +2167,24 @@ class ValuesTest(GoodTestBase):
                     self.assertInvalid(schema, 123,
                                        Invalid(u'Unsupported value', name, u'123', [], map))
 
+        # Unhashable values are misses
+        for schema in (Schema(colors_enum), Schema(Map(colors_enum, Map.BOTH)), Schema(Map(colors_dict, Map.BOTH))):
+            self.assertRaises(Invalid, schema, [0xFF0000])
+
+        # Enum with custom lookup
+        class lenient_enum(enum.Enum):
+            RED = 0xFF0000
+            UNKNOWN = 0
+
+            @classmethod
+            def _missing_(cls, value):
+                return cls.UNKNOWN
+
+        self.assertValid(Schema(lenient_enum), 0xFF0000, lenient_enum.RED)
+        self.assertValid(Schema(lenient_enum), 123, lenient_enum.UNKNOWN)
+        self.assertValid(Schema(Map(lenient_enum, Map.BOTH)), 123, lenient_enum.UNKNOWN)
+        self.assertValid(Schema(Map(lenient_enum, Map.BOTH)), 'RED', lenient_enum.RED)
+
     def test_InMap(self):
         """ Test In(Map()) """
 
@@ -1442,6 +2404,20 @@ class StringsTest(GoodTestBase):
         self.assertInvalid(schema, 'ftp://example.com',
                            Invalid(u'Protocol not allowed', u'http,https', u'ftp', [], url))
 
+        # Canonical URLs are returned as is
+        value = 'https://user@example.com:443/a?b#c'
+        self.assertIs(schema(value), value)
+
+        # Validate only
+        url = Url(normalize=False)
+        schema = Schema(url)
+        self.assertValid(schema, 'example.com')
+        self.assertValid(schema, 'https://example.com')
+        self.assertInvalid(schema, 'abc',
+                           Invalid(u'Incorrect domain name', u'URL', u'abc', [], url))
+        self.assertInvalid(schema, 'ftp://example.com',
+                           Invalid(u'Protocol not allowed', u'http,https', u'ftp', [], url))
+
     def test_Email(self):
         """ Test Email() """
 
@@ -1604,3 +2580,95 @@ class FilesTest(GoodTestBase):
         self.assertValid(schema, '/etc/hosts')
         self.assertInvalid(schema, '/etc/does-not-exist',
                            Invalid(u'Path does not exist', u'Existing path', u'Missing path', [], isfile))
+
+    def test_IsReadable(self):
+        """ Test IsReadable() """
+        isreadable = IsReadable()
+        schema = Schema(isreadable)
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'file')
+            with open(path, 'w'):
+                pass
+
+            self.assertValid(schema, path)
+            self.assertInvalid(schema, path + '.missing',
+                               Invalid(u'Path does not exist', u'Readable path', u'Missing path', [], isreadable))
+
+            if os.geteuid() != 0:  # root can read anything
+                os.chmod(path, 0)
+                self.assertInvalid(schema, path,
+                                   Invalid(u'Path is not readable', u'Readable path', u'Not readable', [], isreadable))
+
+    def test_MaxSize(self):
+        """ Test MaxSize() """
+        maxsize = MaxSize(3)
+        schema = Schema(maxsize)
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'file')
+            with open(path, 'w') as f:
+                f.write('abc')
+            self.assertValid(schema, path)
+
+            with open(path, 'w') as f:
+                f.write('abcd')
+            self.assertInvalid(schema, path,
+                               Invalid(u'File too large (3 bytes is the most)', u'File up to 3 bytes', u'4 bytes', [], maxsize))
+
+    def test_StatCache(self):
+        """ Test StatCache """
+        with tempfile.TemporaryDirectory() as d:
+            os.mkdir(os.path.join(d, 'dir'))
+            with open(os.path.join(d, 'file'), 'w') as f:
+                f.write('abc')
+            os.symlink(os.path.join(d, 'nowhere'), os.path.join(d, 'dangling'))
+
+            # Stat once
+            cache = StatCache(ttl=60)
+            maxsize, exists = MaxSize(3, cache=cache), PathExists(cache=cache)
+            schema = Schema(All(IsFile(cache=cache), maxsize))
+            self.assertValid(schema, os.path.join(d, 'file'))
+            os.unlink(os.path.join(d, 'file'))
+            self.assertValid(schema, os.path.join(d, 'file'))  # remembered
+            cache.clear()
+            self.assertRaises(Invalid, schema, os.path.join(d, 'file'))
+
+            # Prefetch
+            with open(os.path.join(d, 'file'), 'w') as f:
+                f.write('abcd')
+            self.assertEqual(cache.prefetch(d + os.sep), 3)
+            self.assertInvalid(schema, os.path.join(d, 'file'),
+                               Invalid(u'File too large (3 bytes is the most)', u'File up to 3 bytes', u'4 bytes', [], maxsize))
+            self.assertValid(Schema(IsDir(cache=cache)), os.path.join(d, 'dir'))
+            for name in ('missing', 'dangling'):
+                self.assertInvalid(Schema(exists), os.path.join(d, name),
+                                   Invalid(u'Path does not exist', u'Existing path', u'Missing path', [], exists))
+
+            # Normalized paths. With a trailing separator, only directories exist
+            self.assertEqual(cache.prefetch(os.path.join(d, 'dir')), 0)
+            self.assertValid(Schema(IsDir(cache=cache)), os.path.join(d, 'dir') + os.sep)
+            for path in (d + os.sep + os.sep + 'file', os.path.join(d, '.', 'file')):
+                self.assertInvalid(schema, path, None)  # the cached 4 bytes
+            self.assertEqual(cache.stat(os.path.join(d, 'file') + os.sep), None)
+            self.assertIsNotNone(cache.stat(os.path.join(d, 'file')))
+
+            # Bytes
+            bytes_cache = StatCache(ttl=60)
+            self.assertEqual(bytes_cache.prefetch(os.fsencode(d + os.sep)), 3)
+            self.assertValid(Schema(IsDir(cache=bytes_cache)), os.fsencode(os.path.join(d, 'dir') + os.sep))
+            self.assertIsNone(bytes_cache.stat(os.fsencode(os.path.join(d, 'missing'))))
+
+            # Expired
+            cache.ttl = 0
+            cache.prefetch(d)
+            with open(os.path.join(d, 'new'), 'w'):
+                pass
+            self.assertValid(Schema(IsFile(cache=cache)), os.path.join(d, 'new'))
+
+            # Expired results are dropped
+            cache = StatCache(ttl=0)
+            cache.prefetch(d)
+            for name in ('file', 'dir', 'new', 'missing'):
+                cache.stat(os.path.join(d, name))
+            self.assertEqual((list(cache.entries), list(cache.listings)), ([os.path.join(d, 'missing')], []))